@@ -1,3 +1,10 @@
 from .host import *
+from .graph_backend import NetworkxBackend, RustworkxBackend, AutoBackend, GRAPH_BACKENDS, make_graph_backend
+from .topologies import build_topology, read_topology, TOPOLOGIES, TOPOLOGY_ALIASES, TOPOLOGY_FORMATS
+from .slice_planner import plan_slice_paths, SLICE_DISJOINTNESS
+from .visualization import graph_layout, clear_layout_cache, Renderer, get_renderer
 from .network import Network
+from .provisioner import EprProvisioner
+from .cutoff import CutoffPolicy
 from .controller import Controller
+from .request_stream import RequestStream, REQUEST_FORMATS
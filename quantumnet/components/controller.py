@@ -1,8 +1,12 @@
 import networkx as nx
 from ..components import Network, Host, Logger
+from ..objects import RequestQueue, LinkOccupancy
 from qiskit import QuantumCircuit
 import random
-from collections import defaultdict
+import heapq
+import math
+import itertools
+from collections import defaultdict, deque
 
 class Controller():
     def __init__(self, network):
@@ -11,13 +15,25 @@ class Controller():
         """
         self.network = network
         self.logger = Logger.get_instance()  
-        self.pending_requests = []  
+        self.pending_requests = RequestQueue(self.queue_priority)  # Fila de prioridade das requisições pendentes
         self.scheduled_requests = {}  # Requisições por timeslot
         self.executed_requests = []  # Histórico de requisições executadas
-        self.occupied_routes = {}  # Rastreia rotas ocupadas por timeslot
+        self.occupied_routes = network.occupancy  # Ocupação dos enlaces por timeslot, a mesma da rede
         self.scheduled_requests_slice = defaultdict(list)
         self.slices = {}
         self.failed_requests = []
+        self.batch_scheduling = False  # Se True, as requisições são agendadas em lote por schedule_batch
+        self.batch_window = None  # Número máximo de requisições por lote (None = todas as pendentes)
+        self.slice_weights = {}  # Peso de cada slice no agendamento work-conserving (padrão 1)
+        self.deadline_scheduling = False  # Se True, as requisições são atendidas por prazo (EDF) e rejeitadas se não puderem cumpri-lo
+        self.fidelity_threshold = 0.85  # Fidelidade mínima exigida pela camada de transporte
+        self.initial_fidelity = 0.95  # Fidelidade inicial esperada dos qubits (sorteada entre 0.9 e 1)
+        self.min_initial_fidelity = 0.9  # Menor fidelidade inicial possível de um qubit
+        self.elapsed_timeslots = 0  # Timeslots simulados na execução das requisições agendadas
+        self.concurrent_execution = False  # Se True, requisições independentes de um timeslot executam ao mesmo tempo
+        self.request_batching = False  # Se True, requisições compatíveis pendentes são unidas em uma só transferência
+        self.coalesce_window = None  # Número máximo de requisições pendentes examinadas pelo agrupamento (None = todas)
+        self.max_batch_qubits = None  # Limite de qubits de um grupo (None = memória do cliente e do servidor)
         
     def initialize_slices(self, network, clients, server, protocols, slice_paths_list):
         if len(clients) != len(protocols) or len(protocols) != len(slice_paths_list):
@@ -47,17 +63,18 @@ class Controller():
         Returns:
             dict: Dicionário de destinos para caminhos mais curtos.
         """
-        shortest_paths = nx.shortest_path(self.network.graph, source=host_id)
+        shortest_paths = self.network.graph_backend.single_source_paths(self.network.graph, host_id)
         routing_table = {dest: path for dest, path in shortest_paths.items()}
         return routing_table
     
 
     def register_routing_tables(self):
         """
-        Registra tabelas de roteamento para todos os nós.
+        Registra tabelas de roteamento para todos os nós, calculadas de uma só vez pelo backend de grafos da rede.
         """
+        tables = self.network.graph_backend.all_pairs_paths(self.network.graph)
         for host_id in self.network.hosts:
-            routing_table = self.create_routing_table(host_id)
+            routing_table = tables[host_id] if host_id in tables else self.create_routing_table(host_id)
             self.network.hosts[host_id].set_routing_table(routing_table)
 
     # Gerenciamento de Requisições
@@ -87,12 +104,52 @@ class Controller():
         Args:
             request (dict): Dicionário com a requisição contendo informações como Alice, Bob, protocolo, etc.
         """
-        self.pending_requests.append(request)
+        self.resolve_route(request)  # A rota é resolvida uma única vez, na admissão
+        if self.deadline_scheduling:
+            self.compute_deadline(request)
         self.logger.log(f"Requisição recebida: {request}")
-        self.process_requests()
+        if self.deadline_scheduling and request['deadline'] < request['arrival_timeslot']:
+            self.reject_request(request, "Fidelidade mínima inalcançável mesmo sem espera")
+            return
+        self.pending_requests.push(request)
+        if not self.batch_scheduling and not self.request_batching:
+            self.process_requests()  # Com agrupamento, as requisições esperam process_requests para formar grupos
         
+    def resolve_route(self, request):
+        """
+        Retorna a rota da requisição, resolvendo-a apenas na primeira vez. A rota fica fixada na
+        requisição ('route' e, como vetor compacto de índices de canais, 'route_edges') junto com a
+        versão dos canais em que foi validada. Enquanto os canais não mudam, nenhuma revalidação é
+        feita; se mudaram, a rota fixada é verificada e só é recalculada se deixou de ser válida.
+        Nunca avança o relógio da rede.
+
+        Args:
+            request (dict): Requisição.
+
+        Returns:
+            list or None: Rota da requisição, ou None se não houver rota válida.
+        """
+        version = self.network.channel_version
+        route = request.get('route')
+        if route is not None and request.get('route_version') == version:
+            return route
+
+        if route is None or not self.network.is_route_valid(route):
+            route = self.network.networklayer.short_route_valid(request['alice_id'], request['bob_id'], increment_timeslot=False)
+            request['route'] = route
+            request['route_edges'] = self.network.route_edge_ids(route) if route else None
+        request['route_version'] = version
+        return route
+
     def process_requests(self, max_attempts=1):
-        self.prioritize_requests()
+        if self.request_batching:
+            self.coalesce_pending(self.coalesce_window)
+
+        if self.batch_scheduling:
+            self.schedule_batch(window=self.batch_window)
+            return
+
+        # A fila de pendentes já mantém a ordem de prioridade
         attempts = 0
         # Suponha que você queira começar no timeslot 1
         # Assim, se o timeslot atual for 0, incrementamos manualmente
@@ -105,9 +162,13 @@ class Controller():
                 self.network.timeslot()
                 current_timeslot = self.network.get_timeslot()
 
-            request = self.pending_requests[0]
+            request = self.pending_requests.peek()
+            if self.deadline_scheduling and not self.can_meet_deadline(request):
+                self.pending_requests.pop()
+                self.reject_request(request, "Prazo de fidelidade perdido")
+                continue
             if self.try_schedule_request(request, current_timeslot):
-                self.pending_requests.pop(0)
+                self.pending_requests.pop()
                 attempts = 0
             else:
                 self.logger.log(f"Requisição {request} não pôde ser agendada. Avançando timeslot.")
@@ -128,21 +189,22 @@ class Controller():
         """
         alice_id = request['alice_id']
         bob_id = request['bob_id']
-        route = self.network.networklayer.short_route_valid(alice_id, bob_id,increment_timeslot=False)
+        duration = request.get('duration', 1)  # Número de timeslots que a requisição ocupa a rota
+        route = self.resolve_route(request)
 
         if route:
             # Tentar reutilizar um timeslot existente
             if current_timeslot in self.scheduled_requests:
                 if self.share_timeslot(route, current_timeslot):
-                    self.reserve_route(route, current_timeslot)
+                    self.reserve_route(route, current_timeslot, duration)
                     self.scheduled_requests.setdefault(current_timeslot, []).append(request)
                     self.logger.log(f"Requisição agendada no mesmo timeslot {current_timeslot} para rota {route}.")
                     return True
 
             # Se não for possível reutilizar, busque o próximo disponível
-            next_timeslot = self.find_next_available_timeslot(route)
-            if self.is_route_available(route, next_timeslot):
-                self.reserve_route(route, next_timeslot)
+            next_timeslot = self.find_next_available_timeslot(route, duration)
+            if self.is_route_available(route, next_timeslot, duration):
+                self.reserve_route(route, next_timeslot, duration)
                 self.scheduled_requests.setdefault(next_timeslot, []).append(request)
                 self.logger.log(f"Requisição agendada: {request} no timeslot {next_timeslot}.")
                 return True
@@ -168,15 +230,277 @@ class Controller():
 
         # Obter a última requisição da rota no mesmo timeslot
         for request in reversed(self.scheduled_requests[timeslot]):
-            existing_route = self.network.networklayer.short_route_valid(
-                request['alice_id'], request['bob_id']
-            )
+            # Rota fixada na admissão da requisição, sem recalcular caminhos
+            existing_route = request.get('route') or self.resolve_route(request)
+            if not existing_route:
+                continue
             # Verificar sobreposição de nós intermediários
             overlapping_nodes = set(route[:-1]).intersection(existing_route[:-1])
             if overlapping_nodes:
                 return False  # Conflito encontrado
         return True
 
+    # Agrupamento de requisições
+
+    def batch_key(self, request):
+        """
+        Chave de compatibilidade: requisições com a mesma chave podem ser unidas em uma só transferência.
+
+        Args:
+            request (dict): Requisição.
+
+        Returns:
+            tuple or None: Cliente, servidor, protocolo, cenário e rota; None se a requisição não tem rota.
+        """
+        route = request.get('slice_path') or self.resolve_route(request)
+        if not route or request.get('protocol') not in ('AC_BQC', 'BFK_BQC'):
+            return None
+        return (request['alice_id'], request['bob_id'], request['protocol'], request.get('scenario', 1), tuple(route))
+
+    def batch_capacity(self, request):
+        """
+        Número máximo de qubits de um grupo: max_batch_qubits ou, por padrão, a menor memória entre cliente e servidor.
+
+        Args:
+            request (dict): Requisição do grupo.
+
+        Returns:
+            int: Número máximo de qubits.
+        """
+        if self.max_batch_qubits is not None:
+            return self.max_batch_qubits
+        hosts = self.network.hosts
+        return min(hosts[request['alice_id']].memory_size, hosts[request['bob_id']].memory_size)
+
+    def merge_requests(self, requests):
+        """
+        Une requisições compatíveis em uma requisição: os qubits são somados e a profundidade é a maior
+        entre elas. As requisições originais ficam em 'batch', na ordem em que seus qubits são enviados.
+
+        Args:
+            requests (list): Requisições com a mesma batch_key.
+
+        Returns:
+            dict: Requisição do grupo.
+        """
+        deepest = max(requests, key=lambda request: request.get('circuit_depth', 0))
+        merged = dict(requests[0])
+        merged.update({
+            'num_qubits': sum(request['num_qubits'] for request in requests),
+            'circuit_depth': deepest.get('circuit_depth', 0),
+            'quantum_circuit': deepest.get('quantum_circuit'),
+            'batch': list(requests),
+        })
+        if self.deadline_scheduling:
+            merged.pop('deadline', None)
+            merged['arrival_timeslot'] = min(request.get('arrival_timeslot', 0) for request in requests)
+            self.compute_deadline(merged)
+        return merged
+
+    def coalesce_requests(self, requests):
+        """
+        Une as requisições compatíveis de uma lista, respeitando batch_capacity e, para que o grupo
+        passe na verificação de fidelidade mesmo com os qubits de menor fidelidade inicial, o
+        orçamento de decoerência de fidelity_budget.
+
+        Args:
+            requests (list): Requisições, em ordem de prioridade.
+
+        Returns:
+            list: Requisições resultantes; grupos ficam na posição do seu primeiro membro.
+        """
+        result, open_groups = [], {}
+        for request in requests:
+            key = self.batch_key(request)
+            group = open_groups.get(key) if key is not None else None
+            if group is not None:
+                candidate = group + [request]
+                qubits = sum(member['num_qubits'] for member in candidate)
+                merged = self.merge_requests(candidate)
+                if qubits <= self.batch_capacity(request) and self.execution_timeslots(merged) <= self.fidelity_budget(merged, initial=self.min_initial_fidelity):
+                    group.append(request)
+                    continue
+            group = [request]
+            result.append(group)
+            if key is not None:
+                open_groups[key] = group
+        return [group[0] if len(group) == 1 else self.merge_requests(group) for group in result]
+
+    def coalesce_pending(self, window=None):
+        """
+        Une as requisições compatíveis da fila de pendentes.
+
+        Args:
+            window (int, optional): Número máximo de requisições pendentes examinadas.
+        """
+        count = len(self.pending_requests) if window is None else min(window, len(self.pending_requests))
+        requests = [self.pending_requests.pop() for _ in range(count)]
+        coalesced = self.coalesce_requests(requests)
+        for request in coalesced:
+            self.pending_requests.push(request)
+        if len(coalesced) < len(requests):
+            self.logger.log(f"{len(requests)} requisições pendentes unidas em {len(coalesced)}.")
+
+    def split_result(self, request, result):
+        """
+        Divide o resultado de um grupo entre as requisições que o compõem. No AC_BQC cada requisição
+        recebe os seus qubits; no BFK_BQC, os resultados dos seus qubits nas suas rodadas.
+
+        Args:
+            request (dict): Requisição do grupo.
+            result: Resultado retornado pela execução do grupo.
+
+        Returns:
+            list: Resultado de cada requisição do grupo.
+        """
+        results, start = [], 0
+        for member in request['batch']:
+            end = start + member['num_qubits']
+            if not result:
+                part = None
+            elif request['protocol'] == 'BFK_BQC':
+                rounds = member.get('circuit_depth') or len(result)
+                part = [round_results[start:end] for round_results in result[:rounds]]
+            else:
+                part = result[start:end]
+            member['status'] = 'executado' if result else 'falhou'
+            member['result'] = part
+            results.append(part)
+            start = end
+        return results
+
+    # Agendamento em lote
+
+    @staticmethod
+    def route_resources(route):
+        """
+        Recursos ocupados por uma rota durante a execução: seus enlaces e seus nós, exceto o destino.
+        Duas rotas conflitam se compartilham algum recurso.
+
+        Args:
+            route (list): Rota como lista de nós.
+
+        Returns:
+            set: Recursos ('node', nó) e ('link', enlace) da rota.
+        """
+        resources = {('node', node) for node in route[:-1]}
+        resources.update(('link', link) for link in LinkOccupancy.route_links(route))
+        return resources
+
+    def build_conflict_graph(self, routes):
+        """
+        Constrói o grafo de conflitos de um lote de requisições: duas requisições conflitam se suas
+        rotas compartilham um enlace ou um nó (exceto o destino, como em share_timeslot).
+
+        Args:
+            routes (list): Rota de cada requisição do lote.
+
+        Returns:
+            list: Conjunto de vizinhos (índices) de cada requisição.
+        """
+        resources = defaultdict(list)
+        for index, route in enumerate(routes):
+            for resource in self.route_resources(route):
+                resources[resource].append(index)
+
+        neighbors = [set() for _ in routes]
+        for members in resources.values():
+            for index in members:
+                neighbors[index].update(members)
+        for index, adjacent in enumerate(neighbors):
+            adjacent.discard(index)
+        return neighbors
+
+    def color_conflict_graph(self, neighbors, routes, durations, start_timeslot):
+        """
+        Atribui timeslots às requisições de um lote com a coloração DSatur do grafo de conflitos.
+        A próxima requisição é a de maior saturação (timeslots distintos entre os vizinhos já
+        coloridos); empates favorecem o maior grau e depois a maior prioridade. Cada requisição
+        recebe o primeiro timeslot livre para a sua rota e sem conflito com os vizinhos.
+
+        Args:
+            neighbors (list): Grafo de conflitos, como retornado por build_conflict_graph.
+            routes (list): Rota de cada requisição, em ordem de prioridade.
+            durations (list): Número de timeslots de cada requisição.
+            start_timeslot (int): Primeiro timeslot disponível.
+
+        Returns:
+            list: Timeslot atribuído a cada requisição.
+        """
+        slots = [None] * len(routes)
+        neighbor_slots = [set() for _ in routes]
+        heap = [(0, -len(neighbors[index]), index) for index in range(len(routes))]
+        heapq.heapify(heap)
+
+        while heap:
+            saturation, degree, index = heapq.heappop(heap)
+            if slots[index] is not None or -saturation != len(neighbor_slots[index]):
+                continue  # Entrada desatualizada
+
+            links = LinkOccupancy.route_links(routes[index])
+            duration = durations[index]
+            slot = start_timeslot
+            while True:
+                slot = self.occupied_routes.earliest_common_slot(links, slot, duration)
+                # Primeiro vizinho já agendado que se sobrepõe ao intervalo candidato
+                blocking = [slots[other] + durations[other] for other in neighbors[index]
+                            if slots[other] is not None and slots[other] < slot + duration and slot < slots[other] + durations[other]]
+                if not blocking:
+                    break
+                slot = min(blocking)
+
+            slots[index] = slot
+            for other in neighbors[index]:
+                if slots[other] is None and slot not in neighbor_slots[other]:
+                    neighbor_slots[other].add(slot)
+                    heapq.heappush(heap, (-len(neighbor_slots[other]), -len(neighbors[other]), other))
+        return slots
+
+    def schedule_batch(self, requests=None, window=None):
+        """
+        Agenda um lote de requisições de uma só vez, ocupando o menor número de timeslots: as rotas
+        são resolvidas, o grafo de conflitos é construído e colorido com DSatur ponderado pela prioridade.
+
+        Args:
+            requests (list, optional): Requisições a agendar. Por padrão, as pendentes do controlador.
+            window (int, optional): Número máximo de requisições pendentes consideradas no lote.
+
+        Returns:
+            dict: Requisições agendadas neste lote, por timeslot.
+        """
+        if requests is None:
+            count = len(self.pending_requests) if window is None else min(window, len(self.pending_requests))
+            requests = [self.pending_requests.pop() for _ in range(count)]
+        else:
+            requests = sorted(requests, key=self.queue_priority)
+
+        batch, routes = [], []
+        for request in requests:
+            route = self.resolve_route(request)
+            if route and self.deadline_scheduling and self.compute_deadline(request) < self.network.get_timeslot():
+                self.reject_request(request, "Prazo de fidelidade perdido")
+            elif route:
+                batch.append(request)
+                routes.append(route)
+            else:
+                self.record_failed_request(request, "Nenhuma rota válida")
+
+        start_timeslot = max(self.network.get_timeslot(), 1)
+        durations = [request.get('duration', 1) for request in batch]
+        neighbors = self.build_conflict_graph(routes)
+        slots = self.color_conflict_graph(neighbors, routes, durations, start_timeslot)
+
+        schedule = {}
+        for request, route, slot, duration in zip(batch, routes, slots, durations):
+            if self.deadline_scheduling and slot > request['deadline']:
+                self.reject_request(request, "Prazo de fidelidade perdido")
+                continue
+            self.reserve_route(route, slot, duration)
+            self.scheduled_requests.setdefault(slot, []).append(request)
+            schedule.setdefault(slot, []).append(request)
+        self.logger.log(f"Lote de {len(batch)} requisições agendado em {len(schedule)} timeslots.")
+        return schedule
+
     def execute_scheduled_requests(self, timeslot):
         """
         Executa requisições agendadas no timeslot especificado.
@@ -186,111 +510,336 @@ class Controller():
             return
 
         self.logger.log(f"Executando requisições do timeslot {timeslot}.")
-        for request in self.scheduled_requests[timeslot]:
-            if self.execute_request_one(request):
-                self.executed_requests.append({"request": request, "timeslot": timeslot})
+        provisioner = self.network.provisioner
+        if provisioner is not None:
+            provisioner.provision(self.network)  # Estoque previsto pelos timeslots anteriores, fora do tempo das requisições
+        start = self.network.get_timeslot()
+        if self.concurrent_execution:
+            self.execute_concurrent_requests(self.scheduled_requests[timeslot], timeslot)
+        else:
+            for request in self.scheduled_requests[timeslot]:
+                if self.execute_request_one(request, timeslot):
+                    self.record_executed(request, timeslot)
+        self.elapsed_timeslots += max(self.network.get_timeslot() - start, 1)
+        if provisioner is not None:
+            provisioner.observe_requests(self.scheduled_requests[timeslot], lambda request: request.get('slice_path') or self.resolve_route(request))
 
         del self.scheduled_requests[timeslot]  # Limpa as requisições já executadas
 
-    def execute_request_one(self, request):
+    def execute_request_one(self, request, timeslot=None):
         """
         Executa uma requisição específica, validando a rota.
 
         Args:
             request (dict): Requisição a ser executada.
+            timeslot (int, optional): Timeslot em que a requisição foi agendada. Se None, libera todas as reservas da rota.
 
         Returns:
             bool: True se a execução foi bem-sucedida, False caso contrário.
         """
-        alice_id = request['alice_id']
-        bob_id = request['bob_id']
-        route = self.network.networklayer.short_route_valid(alice_id, bob_id)
+        route = self.resolve_route(request)
 
         if route:
             success = self.network.execute_request(request)
-
-            if success:
-                self.logger.log(f"Requisição executada: {request}")
-                self.release_route(route)
-                return True
-            else:
-                self.logger.log(f"Falha ao executar requisição: {request}")
-                self.record_failed_request(request)  # Registra a falha
-                self.release_route(route)  # Libera a rota mesmo em caso de falha
-                return False
+            return self.finish_request(request, route, success, timeslot)
 
         self.logger.log(f"Falha ao encontrar rota válida para requisição: {request}")
         self.record_failed_request(request)  # Registra a falha
         return False
 
+    def finish_request(self, request, route, success, timeslot=None):
+        """
+        Registra o resultado de uma requisição executada e libera a sua rota.
+
+        Args:
+            request (dict): Requisição executada.
+            route (list): Rota usada.
+            success (bool): Resultado da execução.
+            timeslot (int, optional): Timeslot em que a requisição foi agendada.
+
+        Returns:
+            bool: O próprio resultado.
+        """
+        if 'batch' in request:
+            self.split_result(request, success)
+        if success:
+            self.logger.log(f"Requisição executada: {request}")
+        else:
+            self.logger.log(f"Falha ao executar requisição: {request}")
+            for member in request.get('batch', (request,)):
+                self.record_failed_request(member)  # Registra a falha
+        self.release_route(route, timeslot, request.get('duration', 1))  # Libera a rota mesmo em caso de falha
+        return success
+
+    def record_executed(self, request, timeslot):
+        """
+        Registra uma requisição executada com sucesso; um grupo é registrado como as requisições que o compõem.
+
+        Args:
+            request (dict): Requisição executada.
+            timeslot (int): Timeslot em que foi agendada.
+        """
+        for member in request.get('batch', (request,)):
+            self.executed_requests.append({"request": member, "timeslot": timeslot})
+
+    def execute_concurrent_requests(self, requests, timeslot=None):
+        """
+        Executa as requisições de um timeslot com Network.execute_concurrent: as que não compartilham
+        enlaces nem nós, exceto o destino, executam como simultâneas, cada uma com seu relógio lógico.
+
+        Args:
+            requests (list): Requisições do timeslot.
+            timeslot (int, optional): Timeslot em que as requisições foram agendadas.
+
+        Returns:
+            list: Resultado de cada requisição.
+        """
+        runnable, routes = [], []
+        for request in requests:
+            route = self.resolve_route(request)
+            if route:
+                runnable.append(request)
+                routes.append(route)
+            else:
+                self.logger.log(f"Falha ao encontrar rota válida para requisição: {request}")
+                self.record_failed_request(request)
+
+        outcomes = self.network.execute_concurrent(runnable)
+        for request, route, success in zip(runnable, routes, outcomes):
+            if self.finish_request(request, route, success, timeslot):
+                self.record_executed(request, timeslot)
+        return outcomes
+
+    # Prazos de fidelidade (EDF)
+
+    def decoherence_profile(self, request, route=None, initial=None):
+        """
+        Descreve como a fidelidade verificada pela camada de transporte decai para a requisição.
+        No AC_BQC é verificada a fidelidade da rota, o produto dos pares EPR (criados com fidelidade 1)
+        de cada enlace, que perde um fator (1 - decoherence_factor) por enlace a cada timeslot. Nos
+        demais protocolos é verificada a fidelidade do qubit, criado em média com initial_fidelity
+        (ou 'initial_fidelity' na requisição).
+
+        Args:
+            request (dict): Requisição.
+            route (list, optional): Rota da requisição. Por padrão, o slice_path ou a rota fixada.
+            initial (float, optional): Fidelidade inicial dos qubits, no lugar da esperada.
+
+        Returns:
+            tuple: (fidelidade inicial, fatores de decoerência por timeslot, número de enlaces da rota).
+        """
+        route = route or request.get('slice_path') or self.resolve_route(request) or []
+        hops = max(len(route) - 1, 1)
+        if request.get('protocol') == 'AC_BQC':
+            return 1.0, hops, hops
+        if initial is None:
+            initial = request.get('initial_fidelity', self.initial_fidelity)
+        return initial, 1, hops
+
+    def fidelity_budget(self, request, route=None, initial=None):
+        """
+        Número máximo de timeslots, entre espera e execução, antes que a fidelidade verificada
+        fique abaixo de fidelity_threshold.
+
+        Args:
+            request (dict): Requisição.
+            route (list, optional): Rota da requisição.
+            initial (float, optional): Fidelidade inicial dos qubits, no lugar da esperada.
+
+        Returns:
+            float: Número de timeslots, ou infinito se não há decoerência.
+        """
+        initial, rate, _ = self.decoherence_profile(request, route, initial)
+        factor = self.network.decoherence_factor
+        if initial < self.fidelity_threshold:
+            return -1
+        if factor <= 0:
+            return math.inf
+        if factor >= 1:
+            return 0
+        return math.floor(math.log(self.fidelity_threshold / initial) / (rate * math.log(1 - factor)))
+
+    def execution_timeslots(self, request, route=None):
+        """
+        Timeslots de decoerência acumulados durante a execução, até a última verificação de
+        fidelidade. No AC_BQC os qubits vão e voltam (um timeslot por qubit em cada sentido, sendo a
+        última verificação antes do último timeslot) e esperam circuit_depth timeslots no servidor;
+        no BFK_BQC cada qubit espera a criação de um par EPR por enlace e o teletransporte. Nos
+        demais protocolos, soma-se o transporte por enlace e a profundidade do circuito.
+
+        Args:
+            request (dict): Requisição.
+            route (list, optional): Rota da requisição.
+
+        Returns:
+            int: Número de timeslots.
+        """
+        _, _, hops = self.decoherence_profile(request, route)
+        num_qubits = request.get('num_qubits', 1)
+        depth = request.get('circuit_depth')
+        if depth is None:
+            circuit = request.get('quantum_circuit')
+            depth = circuit.depth() if circuit is not None else 0
+
+        protocol = request.get('protocol')
+        if protocol == 'AC_BQC':
+            return 2 * num_qubits - 1 + depth
+        if protocol == 'BFK_BQC':
+            return num_qubits * (hops + 1)
+        return num_qubits * (hops + 1) + depth
+
+    def compute_deadline(self, request):
+        """
+        Calcula o último timeslot em que a requisição pode começar e ainda terminar com fidelidade
+        acima de fidelity_threshold. Os recursos da requisição são preparados na sua chegada, então
+        a espera consome o mesmo orçamento de decoerência que a execução. O prazo fica em
+        'deadline' e a chegada em 'arrival_timeslot'.
+
+        Args:
+            request (dict): Requisição.
+
+        Returns:
+            float: Último timeslot de início; menor que a chegada se a requisição nunca cumpre o prazo.
+        """
+        arrival = request.setdefault('arrival_timeslot', self.network.get_timeslot())
+        request['deadline'] = arrival + self.fidelity_budget(request) - self.execution_timeslots(request)
+        return request['deadline']
+
+    def can_meet_deadline(self, request, timeslot=None):
+        """
+        Verifica se a requisição ainda pode começar dentro do prazo, considerando o primeiro
+        timeslot em que sua rota fica livre.
+
+        Args:
+            request (dict): Requisição.
+            timeslot (int, optional): Timeslot de início pretendido. Por padrão, o próximo livre da rota.
+
+        Returns:
+            bool: True se o prazo pode ser cumprido.
+        """
+        deadline = request.get('deadline')
+        if deadline is None:
+            deadline = self.compute_deadline(request)
+        if timeslot is None:
+            route = self.resolve_route(request)
+            if not route:
+                return False
+            timeslot = self.find_next_available_timeslot(route, request.get('duration', 1))
+        return timeslot <= deadline
+
+    def reject_request(self, request, reason):
+        """
+        Rejeita uma requisição que não pode cumprir o prazo, sem ocupar a rede com ela.
+
+        Args:
+            request (dict): Requisição rejeitada.
+            reason (str): Motivo da rejeição.
+        """
+        for member in request.get('batch', (request,)):
+            member['status'] = 'falhou'
+            self.record_failed_request(member, reason)
+
     # Gerenciamento das Rotas
    
-    def is_route_available(self, route, timeslot):
+    def is_route_available(self, route, timeslot, duration=1):
         """
-        Verifica se uma rota está livre para uso no timeslot especificado.
+        Verifica se uma rota está livre para uso nos timeslots [timeslot, timeslot + duration).
         """
-        for i in range(len(route) - 1):
-            link = (route[i], route[i + 1])
-            if self.occupied_routes.get(link) == timeslot:
-                self.logger.log(f"Conflito: Link {link} ocupado no timeslot {timeslot}.")
-                return False
+        if not self.occupied_routes.is_route_free(LinkOccupancy.route_links(route), timeslot, duration):
+            self.logger.log(f"Conflito: rota {route} ocupada no timeslot {timeslot}.")
+            return False
         return True
 
-    def reserve_route(self, route, timeslot):
+    def check_routes(self, routes, timeslot, duration=1):
+        """
+        Verifica de uma só vez quais rotas estão livres nos timeslots [timeslot, timeslot + duration).
+
+        Args:
+            routes (list): Rotas candidatas, como listas de nós.
+            timeslot (int): Primeiro timeslot.
+            duration (int): Número de timeslots.
+
+        Returns:
+            np.ndarray: Vetor booleano, True para as rotas livres.
         """
-        Reserva uma rota para uso no timeslot especificado.
+        masks = self.occupied_routes.masks(routes)
+        return ~self.occupied_routes.conflicts(masks, timeslot, duration)
+
+    def reserve_route(self, route, timeslot, duration=1):
+        """
+        Reserva uma rota para uso nos timeslots [timeslot, timeslot + duration).
 
         Args:
             route (list): Rota a ser reservada.
             timeslot (int): Timeslot em que a rota será reservada.
+            duration (int): Número de timeslots da reserva.
         """
-        for i in range(len(route) - 1):
-            link = (route[i], route[i + 1])
-            self.occupied_routes[link] = timeslot
+        self.occupied_routes.reserve_route(LinkOccupancy.route_links(route), timeslot, duration)
         self.logger.log(f"Rota reservada: {route} no timeslot {timeslot}.")
 
-    def release_route(self, route):
+    def release_route(self, route, timeslot=None, duration=1):
         """
         Libera a rota, permitindo seu reuso em outros timeslots.
 
         Args:
             route (list): Rota a ser liberada.
+            timeslot (int, optional): Primeiro timeslot da reserva. Se None, libera todas as reservas dos enlaces da rota.
+            duration (int): Número de timeslots da reserva.
         """
-        for i in range(len(route) - 1):
-            link = (route[i], route[i + 1])
-            self.occupied_routes.pop(link, None)
+        self.occupied_routes.release_route(LinkOccupancy.route_links(route), timeslot, duration)
         self.logger.log(f"Rota liberada: {route}.")
 
     # Funções Auxiliares 
 
-    def find_next_available_timeslot(self, route):
+    def find_next_available_timeslot(self, route, duration=1):
         """
-        Encontra o próximo timeslot em que a rota estará completamente livre.
+        Encontra o próximo timeslot em que a rota estará completamente livre, com uma única
+        consulta vetorizada à ocupação dos enlaces em vez de testar os timeslots um a um.
 
         Args:
             route (list): Rota a ser verificada.
+            duration (int): Número de timeslots consecutivos necessários.
 
         Returns:
             int: Próximo timeslot livre para a rota.
         """
         current_timeslot = self.network.get_timeslot()
-        while not self.is_route_available(route, current_timeslot):
-            current_timeslot += 1
-        return current_timeslot
-
-    # def prioritize_requests(self):
-    #     """
-    #     Ordena as requisições pendentes com base em critérios de prioridade.
-    #     """
-    #     # Verifica se quantum_circuit é um objeto válido
-    #     self.pending_requests.sort(key=lambda req: (req['num_qubits'], -len(req['quantum_circuit'][0].data)))
-    
+        return self.occupied_routes.earliest_common_slot(LinkOccupancy.route_links(route), current_timeslot, duration)
+
+    @staticmethod
+    def request_priority(request):
+        """
+        Prioridade de uma requisição: menos qubits primeiro e, em seguida, circuitos com mais instruções.
+
+        Args:
+            request (dict): Requisição.
+
+        Returns:
+            tuple: Chave de prioridade, menor é atendida primeiro.
+        """
+        return (request['num_qubits'], -len(request['quantum_circuit'].data))
+
+    def queue_priority(self, request):
+        """
+        Chave da fila de pendentes: a prioridade da requisição ou, no modo EDF, o prazo seguido da prioridade.
+
+        Args:
+            request (dict): Requisição.
+
+        Returns:
+            tuple: Chave de prioridade, menor é atendida primeiro.
+        """
+        if self.deadline_scheduling:
+            return (request.get('deadline', math.inf),) + self.request_priority(request)
+        return self.request_priority(request)
+
     def prioritize_requests(self):
         """
-        Ordena as requisições pendentes com base em critérios de prioridade.
+        Reordena as requisições pendentes com base em critérios de prioridade. A fila já é mantida
+        ordenada na inserção; só é necessário chamar este método se as requisições forem alteradas
+        ou se o modo deadline_scheduling for trocado com requisições pendentes.
         """
-        # Ordena por número de qubits e, em seguida, pelo número de instruções no circuito
-        self.pending_requests.sort(key=lambda req: (req['num_qubits'], -len(req['quantum_circuit'].data)))
+        self.pending_requests.reprioritize()
 
 
     def generate_schedule_report(self):
@@ -304,6 +853,7 @@ class Controller():
             "success": len(self.executed_requests) if self.executed_requests else 0,
             "failed": len(self.failed_requests) if self.failed_requests else 0,
             "scheduled": len(self.scheduled_requests) if self.scheduled_requests else 0,
+            "goodput": len(self.executed_requests) / self.elapsed_timeslots if self.elapsed_timeslots else 0.0,
             "failed_details": []  # Para armazenar detalhes das falhas
         }
 
@@ -371,14 +921,135 @@ class Controller():
             self.network.restart_network()
             self.logger.log(f"Rede reiniciada. Timeslot reiniciado para {self.network.get_timeslot()}.")
 
+    def consume(self, requests, buffer_size=1024, keep_history=True, max_idle_rounds=8):
+        """
+        Consome um fluxo de requisições (por exemplo, um RequestStream) em blocos de até buffer_size:
+        cada bloco é recebido, agendado e executado antes de o próximo ser lido, então no máximo um
+        bloco fica em memória. Os circuitos das requisições concluídas são descartados.
+
+        Args:
+            requests (iterable): Requisições, lidas sob demanda.
+            buffer_size (int): Número máximo de requisições lidas por bloco.
+            keep_history (bool): Se False, executed_requests e failed_requests são esvaziados a cada bloco, restando só os totais.
+            max_idle_rounds (int): Rodadas sem agendar nada, ao fim do fluxo, antes de desistir das pendentes.
+
+        Returns:
+            dict : Totais de requisições recebidas, executadas, que falharam e que ficaram pendentes.
+        """
+        if buffer_size < 1:
+            raise ValueError("buffer_size deve ser positivo.")
+        totals = {'received': 0, 'executed': 0, 'failed': 0, 'pending': 0}
+        executed_mark, failed_mark = len(self.executed_requests), len(self.failed_requests)
+
+        def flush():
+            nonlocal executed_mark, failed_mark
+            self.send_scheduled_requests()
+            for entry in self.executed_requests[executed_mark:]:
+                entry['request'].pop('quantum_circuit', None)
+            for entry in self.failed_requests[failed_mark:]:
+                entry['request'].pop('quantum_circuit', None)
+            totals['executed'] += len(self.executed_requests) - executed_mark
+            totals['failed'] += len(self.failed_requests) - failed_mark
+            if not keep_history:
+                self.executed_requests.clear()
+                self.failed_requests.clear()
+            executed_mark, failed_mark = len(self.executed_requests), len(self.failed_requests)
+
+        requests = iter(requests)
+        while True:
+            chunk = list(itertools.islice(requests, buffer_size))
+            if not chunk:
+                break
+            totals['received'] += len(chunk)
+            for request in chunk:
+                self.receive_request(request)
+            self.process_requests()
+            flush()
+            self.logger.log(f"Bloco de {len(chunk)} requisições consumido ({totals['received']} no total).")
+
+        # Requisições que não couberam nos seus blocos
+        idle = 0
+        while self.pending_requests and idle < max_idle_rounds:
+            before = len(self.pending_requests)
+            self.process_requests()
+            flush()
+            idle = idle + 1 if len(self.pending_requests) >= before else 0
+        totals['pending'] = len(self.pending_requests)
+        return totals
+
+
+    # Avaliação especulativa de agendamentos
+
+    def simulate_schedule(self, schedule):
+        """
+        Executa um agendamento candidato em uma cópia da rede (Network.fork), sem alterar a rede
+        nem as requisições originais.
+
+        Args:
+            schedule (dict): Requisições por timeslot, no formato de scheduled_requests.
+
+        Returns:
+            dict: Sucessos, falhas, EPRs usados e fidelidade média das rotas do agendamento.
+        """
+        network = self.network.fork()
+        used_eprs = network.get_total_useds_eprs()
+        num_fidelities = len(network.application_layer.route_fidelities)
+
+        controller = Controller(network)
+        controller.scheduled_requests = {ts: [dict(request) for request in requests]
+                                         for ts, requests in schedule.items()}
+        controller.send_scheduled_requests()
+
+        fidelities = network.application_layer.route_fidelities[num_fidelities:]
+        return {
+            "success": len(controller.executed_requests),
+            "failed": len(controller.failed_requests),
+            "eprs_used": network.get_total_useds_eprs() - used_eprs,
+            "average_fidelity": sum(fidelities) / len(fidelities) if fidelities else 0.0,
+        }
+
+    def select_best_schedule(self, candidates, score=None):
+        """
+        Simula cada agendamento candidato em uma cópia da rede e escolhe o melhor.
+
+        Args:
+            candidates (list): Agendamentos candidatos (dicts de requisições por timeslot).
+            score (callable, optional): Função que recebe as métricas de simulate_schedule e retorna um valor
+                comparável, maior é melhor. Por padrão, mais sucessos, depois maior fidelidade e menos EPRs.
+
+        Returns:
+            tuple: (melhor agendamento, métricas da simulação).
+        """
+        if score is None:
+            score = lambda metrics: (metrics["success"], metrics["average_fidelity"], -metrics["eprs_used"])
+
+        best, best_metrics = None, None
+        for schedule in candidates:
+            metrics = self.simulate_schedule(schedule)
+            self.logger.log(f"Agendamento candidato avaliado: {metrics}")
+            if best_metrics is None or score(metrics) > score(best_metrics):
+                best, best_metrics = schedule, metrics
+        return best, best_metrics
 
     # # SIMULAÇÃO EM SLICES
-    def schedule_requests(self, requests, slice_paths=None, protocols=None):
+    def schedule_requests(self, requests, slice_paths=None, protocols=None, weights=None):
+        """
+        Vincula cada requisição ao caminho do seu slice (pelo cliente e protocolo) e agenda as
+        requisições em timeslots com schedule_work_conserving.
+
+        Args:
+            requests (list): Lista de requisições.
+            slice_paths (dict): Slices, com cliente, protocolo e caminho de cada um.
+            protocols (list): Protocolos da simulação.
+            weights (dict, optional): Peso de cada slice. Por padrão, slice_weights.
+
+        Returns:
+            dict: Dicionário de timeslots com requisições agendadas.
+        """
         if protocols is None or slice_paths is None:
             raise ValueError("Protocolos e slice_paths devem ser fornecidos.")
 
-        scheduled_timeslots = {}
-        current_timeslot = 1
+        slice_requests = {key: [] for key in slice_paths}
 
         # Mapeia as requisições para os slices corretos
         for request in requests:
@@ -394,18 +1065,11 @@ class Controller():
 
             if slice_key:
                 request['slice_path'] = slice_paths[slice_key]["path"]  # Vincula o caminho correto
+                slice_requests[slice_key].append(request)
             else:
                 raise ValueError(f"Nenhum slice encontrado para a requisição: {request}")
 
-        # Agrupa as requisições por timeslot
-        num_slices = len(slice_paths)
-        for i in range(0, len(requests), num_slices):
-            scheduled_timeslots[current_timeslot] = requests[i:i + num_slices]
-            current_timeslot += 1
-
-        return scheduled_timeslots
-
-
+        return self.schedule_work_conserving(slice_requests, weights)
 
     def map_requests_to_slices(self, requests, protocol_to_slice):
         """
@@ -433,26 +1097,86 @@ class Controller():
         return slice_requests
     
 
-    def schedule_requests_in_timeslots(self, slice_requests):
+    def schedule_requests_in_timeslots(self, slice_requests, weights=None):
         """
-        Agenda as requisições em timeslots alternando entre os slices.
+        Agenda as requisições em timeslots alternando entre os slices, com schedule_work_conserving.
 
         Args:
             slice_requests (dict): Requisições separadas por slices.
+            weights (dict, optional): Peso de cada slice. Por padrão, slice_weights.
 
         Returns:
             dict: Dicionário de timeslots com requisições agendadas.
         """
+        return self.schedule_work_conserving(slice_requests, weights)
+
+    def schedule_work_conserving(self, slice_requests, weights=None, start_timeslot=1):
+        """
+        Agenda as requisições dos slices em timeslots sem desperdiçar capacidade. Cada slice tem
+        sua fila e, a cada timeslot, os slices com requisições pendentes são visitados em ordem de
+        justiça ponderada (menor número de requisições atendidas dividido pelo peso). A requisição
+        da frente de cada fila entra no timeslot se a sua rota não conflita com as já admitidas, e
+        as visitas se repetem enquanto alguma requisição puder entrar. Assim, a capacidade de um
+        slice ocioso fica para os slices com fila cujos caminhos não conflitam. No modo
+        deadline_scheduling, os slices são visitados pelo prazo da requisição da frente e as
+        requisições com prazo vencido são rejeitadas.
+
+        A rota de uma requisição é o seu slice_path ou, na falta dele, a rota resolvida pelo controlador.
+
+        Args:
+            slice_requests (dict): Requisições separadas por slices, em ordem de chegada. As listas não são alteradas.
+            weights (dict, optional): Peso de cada slice. Por padrão, slice_weights; slices sem peso valem 1.
+            start_timeslot (int): Primeiro timeslot do agendamento.
+
+        Returns:
+            dict: Dicionário de timeslots com requisições agendadas.
+        """
+        weights = self.slice_weights if weights is None else weights
+        queues = {slice_id: deque(requests) for slice_id, requests in slice_requests.items() if requests}
+        order = {slice_id: position for position, slice_id in enumerate(queues)}
+        served = dict.fromkeys(queues, 0)
+        resources = {}  # Recursos da rota de cada requisição, por id
+
+        def request_resources(request):
+            key = id(request)
+            if key not in resources:
+                route = request.get('slice_path') or self.resolve_route(request) or []
+                resources[key] = self.route_resources(route)
+            return resources[key]
+
+        def deadline(request):
+            if not self.deadline_scheduling:
+                return 0
+            if 'deadline' not in request:
+                self.compute_deadline(request)
+            return request['deadline']
+
         scheduled_timeslots = {}
-        current_timeslot = 1
+        current_timeslot = start_timeslot
 
-        while any(slice_requests.values()):
+        while queues:
             current_slot_requests = []
-
-            # Alterna entre slices para agendar as requisições
-            for slice_id, requests in slice_requests.items():
-                if requests:
-                    current_slot_requests.append(requests.pop(0))
+            used = set()
+            admitted = True
+            while admitted and queues:
+                admitted = False
+                # Slices menos atendidos em relação ao peso primeiro (no modo EDF, o menor prazo); empates na ordem dos slices
+                for slice_id in sorted(queues, key=lambda s: (deadline(queues[s][0]), served[s] / weights.get(s, 1), order[s])):
+                    queue = queues[slice_id]
+                    while self.deadline_scheduling and queue and deadline(queue[0]) < current_timeslot:
+                        self.reject_request(queue.popleft(), "Prazo de fidelidade perdido")
+                    if not queue:
+                        del queues[slice_id]
+                        continue
+                    needed = request_resources(queue[0])
+                    if not used.isdisjoint(needed):
+                        continue
+                    current_slot_requests.append(queue.popleft())
+                    used |= needed
+                    served[slice_id] += 1
+                    admitted = True
+                    if not queue:
+                        del queues[slice_id]
 
             if current_slot_requests:
                 scheduled_timeslots[current_timeslot] = current_slot_requests
@@ -0,0 +1,189 @@
+import math
+from ..objects import Logger, TimerWheel
+
+CHANNEL = 'channel'
+HOST = 'host'
+
+
+class CutoffPolicy():
+    """
+    Descarte de pares EPR e qubits que perderam a fidelidade útil. Quando um par entra em um canal
+    ou um qubit entra na memória de um host, o timeslot em que a decoerência o levará abaixo do
+    corte é calculado e o item é agendado em uma roda de temporizadores hierárquica. Entre uma
+    requisição e outra, a roda avança até o relógio da rede e apenas os itens vencidos são
+    verificados: os que ainda estão na rede e abaixo do corte são descartados, e os que tiveram a
+    fidelidade alterada nesse meio tempo são reagendados. Um protocolo em andamento nunca perde
+    seus pares ou qubits. Como a camada de rede só aceita rotas com pares em todos os canais, cada
+    par descartado é, por padrão, substituído por um par novo gerado pelo enlace.
+    """
+    def __init__(self, epr_threshold: float = 0.85, qubit_threshold: float = 0.85, regenerate: bool = True, slots: int = 64, levels: int = 4) -> None:
+        """
+        Args:
+            epr_threshold (float): Pares EPR abaixo desta fidelidade são descartados. None desativa o corte dos pares.
+            qubit_threshold (float): Qubits abaixo desta fidelidade são descartados. None desativa o corte dos qubits.
+            regenerate (bool): Se True, cada par descartado é substituído por um par novo, sem avançar o relógio.
+            slots (int): Número de baldes por nível da roda.
+            levels (int): Número de níveis da roda.
+        """
+        self.thresholds = {CHANNEL: epr_threshold, HOST: qubit_threshold}
+        self.regenerate = regenerate
+        self.wheel = TimerWheel(slots, levels)
+        self.network = None
+        self.expired_eprs = 0
+        self.expired_qubits = 0
+        self.regenerated_eprs = 0
+        self._entries = {}  # (tipo, chave, id do item) -> item agendado
+        self.logger = Logger.get_instance()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def attach(self, network):
+        """
+        Passa a controlar a rede: agenda os itens existentes e as inserções seguintes.
+
+        Args:
+            network (Network): Rede.
+        """
+        self.detach()
+        self.network = network
+        network.cutoff = self
+        network._dirty_channels.listener = lambda key, items: self.schedule_many(CHANNEL, key, items)
+        network._dirty_hosts.listener = lambda key, items: self.schedule_many(HOST, key, items)
+        self.rebuild()
+
+    def detach(self):
+        """
+        Deixa de controlar a rede.
+        """
+        network = self.network
+        if network is None:
+            return
+        network._dirty_channels.listener = None
+        network._dirty_hosts.listener = None
+        if network.cutoff is self:
+            network.cutoff = None
+        self.network = None
+
+    def rebuild(self):
+        """
+        Reagenda todos os itens da rede, por exemplo depois que o relógio voltou no tempo.
+        """
+        self.wheel.clear(self.network.get_timeslot())
+        self._entries.clear()
+        self.track(channels=list(self.network.channels), hosts=list(self.network.hosts))
+
+    def track(self, channels=(), hosts=()):
+        """
+        Agenda os itens de canais e hosts cujo conteúdo foi substituído, como na restauração de um snapshot.
+
+        Args:
+            channels (iterable): Chaves dos canais.
+            hosts (iterable): IDs dos hosts.
+        """
+        for key in channels:
+            store = self.store(CHANNEL, key)
+            if store:
+                self.schedule_many(CHANNEL, key, store)
+        for host_id in hosts:
+            store = self.store(HOST, host_id)
+            if store:
+                self.schedule_many(HOST, host_id, store)
+
+    def store(self, kind: str, key):
+        """
+        Lista onde um item agendado deve estar.
+
+        Args:
+            kind (str): 'channel' ou 'host'.
+            key (hashable): Chave do canal ou ID do host.
+
+        Returns:
+            list : Pares EPR do canal ou memória do host; None se não existe mais.
+        """
+        if kind == CHANNEL:
+            return self.network.channels.get_eprs(*key)
+        host = self.network.hosts.get(key)
+        return host.memory if host is not None else None
+
+    def expiry_timeslot(self, fidelity: float, threshold: float) -> int:
+        """
+        Timeslot em que a decoerência leva uma fidelidade abaixo do corte.
+
+        Args:
+            fidelity (float): Fidelidade atual.
+            threshold (float): Corte.
+
+        Returns:
+            int : Timeslot do vencimento; None se a fidelidade nunca cai abaixo do corte.
+        """
+        now = self.network.get_timeslot()
+        if fidelity < threshold:
+            return now
+        decay = 1 - self.network.decoherence_factor
+        if decay >= 1 or threshold <= 0:
+            return None
+        if decay <= 0:
+            return now + 1
+        return now + math.floor(math.log(threshold / fidelity) / math.log(decay)) + 1
+
+    def schedule_many(self, kind: str, key, items):
+        """
+        Agenda o vencimento de itens inseridos em um canal ou na memória de um host.
+
+        Args:
+            kind (str): 'channel' ou 'host'.
+            key (hashable): Chave do canal ou ID do host.
+            items (iterable): Pares EPR ou qubits.
+        """
+        threshold = self.thresholds[kind]
+        if threshold is None:
+            return
+        for item in items:
+            entry = (kind, key, id(item))
+            if entry in self._entries:
+                continue
+            deadline = self.expiry_timeslot(item.get_current_fidelity(), threshold)
+            if deadline is None:
+                continue
+            self._entries[entry] = item
+            self.wheel.schedule(deadline, entry)
+
+    def expire(self) -> int:
+        """
+        Avança a roda até o relógio da rede e descarta os itens vencidos.
+
+        Returns:
+            int : Número de itens descartados.
+        """
+        network = self.network
+        if network.get_timeslot() < self.wheel.now:
+            self.rebuild()
+            return 0
+        expired = 0
+        for entry in self.wheel.advance(network.get_timeslot()):
+            kind, key, _ = entry
+            item = self._entries.pop(entry, None)
+            store = self.store(kind, key)
+            if item is None or not store:
+                continue
+            try:
+                index = store.index(item)
+            except ValueError:
+                continue  # O item já saiu da lista
+            current = store[index]
+            if current.get_current_fidelity() < self.thresholds[kind]:
+                del store[index]
+                expired += 1
+                if kind == CHANNEL:
+                    self.expired_eprs += 1
+                    if self.regenerate:
+                        store.append(network.physical.create_epr_pair(increment_timeslot=False))
+                        self.regenerated_eprs += 1
+                else:
+                    self.expired_qubits += 1
+            else:
+                self.schedule_many(kind, key, (current,))
+        if expired:
+            self.logger.debug(f'Timeslot {network.get_timeslot()}: {expired} itens abaixo do corte de fidelidade descartados.')
+        return expired
@@ -0,0 +1,296 @@
+import gc
+import itertools
+from contextlib import contextmanager
+import networkx as nx
+import numpy as np
+try:
+    import rustworkx as rx
+except ImportError:  # O rustworkx é opcional; sem ele, o backend 'auto' usa sempre o networkx
+    rx = None
+
+
+@contextmanager
+def _paused_gc():
+    # As tabelas de caminhos criam centenas de milhares de listas de inteiros, sem ciclos; pausar o
+    # coletor de ciclos evita que ele percorra o heap repetidamente durante a construção
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class NetworkxBackend():
+    """
+    Backend de grafos em Python puro, com os algoritmos do networkx. Os backends recebem o grafo
+    da topologia (nx.Graph) em cada consulta e retornam caminhos como listas de nós; erros seguem
+    as exceções do networkx (NetworkXNoPath, NodeNotFound).
+    """
+    name = 'networkx'
+
+    def copy(self) -> 'NetworkxBackend':
+        """
+        Backend equivalente, sem estado compartilhado, para uma cópia da rede.
+        """
+        return NetworkxBackend()
+
+    def invalidate(self):
+        """
+        Avisa que a topologia mudou. O networkx consulta o grafo diretamente e não guarda nada.
+        """
+
+    def shortest_path(self, graph, source: int, target: int, weight: str = None) -> list:
+        """
+        Caminho mais curto entre dois nós.
+
+        Args:
+            graph (nx.Graph): Topologia.
+            source (int): Nó de origem.
+            target (int): Nó de destino.
+            weight (str, optional): Atributo das arestas usado como peso. None conta os saltos.
+
+        Returns:
+            list : Caminho, da origem ao destino.
+        """
+        return nx.shortest_path(graph, source=source, target=target, weight=weight)
+
+    def all_shortest_paths(self, graph, source: int, target: int):
+        """
+        Todos os caminhos com o menor número de saltos entre dois nós, gerados sob demanda.
+
+        Args:
+            graph (nx.Graph): Topologia.
+            source (int): Nó de origem.
+            target (int): Nó de destino.
+
+        Returns:
+            iterator : Caminhos. A ausência de caminho é detectada antes do primeiro.
+
+        Raises:
+            nx.NetworkXNoPath : Se não há caminho.
+        """
+        paths = nx.all_shortest_paths(graph, source, target)
+        first = next(paths)
+        return itertools.chain([first], paths)
+
+    def single_source_paths(self, graph, source: int) -> dict:
+        """
+        Caminhos com o menor número de saltos de um nó para todos os nós alcançáveis.
+
+        Returns:
+            dict : Destino -> caminho, incluindo a própria origem.
+        """
+        return nx.single_source_shortest_path(graph, source)
+
+    def all_pairs_paths(self, graph) -> dict:
+        """
+        Caminhos com o menor número de saltos entre todos os pares de nós.
+
+        Returns:
+            dict : Origem -> (destino -> caminho).
+        """
+        with _paused_gc():
+            return dict(nx.all_pairs_shortest_path(graph))
+
+
+class RustworkxBackend():
+    """
+    Backend de grafos nativo, com os algoritmos do rustworkx. A topologia é espelhada em um
+    rx.PyGraph na primeira consulta e reaproveitada até a rede avisar que ela mudou. O objeto de
+    cada aresta do espelho é o próprio dicionário de atributos da aresta no networkx, então
+    alterações de peso feitas no grafo original valem sem reconstruir o espelho.
+
+    Entre caminhos de mesmo comprimento, a escolha pode diferir da do networkx.
+    """
+    name = 'rustworkx'
+
+    def __init__(self) -> None:
+        if rx is None:
+            raise ImportError('O backend rustworkx requer o pacote rustworkx.')
+        self._source = None  # Grafo espelhado
+        self._mirror = None
+        self._index = None  # Nó -> índice no espelho
+        self._nodes = None  # Índice no espelho -> nó
+        self._tails = None  # Arestas do espelho nos dois sentidos, como vetores (origem, destino)
+        self._heads = None
+
+    def copy(self) -> 'RustworkxBackend':
+        return RustworkxBackend()
+
+    def invalidate(self):
+        self._source = None
+        self._mirror = None
+
+    def _sync(self, graph):
+        # Reconstrói o espelho se a topologia mudou ou se o grafo é outro
+        if self._mirror is not None and self._source is graph and len(self._nodes) == graph.number_of_nodes():
+            return self._mirror
+        mirror = rx.PyGraph(multigraph=False)
+        nodes = list(graph.nodes)
+        mirror.add_nodes_from(nodes)
+        index = {node: position for position, node in enumerate(nodes)}
+        mirror.add_edges_from([(index[u], index[v], data) for u, v, data in graph.edges(data=True)])
+        edges = np.array(mirror.edge_list(), dtype=np.int64).reshape(-1, 2)
+        self._tails = np.concatenate([edges[:, 0], edges[:, 1]])
+        self._heads = np.concatenate([edges[:, 1], edges[:, 0]])
+        self._source, self._mirror, self._index, self._nodes = graph, mirror, index, nodes
+        return mirror
+
+    def _distances(self, mirror, start: int) -> np.ndarray:
+        # Número de saltos de start a cada nó, por BFS nativa; -1 para os inalcançáveis
+        distance = np.full(mirror.num_nodes(), -1, dtype=np.int64)
+        for layer, positions in enumerate(rx.bfs_layers(mirror, [start])):
+            distance[positions] = layer
+        return distance
+
+    def _tree_paths(self, mirror, start: int) -> dict:
+        # Caminhos pela árvore da BFS: o pai de cada nó é o vizinho de menor índice uma camada acima,
+        # e o caminho de cada nó estende o do pai, como no networkx
+        distance = self._distances(mirror, start)
+        tails, heads = self._tails, self._heads
+        upward = (distance[tails] > 0) & (distance[heads] == distance[tails] - 1)
+        parent = np.full(len(distance), len(distance), dtype=np.int64)
+        np.minimum.at(parent, tails[upward], heads[upward])
+        order = np.argsort(distance, kind='stable')
+        order = order[distance[order] > 0].tolist()
+        parent = parent.tolist()
+        nodes = self._nodes
+        paths = {start: [nodes[start]]}
+        for position in order:
+            paths[position] = paths[parent[position]] + [nodes[position]]
+        return {nodes[position]: path for position, path in paths.items()}
+
+    def _position(self, node: int) -> int:
+        position = self._index.get(node)
+        if position is None:
+            raise nx.NodeNotFound(f'Nó {node} não está no grafo.')
+        return position
+
+    def _to_nodes(self, path) -> list:
+        nodes = self._nodes
+        return [nodes[position] for position in path]
+
+    def shortest_path(self, graph, source: int, target: int, weight: str = None) -> list:
+        mirror = self._sync(graph)
+        start, goal = self._position(source), self._position(target)
+        if start == goal:
+            return [source]
+        if weight is None:
+            paths = rx.dijkstra_shortest_paths(mirror, start, target=goal)
+        else:
+            paths = rx.dijkstra_shortest_paths(mirror, start, target=goal, weight_fn=lambda data: float(data.get(weight, 1)))
+        if goal not in paths:
+            raise nx.NetworkXNoPath(f'Sem caminho entre {source} e {target}.')
+        return self._to_nodes(paths[goal])
+
+    def all_shortest_paths(self, graph, source: int, target: int):
+        mirror = self._sync(graph)
+        start, goal = self._position(source), self._position(target)
+        # Distâncias até o destino; os caminhos descem uma camada por salto
+        distance = self._distances(mirror, goal)
+        if distance[start] < 0:
+            raise nx.NetworkXNoPath(f'Sem caminho entre {source} e {target}.')
+        return self._descend(mirror, start, distance)
+
+    def _descend(self, mirror, start: int, distance: np.ndarray):
+        # Busca em profundidade pelos vizinhos uma camada mais perto do destino, em ordem de nó
+        if distance[start] == 0:
+            yield [self._nodes[start]]
+            return
+        path = [start]
+        stack = [iter(sorted(neighbor for neighbor in mirror.neighbors(start) if distance[neighbor] == distance[start] - 1))]
+        while stack:
+            position = next(stack[-1], None)
+            if position is None:
+                stack.pop()
+                path.pop()
+                continue
+            path.append(position)
+            if distance[position] == 0:
+                yield self._to_nodes(path)
+                path.pop()
+                continue
+            stack.append(iter(sorted(neighbor for neighbor in mirror.neighbors(position) if distance[neighbor] == distance[position] - 1)))
+
+    def single_source_paths(self, graph, source: int) -> dict:
+        mirror = self._sync(graph)
+        return self._tree_paths(mirror, self._position(source))
+
+    def all_pairs_paths(self, graph) -> dict:
+        mirror = self._sync(graph)
+        nodes = self._nodes
+        with _paused_gc():
+            return {nodes[start]: self._tree_paths(mirror, start) for start in range(len(nodes))}
+
+
+class AutoBackend():
+    """
+    Escolhe o backend pelo tamanho da topologia: grafos com pelo menos threshold nós usam o
+    rustworkx, se instalado; os menores continuam no networkx, com os mesmos resultados de antes.
+    """
+    name = 'auto'
+
+    def __init__(self, threshold: int = 512) -> None:
+        """
+        Args:
+            threshold (int): Número de nós a partir do qual o backend nativo é usado.
+        """
+        self.threshold = threshold
+        self._small = NetworkxBackend()
+        self._large = RustworkxBackend() if rx is not None else None
+
+    def copy(self) -> 'AutoBackend':
+        return AutoBackend(self.threshold)
+
+    def invalidate(self):
+        if self._large is not None:
+            self._large.invalidate()
+
+    def select(self, graph):
+        """
+        Backend usado para um grafo.
+
+        Returns:
+            NetworkxBackend | RustworkxBackend : Backend escolhido.
+        """
+        if self._large is not None and graph.number_of_nodes() >= self.threshold:
+            return self._large
+        return self._small
+
+    def shortest_path(self, graph, source: int, target: int, weight: str = None) -> list:
+        return self.select(graph).shortest_path(graph, source, target, weight)
+
+    def all_shortest_paths(self, graph, source: int, target: int):
+        return self.select(graph).all_shortest_paths(graph, source, target)
+
+    def single_source_paths(self, graph, source: int) -> dict:
+        return self.select(graph).single_source_paths(graph, source)
+
+    def all_pairs_paths(self, graph) -> dict:
+        return self.select(graph).all_pairs_paths(graph)
+
+
+GRAPH_BACKENDS = {
+    'networkx': NetworkxBackend,
+    'rustworkx': RustworkxBackend,
+    'auto': AutoBackend,
+}
+
+
+def make_graph_backend(backend='auto'):
+    """
+    Cria um backend de grafos.
+
+    Args:
+        backend (str | object): Nome em GRAPH_BACKENDS ('networkx', 'rustworkx', 'auto') ou um backend pronto.
+
+    Returns:
+        object : Backend.
+    """
+    if not isinstance(backend, str):
+        return backend
+    if backend not in GRAPH_BACKENDS:
+        raise ValueError(f'Backend de grafos desconhecido: {backend}. Opções: {list(GRAPH_BACKENDS)}.')
+    return GRAPH_BACKENDS[backend]()
@@ -1,14 +1,15 @@
 import networkx as nx
 import matplotlib.pyplot as plt
-from ..objects import Logger, Qubit
+from ..objects import Logger, Qubit, QubitMemory
 
 class Host():
-    def __init__(self, host_id: int, probability_on_demand_qubit_create: float = 0.5, probability_replay_qubit_create: float = 0.5, max_qubits_create: int = 10, memory_size: int = 10) -> None:
+    def __init__(self, host_id: int, probability_on_demand_qubit_create: float = 0.5, probability_replay_qubit_create: float = 0.5, max_qubits_create: int = 10, memory_size: int = 10, eviction=None) -> None:
         # Sobre a rede
         self._host_id = host_id
         self._connections = []
         # Sobre o host
-        self._memory = []
+        # A memória só é limitada a memory_size com uma política de descarte; sem ela, não há limite
+        self._memory = QubitMemory(capacity=memory_size if eviction is not None else None, eviction=eviction or 'fifo')
         self._memory_size = memory_size
         self._max_qubits_create = max_qubits_create
         self._probability_on_demand_qubit_create = probability_on_demand_qubit_create
@@ -50,6 +51,16 @@ class Host():
             list : Lista de qubits.
         """
         return self._memory
+
+    @property
+    def memory_size(self):
+        """
+        Capacidade da memória do host.
+
+        Returns:
+            int : Número máximo de qubits.
+        """
+        return self._memory_size
     
     @property
     def routing_table(self):
@@ -69,9 +80,7 @@ class Host():
             Qubit : Último qubit da memória.
         """
         try:
-            q = self.memory[-1]
-            self.memory.remove(q)
-            return q
+            return self.memory.pop()
         except IndexError:
             raise Exception('Não há mais qubits na memória.')
     
@@ -100,6 +109,18 @@ class Host():
         self.memory.append(qubit)
         Logger.get_instance().debug(f'Qubit {qubit.qubit_id} adicionado à memória do Host {self.host_id}.')
 
+    def get_qubit(self, qubit_id: int) -> Qubit:
+        """
+        Busca um qubit da memória pelo ID, sem percorrer a memória.
+
+        Args:
+            qubit_id (int): ID do qubit.
+
+        Returns:
+            Qubit : O qubit, ou None se ele não está na memória.
+        """
+        return self.memory.find(qubit_id)
+
 
     def set_routing_table(self, routing_table: dict):
         """
@@ -1,5 +1,6 @@
-import random
 import math
+import time
+import numpy as np
 from quantumnet.components import Host
 from quantumnet.objects import Qubit, Logger
 
@@ -20,10 +21,13 @@ class ApplicationLayer:
         self._network_layer = network_layer
         self._link_layer = link_layer
         self._transport_layer = transport_layer
+        self._rng = network.rng['application']
+        self._qubit_rng = network.rng['qubits']
         self.logger = Logger.get_instance()
         self.used_qubits = 0
         self.used_eprs = 0
         self.route_fidelities = []  # Armazena as fidelidades médias de cada rota
+        self.qkd_metrics = []  # Métricas de cada chave gerada pelo E91 (bits, qubits, rodadas, tempo e taxa)
 
     def __str__(self):
         """ Retorna a representação em string da camada de aplicação. 
@@ -74,57 +78,110 @@ class ApplicationLayer:
         Returns:
             list: Chave final gerada pelo protocolo, ou None se houver falha na transmissão.
         """
-        alice = self._network.get_host(alice_id)  # Obtém o host de Alice
-        bob = self._network.get_host(bob_id)  # Obtém o host de Bob
+        final_key = self.qkd_e91_key(alice_id, bob_id, num_bits)
+        return None if final_key is None else final_key.tolist()
 
-        final_key = []  # Inicializa a chave final
-   
-        while len(final_key) < num_bits:
-            num_qubits = int((num_bits - len(final_key)) * 2)  # Calcula o número de qubits necessários
+    def qkd_e91_key(self, alice_id, bob_id, num_bits):
+        """
+        Protocolo E91 vetorizado: a cada rodada, chave, bases, preparação, transmissão e medição de
+        todos os qubits são feitas de uma só vez em vetores NumPy, e a peneiragem é uma máscara
+        booleana. As rodadas se repetem até a chave ter num_bits bits. O tempo gasto e a taxa de
+        geração da chave (bits por segundo) ficam em qkd_metrics.
+
+        Args:
+            alice_id (int): ID do host de Alice.
+            bob_id (int): ID do host de Bob.
+            num_bits (int): Número de bits para a chave.
+
+        Returns:
+            np.ndarray: Chave final (uint8), ou None se houver falha na transmissão.
+        """
+        start = time.perf_counter()
+        generator = self._rng.generator
+        parts, collected, total_qubits, rounds = [], 0, 0, 0
+
+        while collected < num_bits:
+            num_qubits = int((num_bits - collected) * 2)  # Calcula o número de qubits necessários
             self.used_qubits += num_qubits
-            self.logger.log(f'Iniciando protocolo E91 com {num_qubits} qubits.')
+            total_qubits += num_qubits
+            rounds += 1
+            self.logger.log(f'Iniciando rodada {rounds} do protocolo E91 com {num_qubits} qubits.')
 
             # Etapa 1: Alice prepara os qubits
-            key = [random.choice([0, 1]) for _ in range(num_qubits)]  # Gera uma chave aleatória de bits
-            bases_alice = [random.choice([0, 1]) for _ in range(num_qubits)]  # Gera bases de medição aleatórias para Alice
-            qubits = self.prepare_e91_qubits(key, bases_alice)  # Prepara os qubits com base na chave e nas bases
-            self.logger.log(f'Qubits preparados com a chave: {key} e bases: {bases_alice}')
-
-            # Etapa 2: Transmissão dos qubits de Alice para Bob
-            success = self._transport_layer.run_transport_layer(alice_id, bob_id, num_qubits)
-            if not success:
+            key = generator.integers(0, 2, num_qubits, dtype=np.uint8)  # Gera uma chave aleatória de bits
+            bases_alice = generator.integers(0, 2, num_qubits, dtype=np.uint8)  # Gera bases de medição aleatórias para Alice
+            states = self.prepare_e91_states(key, bases_alice)
+
+            # Etapa 2: Transmissão do lote de qubits de Alice para Bob
+            if self._transport_layer.run_transport_layer_batch(alice_id, bob_id, num_qubits) is None:
                 self.logger.log(f'Falha na transmissão dos qubits de Alice para Bob.')
                 return None
 
-            #self._network.timeslot()  # Incrementa o timeslot após a transmissão
-            self.logger.debug(f"Timeslot incrementado após transmissão: {self._network.get_timeslot()}")
-
             # Etapa 3: Bob escolhe bases aleatórias e mede os qubits
-            bases_bob = [random.choice([0, 1]) for _ in range(num_qubits)]  # Gera bases de medição aleatórias para Bob
-            results_bob = self.apply_bases_and_measure_e91(qubits, bases_bob)  # Bob mede os qubits usando suas bases
-            self.logger.log(f'Resultados das medições: {results_bob} com bases: {bases_bob}')
+            bases_bob = generator.integers(0, 2, num_qubits, dtype=np.uint8)  # Gera bases de medição aleatórias para Bob
+            results_bob = self.measure_e91_states(states, bases_bob)
+
+            # Etapas 4 a 6: bases iguais e resultados que coincidem com a chave de Alice
+            sifted = (bases_alice == bases_bob) & (key == results_bob)
+            parts.append(key[sifted][:num_bits - collected])
+            collected += len(parts[-1])
+            self.logger.log(f'Rodada {rounds}: {int(sifted.sum())} de {num_qubits} bits aproveitados; {collected} de {num_bits} bits obtidos até agora.')
+
+        final_key = np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint8)
+        elapsed = time.perf_counter() - start
+        self.qkd_metrics.append({
+            'alice_id': alice_id,
+            'bob_id': bob_id,
+            'num_bits': num_bits,
+            'qubits': total_qubits,
+            'rounds': rounds,
+            'seconds': elapsed,
+            'key_rate': num_bits / elapsed if elapsed > 0 else float('inf'),
+        })
+        self.logger.log(f"Protocolo E91 bem-sucedido: chave de {num_bits} bits com {total_qubits} qubits em {rounds} rodadas ({self.qkd_metrics[-1]['key_rate']:.0f} bits/s).")
+        return final_key
+
+    def key_rate(self):
+        """
+        Taxa média de geração de chaves do E91, sobre todas as chaves geradas.
 
-            # Etapa 4: Alice e Bob compartilham suas bases e encontram os índices comuns
-            common_indices = [i for i in range(len(bases_alice)) if bases_alice[i] == bases_bob[i]]  # Índices onde as bases coincidem
-            self.logger.log(f'Índices comuns: {common_indices}')
+        Returns:
+            float: Bits de chave por segundo, ou 0.0 se nenhuma chave foi gerada.
+        """
+        seconds = sum(metric['seconds'] for metric in self.qkd_metrics)
+        if seconds <= 0:
+            return 0.0
+        return sum(metric['num_bits'] for metric in self.qkd_metrics) / seconds
 
-            # Etapa 5: Extração da chave com base nos índices comuns
-            shared_key_alice = [key[i] for i in common_indices]  # Chave compartilhada gerada por Alice
-            shared_key_bob = [results_bob[i] for i in common_indices]  # Chave compartilhada gerada por Bob
+    def prepare_e91_states(self, key, bases):
+        """
+        Versão vetorizada de prepare_e91_qubits: o estado de cada qubit é o bit da chave, ou um bit
+        aleatório se a base for 1 (a Hadamard de Qubit sorteia o estado).
 
-            # Etapa 6: Verificação se as chaves coincidem
-            for a, b in zip(shared_key_alice, shared_key_bob):
-                if a == b and len(final_key) < num_bits:  # Limita o tamanho da chave final
-                    final_key.append(a)
+        Args:
+            key (np.ndarray): Bits da chave.
+            bases (np.ndarray): Bases de Alice.
 
-            self.logger.log(f"Chaves obtidas até agora: {final_key}")
+        Returns:
+            np.ndarray: Estado de cada qubit.
+        """
+        superposed = self._qubit_rng.generator.integers(0, 2, len(key), dtype=np.uint8)
+        return np.where(bases == 1, superposed, key)
 
-            if len(final_key) >= num_bits:
-                final_key = final_key[:num_bits]  # Garante que a chave final tenha o tamanho exato solicitado
-                self.logger.log(f"Protocolo E91 bem-sucedido. Chave final compartilhada: {final_key}")
-                return final_key
+    def measure_e91_states(self, states, bases):
+        """
+        Versão vetorizada de apply_bases_and_measure_e91: a medição na base 1 passa antes pela
+        Hadamard, que sorteia o estado.
 
-        return None
+        Args:
+            states (np.ndarray): Estado de cada qubit.
+            bases (np.ndarray): Bases de Bob.
+
+        Returns:
+            np.ndarray: Resultados das medições.
+        """
+        superposed = self._qubit_rng.generator.integers(0, 2, len(states), dtype=np.uint8)
+        return np.where(bases == 1, superposed, states)
 
     def prepare_e91_qubits(self, key, bases):
         """
@@ -141,7 +198,7 @@ class ApplicationLayer:
         self.logger.debug(f"Timeslot incrementado na função prepare_e91_qubits: {self._network.get_timeslot()}")
         qubits = []
         for bit, base in zip(key, bases):
-            qubit = Qubit(qubit_id=random.randint(0, 1000))  # Cria um novo qubit com ID aleatório
+            qubit = Qubit(qubit_id=self._rng.randint(0, 1000), rng=self._qubit_rng)  # Cria um novo qubit com ID aleatório
             if bit == 1:
                 qubit.apply_x()  # Aplica a porta X (NOT) ao qubit se o bit for 1
             if base == 1:
@@ -201,7 +258,7 @@ class ApplicationLayer:
         bob.memory.clear()
 
         # O cliente prepara qubits e armazena-os
-        qubits = [Qubit(qubit_id=random.randint(0, 1000)) for _ in range(num_qubits)]
+        qubits = [Qubit(qubit_id=self._rng.randint(0, 1000), rng=self._qubit_rng) for _ in range(num_qubits)]
         self.logger.log(f"Cliente criou {len(qubits)} qubits para a transmissão.")
 
         # Registrar qubits no dicionário de timeslots
@@ -231,10 +288,7 @@ class ApplicationLayer:
 
         # Limpar pares EPRs residuais na rota antes de iniciar o protocolo
         self.logger.log(f"Timeslot {self._network.get_timeslot()}: Limpando pares EPRs residuais antes de iniciar o protocolo.")
-        for i in range(len(route) - 1):
-            u, v = route[i], route[i + 1]
-            self._physical_layer.remove_all_eprs_from_channel((u, v))
-            self.logger.log(f"Pares EPRs limpos no segmento {u} -> {v}.")
+        self.clear_route_eprs(route, exposure=2 * num_qubits + circuit_depth - 1)
 
         # Transporte de Alice para Bob
         success = self._transport_layer.run_transport_layer_eprs(alice_id, bob_id, len(qubits), route=route, scenario=scenario)
@@ -300,6 +354,26 @@ class ApplicationLayer:
 
 
 
+    def clear_route_eprs(self, route, exposure=0):
+        """
+        Limpa os pares EPR residuais da rota antes de um protocolo. Com um pré-provisionador na rede,
+        apenas os pares que não serviriam ao protocolo são descartados e o estoque é mantido.
+
+        Args:
+            route (list): Rota do protocolo.
+            exposure (int): Timeslots em que o protocolo usa os pares da rota, para o corte de fidelidade.
+        """
+        provisioner = self._network.provisioner
+        channels = [(route[i], route[i + 1]) for i in range(len(route) - 1)]
+        if provisioner is not None:
+            cutoff = provisioner.route_cutoff(self._network, route, exposure)
+            retired = provisioner.retire(self._network, channels, cutoff)
+            self.logger.log(f"{retired} pares EPRs vencidos descartados na rota {route}; estoque mantido.")
+            return
+        for u, v in channels:
+            self._physical_layer.remove_all_eprs_from_channel((u, v))
+            self.logger.log(f"Pares EPRs limpos no segmento {u} -> {v}.")
+
     def generate_random_operation(self):
         """
         Gera uma operação quântica aleatória (X, Y, Z).
@@ -308,7 +382,7 @@ class ApplicationLayer:
             str : Operação escolhida aleatoriamente.
         """
         operations = ['X', 'Y', 'Z']
-        return random.choice(operations)
+        return self._rng.choice(operations)
 
     def apply_operation_from_message(self, qubit, operation):
         """
@@ -403,10 +477,7 @@ class ApplicationLayer:
 
         # Limpar pares EPRs residuais na rota
         self.logger.log(f"Limpando pares EPRs residuais na rota: {route}")
-        for i in range(len(route) - 1):
-            u, v = route[i], route[i + 1]
-            self._physical_layer.remove_all_eprs_from_channel((u, v))
-            self.logger.log(f"Pares EPRs limpos no segmento {u} -> {v}.")
+        self.clear_route_eprs(route)
 
         # Executar a transmissão usando a rota definida
         success = self._transport_layer.run_transport_layer_eprs_bfk(client_id, server_id, num_qubits, route=route, scenario=scenario)
@@ -432,8 +503,8 @@ class ApplicationLayer:
     def prepare_qubits(self, alice_id, num_qubits):
         qubits = []
         for _ in range(num_qubits):
-            r_j = random.choice([0, 1])  # Cliente gera um bit aleatório r_j
-            qubit = Qubit(qubit_id=random.randint(0, 1000))  # Cria um qubit com ID aleatório
+            r_j = self._rng.choice([0, 1])  # Cliente gera um bit aleatório r_j
+            qubit = Qubit(qubit_id=self._rng.randint(0, 1000), rng=self._qubit_rng)  # Cria um qubit com ID aleatório
             if r_j == 1:
                 qubit.apply_x()  # Aplica a porta X se r_j for 1
             qubits.append(qubit)
@@ -481,7 +552,7 @@ class ApplicationLayer:
         measurement_results = []
 
         # Inicializa os ângulos de medição para todos os qubits
-        angles = [random.uniform(0, 2 * math.pi) for _ in qubits]
+        angles = [self._rng.uniform(0, 2 * math.pi) for _ in qubits]
         self.logger.log(f"Cliente {alice_id} inicializou ângulos de medição: {angles}")
 
         # Executa as rodadas de computação
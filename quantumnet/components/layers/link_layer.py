@@ -1,7 +1,6 @@
 import networkx as nx
 from quantumnet.components import Host
 from quantumnet.objects import Logger, Epr
-from random import uniform
 
 class LinkLayer:
     def __init__(self, network, physical_layer):
@@ -1,7 +1,6 @@
 import networkx as nx
 from quantumnet.components import Host
 from quantumnet.objects import Logger, Epr
-from random import uniform
 
 class NetworkLayer:
     def __init__(self, network, link_layer, physical_layer):
@@ -16,6 +15,7 @@ class NetworkLayer:
         self._network = network
         self._physical_layer = physical_layer
         self._link_layer = link_layer
+        self._rng = network.rng['network']
         self.logger = Logger.get_instance()
         self.avg_size_routes = 0  # Inicializa o tamanho médio das rotas
         self.used_eprs = 0  # Inicializa o contador de EPRs utilizados
@@ -63,7 +63,8 @@ class NetworkLayer:
             return None
 
         try:
-            all_shortest_paths = list(nx.all_shortest_paths(self._network.graph, Alice, Bob))
+            # Os caminhos são gerados sob demanda: a busca para no primeiro com pares em todos os canais
+            all_shortest_paths = self._network.graph_backend.all_shortest_paths(self._network.graph, Alice, Bob)
         except nx.NetworkXNoPath:
             self.logger.log(f'Sem rota encontrada entre {Alice} e {Bob}')
             return None
@@ -161,7 +162,7 @@ class NetworkLayer:
                 success_prob = fidelity1 * fidelity2 + (1 - fidelity1) * (1 - fidelity2)
                 
                 # Verifica se o swapping foi bem-sucedido com base na probabilidade de sucesso
-                if uniform(0, 1) > success_prob:
+                if self._rng.random() > success_prob:
                     self.logger.log(f'Entanglement Swapping falhou entre {node1}-{node2} e {node2}-{node3}')
                     return False
 
@@ -171,7 +172,7 @@ class NetworkLayer:
 
                 # Se o canal entre node1 e node3 não existir, adiciona um novo canal
                 if not self._network.graph.has_edge(node1, node3):
-                    self._network.graph.add_edge(node1, node3, eprs=[])
+                    self._network.create_channel(node1, node3)
 
                 # Adiciona o par EPR virtual ao canal entre node1 e node3
                 self._network.physical.add_epr_to_channel(epr_virtual, (node1, node3))
@@ -1,7 +1,5 @@
 from ...objects import Logger, Qubit, Epr
 from ...components import Host
-from random import uniform
-import random
 
 class PhysicalLayer:
     def __init__(self, network, physical_layer_id: int = 0):
@@ -15,10 +13,11 @@ class PhysicalLayer:
         self.min_prob = 0.2
         self._physical_layer_id = physical_layer_id
         self._network = network
+        self._rng = network.rng['physical']
         self._qubits = []
         self._failed_eprs = []
         self.created_eprs = []  # Lista para armazenar todos os EPRs criados
-        self._initial_qubits_fidelity = random.uniform(self.min_prob, self.max_prob)
+        self._initial_qubits_fidelity = self._rng.uniform(self.min_prob, self.max_prob)
         self._count_qubit = 0
         self._count_epr = 0
         self.logger = Logger.get_instance()
@@ -87,10 +86,10 @@ class PhysicalLayer:
             raise Exception(f'Host {host_id} não existe na rede.')
 
         qubit_id = self._count_qubit
-        qubit = Qubit(qubit_id)
+        qubit = Qubit(qubit_id, rng=self._network.rng['qubits'])
 
         # Define a fidelidade inicial do qubit entre 0.95 e 1.0
-        initial_fidelity = uniform(min_fidelity, 1.0)
+        initial_fidelity = self._rng.uniform(min_fidelity, 1.0)
         qubit.fidelity = initial_fidelity  # Atribuição direta da fidelidade inicial
         qubit.current_fidelity = initial_fidelity  # Caso precise manter um histórico de fidelidade
 
@@ -103,6 +102,24 @@ class PhysicalLayer:
         self.logger.debug(f'Qubit {qubit_id} criado com fidelidade inicial {initial_fidelity} e adicionado à memória do Host {host_id}.')
 
 
+    def draw_qubit_fidelities(self, count: int, min_fidelity: float = 0.95, increment_qubits: bool = True):
+        """Cria count qubits em lote, sem objetos Qubit nem memória de host: os IDs são reservados e
+        as fidelidades iniciais sorteadas de uma só vez, com a mesma distribuição de create_qubit.
+
+        Args:
+            count (int): Número de qubits.
+            min_fidelity (float): Fidelidade mínima desejada para os qubits.
+
+        Returns:
+            np.ndarray: Fidelidade inicial de cada qubit.
+        """
+        if increment_qubits:
+            self.used_qubits += count
+        self._count_qubit += count
+        fidelities = self._rng.uniform_array(min_fidelity, 1.0, count)
+        self.logger.debug(f'{count} qubits criados em lote com fidelidade inicial média {fidelities.mean() if count else 0.0}.')
+        return fidelities
+
     def create_epr_pair(self, fidelity: float = 1.0, increment_timeslot: bool = True, increment_eprs: bool = False):
         """Cria um par de qubits entrelaçados.
 
@@ -120,6 +137,26 @@ class PhysicalLayer:
         self._count_epr += 1
         return epr
 
+    def create_epr_pairs(self, count: int, fidelity: float = 1.0, increment_timeslot: bool = True, increment_eprs: bool = False) -> list:
+        """Cria vários pares entrelaçados de uma só vez, com IDs consecutivos.
+
+        Args:
+            count (int): Número de pares.
+            fidelity (float): Fidelidade inicial dos pares.
+
+        Returns:
+            list: Pares EPR.
+        """
+        if increment_timeslot:
+            self._network.timeslot()
+
+        if increment_eprs:
+            self.used_eprs += count
+
+        first = self._count_epr
+        self._count_epr += count
+        return [Epr(epr_id, fidelity) for epr_id in range(first, first + count)]
+
     def add_epr_to_channel(self, epr: Epr, channel: tuple):
         """Adiciona um par EPR ao canal.
 
@@ -128,9 +165,10 @@ class PhysicalLayer:
             channel (tuple): Canal.
         """
         u, v = channel
-        if not self._network.graph.has_edge(u, v):
-            self._network.graph.add_edge(u, v, eprs=[])
-        self._network.graph.edges[u, v]['eprs'].append(epr)
+        store = self._network.channels.get_eprs(u, v)
+        if store is None:
+            store = self._network.create_channel(u, v)
+        store.append(epr)
         self.logger.debug(f'Par EPR {epr} adicionado ao canal {channel}.')
 
     def remove_epr_from_channel(self, epr: Epr, channel: tuple):
@@ -141,11 +179,12 @@ class PhysicalLayer:
             channel (tuple): Canal.
         """
         u, v = channel
-        if not self._network.graph.has_edge(u, v):
+        store = self._network.channels.get_eprs(u, v)
+        if store is None:
             self.logger.debug(f'Canal {channel} não existe.')
             return
         try:
-            self._network.graph.edges[u, v]['eprs'].remove(epr)
+            store.remove(epr)
             # self.logger.debug(f'Par EPR {epr} removido do canal {channel}.')
         except ValueError:
             self.logger.debug(f'Par EPR {epr} não encontrado no canal {channel}.')
@@ -153,11 +192,12 @@ class PhysicalLayer:
     def remove_all_eprs_from_channel(self, channel: tuple):
         """Remove todos os pares EPR do canal especificado."""
         u, v = channel
-        if not self._network.graph.has_edge(u, v):
+        store = self._network.channels.get_eprs(u, v)
+        if store is None:
             self.logger.debug(f'Canal {channel} não existe.')
             return
         # Copia a lista de EPRs
-        eprs_copy = list(self._network.graph.edges[u, v].get('eprs', []))
+        eprs_copy = list(store)
         for epr in eprs_copy:
             self.remove_epr_from_channel(epr, channel)
 
@@ -217,12 +257,12 @@ class PhysicalLayer:
 
         if epr_fidelity >= 0.8:
             # Se a fidelidade for adequada, adiciona o EPR ao canal da rede
-            self._network.graph.edges[(alice_host_id, bob_host_id)]['eprs'].append(epr)
+            self._network.channels.eprs(alice_host_id, bob_host_id).append(epr)
             self.logger.log(f'Timeslot {self._network.get_timeslot()}: O protocolo de criação de emaranhamento foi bem sucedido com a fidelidade necessária.')
             return True
         else:
             # Adiciona o EPR ao canal mesmo com baixa fidelidade
-            self._network.graph.edges[(alice_host_id, bob_host_id)]['eprs'].append(epr)
+            self._network.channels.eprs(alice_host_id, bob_host_id).append(epr)
             self._failed_eprs.append(epr)
             self.logger.log(f'Timeslot {self._network.get_timeslot()}: O protocolo de criação de emaranhamento foi bem sucedido, mas com fidelidade baixa.')
             return False
@@ -246,13 +286,13 @@ class PhysicalLayer:
         fidelity_qubit1 = self.fidelity_measurement_only_one(qubit1)
         fidelity_qubit2 = self.fidelity_measurement_only_one(qubit2)
                 
-        prob_on_demand_epr_create = self._network.edges[alice_host_id, bob_host_id]['prob_on_demand_epr_create']
+        prob_on_demand_epr_create = self._network.channels.get(alice_host_id, bob_host_id, 'prob_on_demand_epr_create')
         echp_success_probability = prob_on_demand_epr_create * fidelity_qubit1 * fidelity_qubit2
             
-        if uniform(0, 1) < echp_success_probability:
+        if self._rng.random() < echp_success_probability:
             self.logger.log(f'Timeslot {self._network.get_timeslot()}: Par EPR criado com a fidelidade de {fidelity_qubit1 * fidelity_qubit2}')
             epr = self.create_epr_pair(fidelity_qubit1 * fidelity_qubit2)
-            self._network.edges[alice_host_id, bob_host_id]['eprs'].append(epr)
+            self._network.channels.eprs(alice_host_id, bob_host_id).append(epr)
             self.logger.log(f'Timeslot {self._network.get_timeslot()}: A probabilidade de sucesso do ECHP é {echp_success_probability}')
             return True
         self.logger.log(f'Timeslot {self._network.get_timeslot()}: A probabilidade de sucesso do ECHP falhou.')
@@ -277,13 +317,13 @@ class PhysicalLayer:
         fidelity_qubit1 = self.fidelity_measurement_only_one(qubit1)
         fidelity_qubit2 = self.fidelity_measurement_only_one(qubit2)
                
-        prob_replay_epr_create = self._network.edges[alice_host_id, bob_host_id]['prob_replay_epr_create']
+        prob_replay_epr_create = self._network.channels.get(alice_host_id, bob_host_id, 'prob_replay_epr_create')
         echp_success_probability = prob_replay_epr_create * fidelity_qubit1 * fidelity_qubit2
         
-        if uniform(0, 1) < echp_success_probability:
+        if self._rng.random() < echp_success_probability:
             self.logger.log(f'Timeslot {self._network.get_timeslot()}: Par EPR criado com a fidelidade de {fidelity_qubit1 * fidelity_qubit2}')
             epr = self.create_epr_pair(fidelity_qubit1 * fidelity_qubit2)
-            self._network.edges[alice_host_id, bob_host_id]['eprs'].append(epr)
+            self._network.channels.eprs(alice_host_id, bob_host_id).append(epr)
             self.logger.log(f'Timeslot {self._network.get_timeslot()}: A probabilidade de sucesso do ECHP é {echp_success_probability}')
             return True
         self.logger.log(f'Timeslot {self._network.get_timeslot()}: A probabilidade de sucesso do ECHP falhou.')
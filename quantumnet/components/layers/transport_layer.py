@@ -1,8 +1,8 @@
 import networkx as nx
 from quantumnet.components import Host
 from quantumnet.objects import Logger, Epr
-from random import uniform
 import math
+import numpy as np
 
 class TransportLayer:
     def __init__(self, network, network_layer, link_layer, physical_layer):
@@ -336,6 +336,62 @@ class TransportLayer:
             return False
 
 
+    def run_transport_layer_batch(self, alice_id: int, bob_id: int, num_qubits: int, route=None):
+        """
+        Transmite um lote de qubits de uma só vez, com a mesma conta de fidelidade de
+        run_transport_layer: cada qubit chega com a sua fidelidade atual vezes a média das
+        fidelidades do primeiro par EPR de cada enlace da rota, e a transmissão falha se algum
+        enlace não tem par EPR. Os qubits que já estão na memória de Alice são usados primeiro, com
+        a decoerência que sofreram, e saem da memória; os que faltam são criados em lote pela camada
+        física, sem objetos Qubit.
+
+        As memórias são contornadas: nenhum qubit é entregue à memória de Bob nem registrado em
+        transmitted_qubits. O resultado é só o vetor de fidelidades finais; os contadores e as
+        fidelidades registradas na camada de aplicação são os mesmos de run_transport_layer.
+
+        args:
+            alice_id : int : Id do host Alice.
+            bob_id : int : Id do host Bob.
+            num_qubits : int : Número de qubits a serem transmitidos.
+            route : list : Rota a ser usada (opcional).
+
+        returns:
+            np.ndarray : Fidelidade final de cada qubit, ou None se a transmissão falhou.
+        """
+        if route is None:
+            route = self._network_layer.short_route_valid(alice_id, bob_id)
+            if route is None:
+                self.logger.log('Não foi possível encontrar uma rota válida para o lote.')
+                return None
+
+        fidelities = []
+        for i in range(len(route) - 1):
+            epr_pairs = self._network.get_eprs_from_edge(route[i], route[i + 1])
+            if not epr_pairs:
+                self.logger.log(f'Não foi possível encontrar pares EPR suficientes na rota {route[i]} -> {route[i + 1]}.')
+                fidelities = []
+                break
+            fidelities.append(epr_pairs[0].get_current_fidelity())
+        if not fidelities:
+            self.logger.log(f'Falha na transmissão do lote de {num_qubits} qubits entre {alice_id} e {bob_id}.')
+            return None
+
+        # Qubits da memória de Alice primeiro, na ordem de run_transport_layer; o restante é criado em lote
+        alice = self._network.get_host(alice_id)
+        stored = [alice.memory.pop(0) for _ in range(min(len(alice.memory), num_qubits))]
+        initial = np.concatenate([
+            np.fromiter((qubit.get_current_fidelity() for qubit in stored), dtype=float, count=len(stored)),
+            self._physical_layer.draw_qubit_fidelities(num_qubits - len(stored)),
+        ])
+
+        f_route = sum(fidelities) / len(fidelities)
+        final_fidelities = initial * f_route
+        self.used_qubits += num_qubits
+        self._network.application_layer.record_route_fidelities(final_fidelities.tolist())
+        self._network.application_layer.record_used_eprs(len(fidelities) * num_qubits)
+        self.logger.log(f'Timeslot {self._network.get_timeslot()}: Lote de {num_qubits} qubits ({len(stored)} da memória de Alice) teletransportado de {alice_id} para {bob_id} na rota {route}, com fidelidade da rota {f_route}.')
+        return final_fidelities
+
     # def run_transport_layer_eprs(self, alice_id: int, bob_id: int, num_qubits: int, route=None, is_return=False, scenario=1):
     #     """
     #     Executa a requisição de transmissão e o protocolo de teletransporte para protocolo Andrews Childs.
@@ -520,11 +576,12 @@ class TransportLayer:
         # Lógica para Gerar Pares EPRs Baseada no Cenário
         if scenario == 1:
             if not is_return:
-                # Criar todos os pares EPRs no início
+                # Criar todos os pares EPRs no início, aproveitando os que já estão no canal
                 num_eprs_per_channel = num_qubits * 2
                 for i in range(len(route) - 1):
                     u, v = route[i], route[i + 1]
-                    for _ in range(num_eprs_per_channel):
+                    stock = len(self._network.channels.get_eprs(u, v, ()))
+                    for _ in range(max(num_eprs_per_channel - stock, 0)):
                         epr_pair = self._physical_layer.create_epr_pair(fidelity=1.0, increment_timeslot=False, increment_eprs=False)
                         self._physical_layer.add_epr_to_channel(epr_pair, (u, v))
                 self.logger.log(f'{num_eprs_per_channel} pares EPRs criados para cada segmento da rota {route}.')
@@ -698,11 +755,13 @@ class TransportLayer:
             self.logger.log(f"Timeslot {self._network.get_timeslot()} Pares EPRs criados para toda a rota.")
 
         while success_count < num_qubits:
-            # Cenário 1: Criar EPRs a cada transmissão
+            # Cenário 1: Criar EPRs a cada transmissão, exceto nos canais que já têm pares em estoque
             if scenario == 1:
                 self.logger.log(f"Timeslot {self._network.get_timeslot()} Iniciando criação de pares EPRs para o Cenário 1.")
                 for i in range(len(route) - 1):
                     u, v = route[i], route[i + 1]
+                    if self._network.channels.get_eprs(u, v):
+                        continue
                     epr_pair = self._physical_layer.create_epr_pair(fidelity=1.0, increment_timeslot=False)
                     self._physical_layer.add_epr_to_channel(epr_pair, (u, v))
                     self.logger.log(f"Timeslot {self._network.get_timeslot()} Par EPR criado e adicionado ao canal {u} -> {v}. Avançando timeslot...")
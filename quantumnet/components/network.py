@@ -1,9 +1,15 @@
+import copy
 import networkx as nx
+import numpy as np
 from qiskit import QuantumCircuit
-from ..objects import Logger, Qubit
+from ..objects import Logger, Qubit, Epr, RandomStreams, DirtySet, TrackedList, QubitMemory, LinkOccupancy, ChannelTable, CsrAdjacency
 from ..components import *
 from .layers import *
-import random
+from .snapshot import NetworkSnapshot, channel_key, MERGE_STATE
+from .graph_backend import make_graph_backend
+from .topologies import build_topology, read_topology, EDGE_FIELDS
+from .slice_planner import plan_slice_paths
+from .visualization import prepare_scene, paint_scene, get_renderer
 import os
 import csv
 import matplotlib.pyplot as plt
@@ -13,12 +19,22 @@ class Network():
     """
     Um objeto para utilizar como rede.
     """
-    def __init__(self) -> None:
+    def __init__(self, seed=None) -> None:
+        """
+        Args:
+            seed (int | np.random.SeedSequence, optional): Semente dos fluxos aleatórios da rede.
+        """
         # Sobre a rede
-        self._graph = nx.Graph()
+        self._graph = nx.Graph()  # Topologia, para os algoritmos de caminhos
+        self.channels = ChannelTable()  # Pares EPR e atributos dos canais, por ID denso da aresta
+        self._adjacency = None  # Adjacência CSR da topologia, reconstruída quando a topologia muda
+        self._channel_overrides = {}  # Atributo -> (IDs, valores) fixados por load_topology, que não são sorteados
+        self.graph_backend = make_graph_backend('auto')  # Algoritmos de caminhos sobre a topologia
         self._topology = None
         self._hosts = {}
         self.node_colors = []
+        # Fluxos aleatórios independentes por componente
+        self.rng = RandomStreams(seed)
         # Camadas
         self._physical = PhysicalLayer(self)
         self._link = LinkLayer(self, self._physical)
@@ -32,10 +48,70 @@ class Network():
         self.max_prob = 1
         self.min_prob = 0.2
         self.timeslot_total = 0
+        self.decoherence_factor = 0.005  # Fator de decoerência aplicado a cada timeslot
         self.qubit_timeslots = {} 
         self.requests_queue = []   
+        self.occupancy = LinkOccupancy()  # Reservas dos enlaces por timeslot, compartilhadas com o controlador
+        self.provisioner = None  # Política de pré-provisionamento de pares EPR (EprProvisioner), opcional
+        self.cutoff = None  # Descarte dos itens abaixo do corte de fidelidade (CutoffPolicy), opcional
         self.final_slice_1_paths = None  
         self.final_slice_2_paths = None  
+        # Snapshots: canais e hosts modificados desde o último snapshot capturado ou restaurado
+        self._dirty_channels = DirtySet()
+        self._dirty_hosts = DirtySet()
+        self._snapshot_base = None
+        self._setup_snapshot = None
+        self._restart_baseline = None
+        # Nós cujo estado é afetado pelo relógio desta rede (None = todos); usado pelas cópias de execute_concurrent
+        self._decoherence_scope = None
+
+    def reseed(self, seed=None):
+        """
+        Reinicia os fluxos aleatórios da rede com uma nova semente.
+
+        Args:
+            seed (int | np.random.SeedSequence, optional): Nova semente.
+        """
+        self.rng.reseed(seed)
+
+    @property
+    def adjacency(self) -> CsrAdjacency:
+        """
+        Adjacência congelada da topologia, em CSR, com os IDs da tabela de canais. É construída na
+        primeira consulta depois de cada mudança da topologia.
+
+        Returns:
+            CsrAdjacency : Adjacência atual.
+        """
+        if self._adjacency is None:
+            self._adjacency = CsrAdjacency(self._graph, self.channels.get_id)
+        return self._adjacency
+
+    def _topology_changed(self):
+        # Nós ou arestas mudaram: a adjacência e o espelho do backend serão reconstruídos na próxima consulta
+        self._adjacency = None
+        self.graph_backend.invalidate()
+
+    def set_graph_backend(self, backend='auto'):
+        """
+        Define o backend dos algoritmos de caminhos: roteamento, tabelas de roteamento e caminhos dos slices.
+
+        Args:
+            backend (str | object): Nome em GRAPH_BACKENDS ('networkx', 'rustworkx', 'auto') ou um backend pronto.
+        """
+        self.graph_backend = make_graph_backend(backend)
+
+    def induced_channels(self, nodes) -> list:
+        """
+        Canais com as duas pontas em um conjunto de nós.
+
+        Args:
+            nodes (iterable): Nós.
+
+        Returns:
+            list : Chaves dos canais.
+        """
+        return self.channels.keys_of(self.adjacency.induced_edges(nodes))
 
     @property
     def hosts(self):
@@ -128,12 +204,6 @@ class Network():
         """
         return self._application
 
-    def draw(self):
-        """
-        Desenha a rede.
-        """
-        nx.draw(self._graph, with_labels=True)
-    
     def add_host(self, host: Host):
         """
         Adiciona um host à rede no dicionário de hosts, e o host_id ao grafo da rede.
@@ -144,6 +214,8 @@ class Network():
         # Adiciona o host ao dicionário de hosts, se não existir
         if host.host_id not in self._hosts:        
             self._hosts[host.host_id] = host
+            host.memory.track(self._dirty_hosts, host.host_id)
+            host.memory.creation_time = self.qubit_creation_timeslot
             Logger.get_instance().debug(f'Host {host.host_id} adicionado aos hosts da rede.')
         else:
             raise Exception(f'Host {host.host_id} já existe nos hosts da rede.')
@@ -151,12 +223,13 @@ class Network():
         # Adiciona o nó ao grafo da rede, se não existir
         if not self._graph.has_node(host.host_id):
             self._graph.add_node(host.host_id)
+            self._topology_changed()
             Logger.get_instance().debug(f'Nó {host.host_id} adicionado ao grafo da rede.')
             
         # Adiciona as conexões do nó ao grafo da rede, se não existirem
         for connection in host.connections:
             if not self._graph.has_edge(host.host_id, connection):
-                self._graph.add_edge(host.host_id, connection)
+                self.create_channel(host.host_id, connection)
                 Logger.get_instance().debug(f'Conexões do {host.host_id} adicionados ao grafo da rede.')
     
     def get_host(self, host_id: int) -> Host:
@@ -179,10 +252,7 @@ class Network():
             Um dicionários que armazena as chaves que são as arestas do grafo e os valores são as
               listas de qubits entrelaçados (EPRs) associadas a cada aresta. 
         """
-        eprs = {}
-        for edge in self.edges:
-            eprs[edge] = self._graph.edges[edge]['eprs']
-        return eprs
+        return {edge: self.channels.eprs(*edge) for edge in self.edges}
     
     def get_eprs_from_edge(self, alice: int, bob: int) -> list:
         """
@@ -194,9 +264,46 @@ class Network():
         Returns:
             list : Lista de EPRs da aresta.
         """
-        edge = (alice, bob)
-        return self._graph.edges[edge]['eprs']
+        return self.channels.eprs(alice, bob)
     
+    @property
+    def channel_version(self) -> int:
+        """
+        Versão do estado dos canais, incrementada sempre que pares EPR são adicionados ou removidos
+        ou que canais são criados ou restaurados. A decoerência não altera a versão.
+
+        Returns:
+            int : Versão atual.
+        """
+        return self._dirty_channels.version
+
+    def is_route_valid(self, route: list) -> bool:
+        """
+        Verifica se todos os canais de uma rota existem e têm ao menos um par EPR.
+
+        Args:
+            route (list): Rota como lista de nós.
+
+        Returns:
+            bool : True se a rota pode ser usada.
+        """
+        for i in range(len(route) - 1):
+            if not self.channels.get_eprs(route[i], route[i + 1]):
+                return False
+        return True
+
+    def route_edge_ids(self, route: list):
+        """
+        Índices dos canais de uma rota, os mesmos usados na matriz de ocupação dos enlaces.
+
+        Args:
+            route (list): Rota como lista de nós.
+
+        Returns:
+            np.ndarray : Vetor compacto com um índice por canal da rota.
+        """
+        return np.fromiter((self.occupancy.index(link) for link in LinkOccupancy.route_links(route)), dtype=np.int32)
+
     def remove_epr(self, alice: int, bob: int) -> list:
         """
         Remove um EPR de um canal.
@@ -204,53 +311,49 @@ class Network():
         Args:
             channel (tuple): Canal de comunicação.
         """
-        channel = (alice, bob)
         try:
-            epr = self._graph.edges[channel]['eprs'].pop(-1)   
+            epr = self.channels.eprs(alice, bob).pop(-1)
             return epr
         except IndexError:
             raise Exception('Não há Pares EPRs.')   
 
-    def set_topology_for_slices(self, graph_type: str, dimensions: tuple, clients: list, server: int):
+    def set_topology_for_slices(self, graph_type: str, dimensions: tuple, clients: list, server: int, **params):
         """
         Configura a topologia da rede especificamente para a simulação de slices.
         
         Args:
-            graph_type (str): Tipo do grafo. Pode ser 'grade', 'linha' ou 'anel'.
+            graph_type (str): Tipo do grafo, um nome de TOPOLOGIES, como 'grade', 'linha', 'anel', 'toro', 'geometrica', 'waxman', 'barabasi_albert' ou 'fat_tree'.
             dimensions (tuple): Dimensões da topologia. Por exemplo, (4, 4) para uma grade 4x4.
             clients (list): IDs dos nós que serão configurados como clientes.
             server (int): ID do nó que será configurado como servidor.
+            **params: Parâmetros da topologia, como radius, alpha, beta ou m.
         """
-        # 1. Criar a topologia
-        if graph_type == 'grade':
-            if len(dimensions) != 2:
-                raise ValueError("Para topologia 'grade', são necessárias duas dimensões.")
-            self._graph = nx.grid_2d_graph(*dimensions)
-        elif graph_type == 'linha':
-            if len(dimensions) != 1:
-                raise ValueError("Para topologia 'linha', é necessário um único valor de dimensão.")
-            self._graph = nx.path_graph(dimensions[0])
-        elif graph_type == 'anel':
-            if len(dimensions) != 1:
-                raise ValueError("Para topologia 'anel', é necessário um único valor de dimensão.")
-            self._graph = nx.cycle_graph(dimensions[0])
-        else:
-            raise ValueError(f"Tipo de grafo '{graph_type}' não suportado.")
-
-        self._graph = nx.convert_node_labels_to_integers(self._graph)  # Converte rótulos dos nós para inteiros
+        # 1. Criar a topologia, com nós inteiros e peso 1 nas arestas
+        self._graph = build_topology(graph_type, *dimensions, rng=self.rng['topology'].generator, **params)
         total_nodes = len(self._graph.nodes)
 
         # Valida os IDs de clientes e servidor
         if server >= total_nodes or any(client >= total_nodes for client in clients):
             raise ValueError("IDs de clientes ou servidor estão fora do intervalo de nós disponíveis na topologia.")
 
-        # Configura pesos nas arestas
-        for edge in self._graph.edges:
-            self._graph.edges[edge]['weight'] = 1
-
         # Inicializa os nós como ServerNode, ClientNode ou RegularNode
+        self._create_hosts(clients, server)
+
+        # Inicializa canais e EPRs
+        self.start_hosts()
+        self.start_channels()
+        self.start_eprs()
+        self._setup_done()
+
+        # Log e confirmação
+        self.logger.log(f"Topologia configurada: {graph_type} ({dimensions}) com {len(clients)} clientes e 1 servidor.")
+        print("Topologia configurada com sucesso para slices!")
+
+    def _create_hosts(self, clients, server):
+        # Um host por nó do grafo: o servidor, os clientes e os demais como nós regulares
         self._hosts = {}
         self.node_colors = []
+        clients = set(clients)
 
         for node in self._graph.nodes:
             if node == server:
@@ -263,96 +366,130 @@ class Network():
                 self._hosts[node] = RegularNode(node)
                 self.node_colors.append('#1f78b8')  # Nós regulares
 
-        # Inicializa canais e EPRs
+    def load_topology(self, path: str, clients=(), server: int = None, format: str = None, num_eprs: int = 2):
+        """
+        Carrega a topologia de um arquivo (lista de arestas, CSV ou GraphML, ver read_topology) e
+        inicializa hosts, canais e pares EPR. As probabilidades e os estoques de pares informados por
+        aresta no arquivo são usados no lugar dos sorteados e permanecem fixos quando as
+        probabilidades são sorteadas de novo; nas arestas sem esses campos, as probabilidades são
+        sorteadas e o estoque é num_eprs.
+
+        Args:
+            path (str): Caminho do arquivo.
+            clients (list): IDs dos nós clientes.
+            server (int, optional): ID do nó servidor. Por padrão, o menor nó.
+            format (str, optional): 'edgelist', 'csv' ou 'graphml'. Por padrão, deduzido da extensão.
+            num_eprs (int): Pares EPR iniciais das arestas sem o campo 'eprs'.
+        """
+        graph = read_topology(path, format)
+        if graph.number_of_nodes() == 0:
+            raise ValueError(f'A topologia {path} não tem nós.')
+        server = min(graph.nodes) if server is None else server
+        if not graph.has_node(server) or any(not graph.has_node(client) for client in clients):
+            raise ValueError("IDs de clientes ou servidor não existem na topologia carregada.")
+
+        # Os campos por aresta saem do grafo, que guarda apenas a topologia e o peso
+        fields = {name: [] for name in EDGE_FIELDS}
+        for u, v, data in graph.edges(data=True):
+            for name in EDGE_FIELDS:
+                if name in data:
+                    fields[name].append((u, v, data.pop(name)))
+        self._graph = graph
+        self._create_hosts(clients, server)
         self.start_hosts()
         self.start_channels()
-        self.start_eprs()
 
-        # Log e confirmação
-        self.logger.log(f"Topologia configurada: {graph_type} ({dimensions}) com {len(clients)} clientes e 1 servidor.")
-        print("Topologia configurada com sucesso para slices!")
-
-    def calculate_paths(self, clients, server):
-        """
-        Calcula os caminhos para cada cliente, com cada cliente correspondendo a um slice.
+        for name in ChannelTable.COLUMNS:
+            if fields[name]:
+                ids = np.fromiter((self.channels.id(u, v) for u, v, _ in fields[name]), dtype=np.int64, count=len(fields[name]))
+                values = np.array([value for _, _, value in fields[name]], dtype=float)
+                self._channel_overrides[name] = (ids, values)
+                self.channels.column(name)[ids] = values
+        stock = np.full(len(self.channels.column(ChannelTable.COLUMNS[0])), num_eprs, dtype=np.int64)
+        for u, v, value in fields['eprs']:
+            stock[self.channels.id(u, v)] = int(value)
+        self.start_eprs(stock)
+        self._setup_done()
+        self.logger.log(f"Topologia carregada de {path}: {graph.number_of_nodes()} nós e {graph.number_of_edges()} arestas.")
+
+    def calculate_paths(self, clients, server, disjoint='edge'):
+        """
+        Calcula os caminhos para cada cliente, com cada cliente correspondendo a um slice. Os
+        caminhos são planejados juntos por plan_slice_paths, sem arestas (ou nós) em comum, e o
+        grafo não é alterado. Clientes que não podem receber um caminho disjunto dos demais usam o
+        caminho mais curto, compartilhado.
 
         Args:
             clients (list): IDs dos nós clientes.
             server (int): ID do nó servidor.
+            disjoint (str, optional): 'edge', 'node' ou None (caminhos mais curtos independentes).
 
         Returns:
             list: Lista contendo os caminhos para cada cliente (slice).
         """
+        if disjoint is None:
+            paths = [None] * len(clients)
+        else:
+            paths = plan_slice_paths(self._graph, clients, server, disjoint=disjoint, weight='weight')
         slice_paths = []  # Cada cliente será um slice
-        edge_weights = nx.get_edge_attributes(self._graph, 'weight')
-
-        for client in clients:
-            # Caminho mais curto do cliente para o servidor
-            path = nx.shortest_path(self._graph, source=client, target=server, weight='weight')
+        for client, path in zip(clients, paths):
+            if path is None:
+                if disjoint is not None:
+                    self.logger.log(f"Cliente {client} sem caminho disjunto até o servidor {server}; usando o caminho mais curto.")
+                # Caminho mais curto do cliente para o servidor
+                path = self.graph_backend.shortest_path(self._graph, client, server, weight='weight')
             slice_paths.append(path)
 
-            # Penaliza as arestas para evitar overlaps em slices futuros
-            for i in range(len(path) - 1):
-                edge = (path[i], path[i + 1])
-                edge_weights[edge] = edge_weights.get(edge, 1) + 10
-                reverse_edge = (edge[1], edge[0])
-                if reverse_edge in edge_weights:
-                    edge_weights[reverse_edge] += 10
-
-            # Atualiza os pesos no grafo após o cálculo de cada slice
-            nx.set_edge_attributes(self._graph, edge_weights, 'weight')
-
         return slice_paths
 
-    def visualize_slices(self, clients, server, slice_paths):
+    def visualize_slices(self, clients, server, slice_paths, path=None):
         """
-        Visualiza o grafo com os caminhos para múltiplos slices distinguidos por cores.
+        Visualiza o grafo com os caminhos para múltiplos slices distinguidos por cores. O layout é o
+        da topologia (as posições da grade, por exemplo), calculado uma única vez por topologia.
 
         Args:
             clients (list): IDs dos nós clientes.
             server (int): ID do nó servidor.
             slice_paths (list): Lista de caminhos para cada cliente (slice).
-        """
-        pos = nx.spring_layout(self._graph)
-        plt.figure(figsize=(10, 10))
-
-        # Desenha a base do grafo
-        nx.draw(self._graph, pos, with_labels=True, node_size=500, node_color="lightgray", edge_color="gray")
-
-        nx.draw_networkx_nodes(self._graph, pos, nodelist=[server], node_color="red", label="Server")
-        nx.draw_networkx_nodes(self._graph, pos, nodelist=clients, node_color="blue", label="Clients")
+            path (str, optional): Arquivo da figura. Se informado, a figura é desenhada em segundo
+                plano, sem exibição interativa.
 
+        Returns:
+            Future | None : Com path, a renderização em andamento; sem ele, None.
+        """
         # Define cores para os slices
         colors = plt.cm.tab10.colors  # Paleta de cores
-
-        # Desenha os caminhos de cada slice
-        for slice_index, path in enumerate(slice_paths):
-            edges = [(path[i], path[i + 1]) for i in range(len(path) - 1)]
-            nx.draw_networkx_edges(self._graph, pos, edgelist=edges,
-                                edge_color=colors[slice_index % len(colors)], width=2,
-                                label=f"Slice {slice_index + 1}")
-
-        plt.title("Paths for Slices")
-        plt.legend()
+        highlights = [(slice_path, colors[slice_index % len(colors)], f"Slice {slice_index + 1}")
+                      for slice_index, slice_path in enumerate(slice_paths)]
+        scene = prepare_scene(self._graph, highlights=highlights,
+                              markers=[([server], "red", "Server"), (list(clients), "blue", "Clients")],
+                              title="Paths for Slices")
+        return self._show_scene(scene, path)
+
+    def _show_scene(self, scene, path=None):
+        # Com arquivo, desenha em segundo plano; sem ele, exibe como antes
+        if path is not None:
+            return get_renderer().submit(scene, path)
+        fig, ax = plt.subplots(figsize=(10, 10))
+        paint_scene(ax, scene)
         plt.show()
+        return None
 
-    def run_slice_simulation(self, clients, server):
+    def run_slice_simulation(self, clients, server, disjoint='edge', image_path=None):
         """
         Roda a simulação de slices para a topologia configurada.
 
         Args:
             clients (list): IDs dos nós clientes.
             server (int): ID do nó servidor.
+            disjoint (str, optional): Disjunção dos caminhos, como em calculate_paths.
+            image_path (str, optional): Arquivo da figura dos slices, desenhada em segundo plano. Se None, a figura é exibida.
 
         Returns:
             list: Lista de caminhos finais para cada cliente (slice).
         """
-        # Configura pesos padrão
-        for edge in self._graph.edges:
-            self._graph.edges[edge]['weight'] = 1
-
         # Calcula os caminhos para os slices
-        slice_paths = self.calculate_paths(clients, server)
+        slice_paths = self.calculate_paths(clients, server, disjoint)
 
         # Armazena as rotas como atributo da rede
         self.final_slice_paths = slice_paths
@@ -360,7 +497,7 @@ class Network():
         print(f"Final Slice Paths for {len(clients)} slices:", self.final_slice_paths)
 
         # Visualiza os slices
-        self.visualize_slices(clients, server, slice_paths)
+        self.visualize_slices(clients, server, slice_paths, path=image_path)
 
         self.logger.log(f"Simulação de slices concluída para {len(clients)} clientes e servidor {server}.")
 
@@ -368,36 +505,21 @@ class Network():
         return self.final_slice_paths
     
         
-    def set_ready_topology(self, topology_name: str, num_clients: int, *args: int, clients=None, server=None) -> None:
+    def set_ready_topology(self, topology_name: str, num_clients: int, *args: int, clients=None, server=None, **params) -> None:
         """
         Cria um grafo com uma topologia pronta e inicializa os nós como servidor, clientes e normais.
 
         Args:
-            topology_name (str): Nome da topologia.
+            topology_name (str): Nome da topologia, em TOPOLOGIES: 'grade', 'linha', 'anel', 'toro', 'geometrica', 'waxman', 'barabasi_albert' ou 'fat_tree'.
             num_clients (int): Número de nós que serão clientes.
             *args (int): Argumentos para a topologia, geralmente o número de nós totais.
             clients (list, optional): Lista de nós que devem ser clientes.
             server (int, optional): Nó que será o servidor.
+            **params: Parâmetros da topologia, como radius, alpha, beta ou m.
         """
-        # Converter o nome da topologia para minúsculas para aceitar qualquer variação de letras
-        topology_name = topology_name.lower()
-
-        # Cria a topologia conforme o nome
-        if topology_name == 'grade':
-            if len(args) != 2:
-                raise Exception('Para a topologia Grade, são necessários dois argumentos.')
-            self._graph = nx.grid_2d_graph(*args)
-        elif topology_name == 'linha':
-            if len(args) != 1:
-                raise Exception('Para a topologia Linha, é necessário um argumento.')
-            self._graph = nx.path_graph(*args)
-        elif topology_name == 'anel':
-            if len(args) != 1:
-                raise Exception('Para a topologia Anel, é necessário um argumento.')
-            self._graph = nx.cycle_graph(*args)
-
-        # Converte os labels dos nós para inteiros
-        self._graph = nx.convert_node_labels_to_integers(self._graph)
+        # Cria a topologia conforme o nome, com nós inteiros e peso 1 nas arestas. As topologias
+        # aleatórias usam o fluxo 'topology' da rede
+        self._graph = build_topology(topology_name, *args, rng=self.rng['topology'].generator, **params)
 
         total_nodes = len(self._graph.nodes())
         self.node_colors = []  # Armazena as cores dos nós
@@ -410,9 +532,6 @@ class Network():
             self._hosts[0] = ServerNode(0)
             self.node_colors.append('green')
 
-        for edge in self._graph.edges:
-            self._graph.edges[edge]['weight'] = 1  # Configura o peso padrão
-
         # Inicializa os clientes com base na lista fornecida
         if clients:
             for client in clients:
@@ -432,23 +551,35 @@ class Network():
         self.start_hosts()
         self.start_channels()
         self.start_eprs()
+        self._setup_done()
 
-    def draw(self):
-        node_colors = [self._hosts[node].color() for node in self._graph.nodes()]
-        nx.draw(self._graph, with_labels=True, node_color=node_colors, node_size=800)
-        plt.show()
+    def draw(self, path=None):
+        """
+        Desenha a rede, com a cor de cada host, no layout da topologia.
+
+        Args:
+            path (str, optional): Arquivo da figura. Se informado, a figura é desenhada em segundo
+                plano, sem exibição interativa.
+
+        Returns:
+            Future | None : Com path, a renderização em andamento; sem ele, None.
+        """
+        node_colors = {node: host.color() for node, host in self._hosts.items()}
+        return self._show_scene(prepare_scene(self._graph, node_colors=node_colors), path)
 
 
     def start_hosts(self, num_qubits: int = 0):
         """
-        Inicializa os hosts da rede com exceção do servidor (host 0).
+        Inicializa os hosts da rede. Os servidores (ServerNode) não recebem qubits.
 
         Args:
-            num_qubits (int): Número de qubits a serem inicializados para cada host, exceto o host 0 (servidor).
+            num_qubits (int): Número de qubits a serem inicializados para cada host, exceto os servidores.
         """
         for host_id in self._hosts:
-            # Evita que o servidor (host 0) receba qubits
-            if host_id == 10:
+            self._hosts[host_id].memory.track(self._dirty_hosts, host_id)
+            self._hosts[host_id].memory.creation_time = self.qubit_creation_timeslot
+            # Evita que o servidor receba qubits
+            if isinstance(self._hosts[host_id], ServerNode):
                 self.logger.log(f"Host {host_id} é o servidor, não receberá qubits.")
                 continue
             
@@ -468,25 +599,481 @@ class Network():
             prob_on_demand_epr_create (float): Probabilidade de criar um EPR sob demanda.
             prob_replay_epr_create (float): Probabilidade de criar um EPR de replay.
         """
-        for edge in self.edges:
-            self._graph.edges[edge]['busy_timeslots'] = set()  # Adiciona atributo de timeslots ocupados
-            self._graph.edges[edge]['prob_on_demand_epr_create'] = random.uniform(self.min_prob, self.max_prob)
-            self._graph.edges[edge]['prob_replay_epr_create'] = random.uniform(self.min_prob, self.max_prob)
-            self._graph.edges[edge]['eprs'] = list()
+        # Todos os canais são registrados de uma só vez, como em create_channel
+        edges = list(self.edges)
+        keys = [channel_key(u, v) for u, v in edges]
+        self.occupancy.clear()
+        self.channels = ChannelTable(capacity=max(len(edges), 1))
+        self._channel_overrides = {}
+        self._topology_changed()
+        self.channels.add_many(edges, [TrackedList(dirty=self._dirty_channels, key=key) for key in keys])
+        self._dirty_channels.update(keys)
+        self._dirty_channels.changed()
+        for key in keys:
+            self.occupancy.index(key)
+        self.draw_channel_probabilities()
         print("Canais inicializados")
-        
-    def start_eprs(self, num_eprs: int = 2):
+
+    def create_channel(self, u: int, v: int) -> TrackedList:
         """
-        Inicializa os pares EPRs nas arestas da rede.
+        Cria um canal entre dois nós, ou reinicia um canal existente, com a lista de pares EPR vazia.
 
         Args:
-            num_eprs (int): Número de pares EPR a serem inicializados para cada canal.
+            u (int): Nó de uma ponta.
+            v (int): Nó da outra ponta.
+
+        Returns:
+            TrackedList : Lista de pares EPR do canal.
+        """
+        key = channel_key(u, v)
+        if not self._graph.has_edge(u, v):
+            self._graph.add_edge(u, v)
+            self._topology_changed()
+        store = TrackedList(dirty=self._dirty_channels, key=key)
+        self.channels.add(u, v, store)
+        self._dirty_channels.add(key)
+        self._dirty_channels.changed()
+        self.occupancy.index(key)
+        return store
+
+    def remove_channel(self, u: int, v: int):
         """
-        for edge in self.edges:
-            for i in range(num_eprs):
-                epr = self.physical.create_epr_pair(increment_timeslot=False,increment_eprs=False)
-                self._graph.edges[edge]['eprs'].append(epr)
-                self.logger.debug(f'Par EPR {epr} adicionado ao canal.')
+        Remove um canal: a aresta do grafo e a linha da tabela de canais.
+
+        Args:
+            u (int): Nó de uma ponta.
+            v (int): Nó da outra ponta.
+        """
+        if self._graph.has_edge(u, v):
+            self._graph.remove_edge(u, v)
+            self._topology_changed()
+        self.channels.remove(u, v)
+
+    def _setup_done(self):
+        # Estado inicial da topologia, usado como ponto de partida das reinicializações da rede
+        self._restart_baseline = None
+        self._setup_snapshot = self.snapshot()
+
+    def snapshot(self) -> NetworkSnapshot:
+        """
+        Captura o estado atual da rede: canais, memória dos hosts, contadores e relógio.
+
+        Returns:
+            NetworkSnapshot : Snapshot da rede.
+        """
+        snapshot = NetworkSnapshot(self)
+        self._snapshot_base = snapshot
+        self._dirty_channels.clear()
+        self._dirty_hosts.clear()
+        return snapshot
+
+    def restore(self, snapshot: NetworkSnapshot, clock: bool = True, counters: bool = True):
+        """
+        Restaura a rede para um snapshot. Se a rede partiu do mesmo snapshot, apenas os canais e hosts
+        modificados desde então são copiados; caso contrário, a rede inteira é restaurada.
+
+        Args:
+            snapshot (NetworkSnapshot): Snapshot a restaurar.
+            clock (bool): Se True, restaura o timeslot da rede.
+            counters (bool): Se True, restaura os contadores das camadas e o registro dos qubits e descarta
+                o estado das reinicializações, refeito pela próxima restart_network. Se False, os qubits
+                restaurados são registrados como criados no timeslot atual.
+        """
+        if snapshot is self._snapshot_base:
+            channels = set(self._dirty_channels)
+            hosts = set(self._dirty_hosts)
+        else:
+            channels = set(snapshot.channels) | set(self.channels)
+            hosts = set(self._hosts)
+
+        for key in channels:
+            snapshot.restore_channel(self, key)
+        if clock:
+            # As reservas dos enlaces são indexadas por timeslot, então acompanham o relógio
+            self.timeslot_total = snapshot.clock
+            self.occupancy.restore(snapshot.occupancy)
+        if counters:
+            snapshot.restore_counters(self)
+            # O estado das reinicializações foi sorteado a partir do estado anterior da rede
+            self._restart_baseline = None
+        register_timeslot = None if counters else self.timeslot_total
+        for host_id in hosts:
+            if host_id in self._hosts:
+                snapshot.restore_host(self, host_id, register_timeslot)
+
+        self._snapshot_base = snapshot
+        self._dirty_channels.clear()
+        self._dirty_hosts.clear()
+        if channels:
+            self._dirty_channels.changed()
+        if self.cutoff is not None:
+            if self.timeslot_total < self.cutoff.wheel.now:
+                self.cutoff.rebuild()
+            else:
+                self.cutoff.track(channels, hosts)
+
+    def fork(self, seed=None) -> 'Network':
+        """
+        Cria uma cópia da rede para avaliar cenários hipotéticos, como agendamentos candidatos,
+        sem alterar a rede original. A cópia é feita sob escrita: os pares EPR dos canais são
+        compartilhados até que uma das redes modifique o canal, e a topologia, os snapshots e os
+        atributos imutáveis não são copiados. Custa uma fração de copy.deepcopy.
+
+        Args:
+            seed (int | np.random.SeedSequence, optional): Semente dos fluxos da cópia. Por padrão,
+                a cópia continua os fluxos da rede original.
+
+        Returns:
+            Network : Rede independente, no mesmo estado e com fluxos aleatórios próprios.
+        """
+        fork = copy.copy(self)
+        fork.cutoff = None  # O descarte acontece na rede original, quando a cópia é incorporada
+        fork.rng = copy.deepcopy(self.rng)
+        if seed is not None:
+            fork.rng.reseed(seed)
+        fork._dirty_channels = DirtySet(self._dirty_channels, self._dirty_channels.version)
+        fork._dirty_hosts = DirtySet(self._dirty_hosts, self._dirty_hosts.version)
+        fork.occupancy = self.occupancy.copy()
+
+        # Referências da rede original que devem apontar para os objetos correspondentes da cópia
+        mapping = {id(self): fork}
+        for name in RandomStreams.COMPONENTS:
+            mapping[id(self.rng[name])] = fork.rng[name]
+        layers = ('_physical', '_link', '_network', '_transport', '_application')
+        for name in layers:
+            layer = getattr(self, name)
+            mapping[id(layer)] = copy.copy(layer)
+
+        def remap(value):
+            if id(value) in mapping:
+                return mapping[id(value)]
+            if isinstance(value, (list, dict, set)) and not isinstance(value, TrackedList):
+                return copy.copy(value)
+            return value
+
+        for name in layers:
+            layer = mapping[id(getattr(self, name))]
+            layer.__dict__.update({attr: remap(value) for attr, value in vars(layer).items()})
+            setattr(fork, name, layer)
+        for attr in ('qubit_timeslots', 'requests_queue', 'node_colors'):
+            setattr(fork, attr, remap(getattr(self, attr)))
+
+        # Canais: a topologia e as colunas da tabela são copiadas, os pares EPR são compartilhados
+        fork._graph = self._graph.copy()
+        fork.graph_backend = self.graph_backend.copy()
+        fork.channels = self.channels.copy()
+        for (u, v), eprs in list(fork.channels.items()):
+            fork.channels.set_eprs(u, v, eprs.share(fork._dirty_channels) if isinstance(eprs, TrackedList) else list(eprs))
+
+        # Hosts: os qubits são alterados no lugar pelos protocolos, então a memória é copiada
+        fork._hosts = {}
+        for host_id, host in self._hosts.items():
+            host_copy = copy.copy(host)
+            qubits = []
+            for qubit in host.memory:
+                qubit = copy.copy(qubit)
+                qubit._rng = remap(qubit._rng)
+                qubits.append(qubit)
+            memory = host.memory
+            host_copy._memory = QubitMemory(qubits, fork._dirty_hosts, host_id, memory.capacity, memory.eviction, fork.qubit_creation_timeslot)
+            fork._hosts[host_id] = host_copy
+        return fork
+
+    # Execução concorrente
+
+    def request_route(self, request):
+        """
+        Rota conhecida de uma requisição: o slice_path ou a rota fixada pelo controlador.
+
+        Args:
+            request (dict): Requisição.
+
+        Returns:
+            list or None: Rota, ou None se a requisição ainda não tem rota.
+        """
+        slice_path = request.get('slice_path')
+        if isinstance(slice_path, dict):
+            slice_path = slice_path.get('path')
+        return slice_path or request.get('route')
+
+    def independent_groups(self, requests: list) -> tuple:
+        """
+        Separa as requisições em grupos que não compartilham nenhum recurso: enlaces e nós, exceto o
+        destino, como em Controller.route_resources. Requisições do mesmo grupo executam em
+        sequência; grupos diferentes podem executar ao mesmo tempo, inclusive com o mesmo servidor.
+
+        Args:
+            requests (list): Requisições.
+
+        Returns:
+            tuple : (grupos como pares (nós, exceto os destinos, e índices das requisições), índices das requisições sem rota conhecida).
+        """
+        parent = {}
+
+        def find(resource):
+            while parent[resource] != resource:
+                parent[resource] = parent[parent[resource]]
+                resource = parent[resource]
+            return resource
+
+        routed, unrouted = [], []
+        for index, request in enumerate(requests):
+            route = self.request_route(request)
+            if not route:
+                unrouted.append(index)
+                continue
+            resources = [('node', node) for node in route[:-1]]
+            resources.extend(('link', link) for link in LinkOccupancy.route_links(route))
+            resources = resources or [('request', index)]
+            routed.append((index, route, resources[0]))
+            for resource in resources:
+                parent.setdefault(resource, resource)
+            root = find(resources[0])
+            for resource in resources[1:]:
+                parent[find(resource)] = root
+
+        groups = {}
+        for index, route, resource in routed:
+            nodes, indices = groups.setdefault(find(resource), (set(), []))
+            nodes.update(route[:-1])
+            indices.append(index)
+        return list(groups.values()), unrouted
+
+    def _merge_owner(self, name: str):
+        return self if name == 'network' else getattr(self, name)
+
+    def _counter_state(self) -> dict:
+        # Estado de MERGE_STATE antes da execução, base para incorporar o que cada cópia alterou:
+        # contadores, tamanhos das listas e cópias rasas dos dicionários. O relógio avança pelo grupo
+        # mais longo e os hosts são incorporados por _merge_memories
+        state = {}
+        for owner_name, attrs in MERGE_STATE.items():
+            owner = self._merge_owner(owner_name)
+            for attr in attrs:
+                value = getattr(owner, attr)
+                if isinstance(value, list):
+                    value = len(value)
+                elif isinstance(value, dict):
+                    value = dict(value)
+                state[(owner_name, attr)] = value
+        return state
+
+    def _merge_fork(self, fork: 'Network', base: dict, origin: dict):
+        """
+        Incorpora a esta rede o que uma cópia criada por execute_concurrent alterou: canais
+        modificados e os contadores, listas e dicionários de MERGE_STATE. Todas as cópias partem dos
+        mesmos contadores de ID; os qubits e pares EPR criados por esta cópia são renumerados a
+        partir dos IDs já usados pelas cópias incorporadas antes dela, e o registro dos qubits
+        acompanha os novos IDs. As memórias dos hosts são incorporadas depois, por _merge_memories.
+
+        Args:
+            fork (Network): Cópia executada.
+            base (dict): Estado de _counter_state antes da execução.
+            origin (dict): id da cópia de cada qubit -> (cópia, host, qubit original), de execute_concurrent.
+        """
+        qubit_base, epr_base = base[('_physical', '_count_qubit')], base[('_physical', '_count_epr')]
+        qubit_end, epr_end = fork._physical._count_qubit, fork._physical._count_epr
+        qubit_offset = self._physical._count_qubit - qubit_base
+        epr_offset = self._physical._count_epr - epr_base
+        renumbered = set()
+
+        def renumber(item):
+            if not (qubit_offset or epr_offset):
+                return
+            if isinstance(item, dict):
+                for value in item.values():
+                    renumber(value)
+            elif id(item) in renumbered or id(item) in origin:
+                return
+            elif isinstance(item, Qubit) and type(item.qubit_id) is int and qubit_base <= item.qubit_id < qubit_end:
+                renumbered.add(id(item))
+                item.qubit_id += qubit_offset
+            elif isinstance(item, Epr) and type(item.epr_id) is int and epr_base <= item.epr_id < epr_end:
+                renumbered.add(id(item))
+                item._epr_id += epr_offset
+
+        def rekey(attr, key):
+            if attr == 'qubit_timeslots' and qubit_offset and type(key) is int and qubit_base <= key < qubit_end:
+                return key + qubit_offset
+            return key
+
+        for key in fork._dirty_channels:
+            source = fork.channels.get_eprs(*key)
+            if source is None:
+                if key in self.channels:
+                    self.remove_channel(*key)
+                    self._dirty_channels.add(key)
+                    self._dirty_channels.changed()
+                continue
+            for epr in source:
+                renumber(epr)
+            store = self.channels.get_eprs(*key)
+            if not isinstance(store, TrackedList):
+                store = self.create_channel(*key)
+            store[:] = source
+        for host_id in fork._dirty_hosts:
+            for qubit in fork._hosts[host_id].memory:
+                renumber(qubit)
+
+        for (owner_name, attr), value in base.items():
+            target, source = self._merge_owner(owner_name), fork._merge_owner(owner_name)
+            current = getattr(source, attr)
+            if isinstance(current, int):
+                setattr(target, attr, getattr(target, attr) + current - value)
+            elif isinstance(current, list):
+                for item in current[value:]:
+                    renumber(item)
+                getattr(target, attr).extend(current[value:])
+            elif isinstance(current, dict):
+                merged = getattr(target, attr)
+                missing = object()
+                for key, item in current.items():
+                    if value.get(key, missing) is not item:
+                        renumber(item)
+                        merged[rekey(attr, key)] = item
+                for key in value.keys() - current.keys():
+                    merged.pop(key, None)
+        if fork._network.avg_size_routes != self._network.avg_size_routes:
+            self._network.get_avg_size_routes()
+
+    def _merge_memories(self, forks: list, origins: list):
+        """
+        Incorpora as memórias dos hosts alterados pelas cópias. Uma memória alterada por uma única
+        cópia fica igual à da cópia; o destino comum de vários grupos recebe a soma das alterações:
+        os qubits que alguma cópia retirou saem, os que continuam levam o estado da última cópia
+        que os manteve e os novos entram no final, na ordem das cópias.
+
+        Args:
+            forks (list): Cópias executadas, na ordem dos grupos.
+            origins (list): Origem dos qubits de cada cópia, como em _merge_fork.
+        """
+        editors = {}
+        for fork, origin in zip(forks, origins):
+            for host_id in fork._dirty_hosts:
+                editors.setdefault(host_id, []).append((fork, origin))
+        qubit_rng = self.rng['qubits']
+        for host_id, changes in editors.items():
+            if len(changes) == 1:
+                qubits = list(changes[0][0]._hosts[host_id].memory)
+            else:
+                originals = list(self._hosts[host_id].memory)
+                kept, removed, added = {}, set(), []
+                for fork, origin in changes:
+                    survivors = set()
+                    for qubit in fork._hosts[host_id].memory:
+                        entry = origin.get(id(qubit))
+                        if entry is not None and entry[0] is qubit and entry[1] == host_id:
+                            kept[id(entry[2])] = qubit
+                            survivors.add(id(entry[2]))
+                        else:
+                            added.append(qubit)
+                    removed.update(id(qubit) for qubit in originals if id(qubit) not in survivors)
+                qubits = [kept.get(id(qubit), qubit) for qubit in originals if id(qubit) not in removed] + added
+            for qubit in qubits:
+                qubit._rng = qubit_rng
+            self._hosts[host_id].memory[:] = qubits
+
+    def execute_concurrent(self, requests: list) -> list:
+        """
+        Executa as requisições de um timeslot como se fossem simultâneas. Requisições sem recursos em
+        comum executam em cópias da rede (fork), cada uma com seu próprio relógio lógico, que só
+        aplica decoerência aos nós do seu grupo, e com fluxos aleatórios derivados da rede. Ao final,
+        os canais, memórias, contadores, listas e dicionários das cópias são incorporados à rede,
+        cujo relógio avança pelo grupo mais longo; o estado dos demais grupos e o dos destinos
+        recebe a decoerência dos timeslots restantes. O resultado não depende da ordem em que as
+        cópias terminam.
+
+        As cópias executam em sequência, no processo atual: a simulação é Python puro e, presa ao GIL,
+        não ganha tempo com threads (em uma grade 8x8, com 4 grupos e o mesmo servidor, 4 threads
+        levaram 1,6 vez o tempo de 1). O paralelismo fica entre simulações, no SimulationRunner.
+
+        Requisições sem rota conhecida executam depois, em sequência, na própria rede.
+
+        Args:
+            requests (list): Requisições do timeslot.
+
+        Returns:
+            list : Resultado (True para sucesso) de cada requisição, na ordem recebida.
+        """
+        results = [False] * len(requests)
+        if self.cutoff is not None:
+            self.cutoff.expire()
+        groups, unrouted = self.independent_groups(requests)
+        start = self.timeslot_total
+        base = self._counter_state()
+
+        forks, origins = [], []
+        for (nodes, _), streams in zip(groups, self.rng.spawn(len(groups))):
+            fork = self.fork(streams.seed_sequence)
+            fork._decoherence_scope = nodes
+            fork._snapshot_base = None
+            fork._dirty_channels.clear()
+            fork._dirty_hosts.clear()
+            forks.append(fork)
+            origins.append({id(qubit): (qubit, host_id, original)
+                            for host_id, host in self._hosts.items()
+                            for original, qubit in zip(host.memory, fork._hosts[host_id].memory)})
+
+        outcomes = [[fork.execute_request(requests[index]) for index in indices] for fork, (_, indices) in zip(forks, groups)]
+
+        elapsed = [fork.timeslot_total - start for fork in forks]
+        longest = max(elapsed, default=0)
+        self.timeslot_total = start + longest
+        for fork, origin, (_, indices), outcome in zip(forks, origins, groups, outcomes):
+            self._merge_fork(fork, base, origin)
+            for index, success in zip(indices, outcome):
+                results[index] = success
+        self._merge_memories(forks, origins)
+        for (nodes, _), steps in zip(groups, elapsed):
+            if longest > steps:
+                self.decohere(longest - steps, nodes)
+
+        # Estado fora de todos os grupos, inclusive os destinos, acompanha o relógio da rede
+        if longest:
+            scopes = [nodes for nodes, _ in groups]
+            hosts = [host_id for host_id in self._hosts if not any(host_id in nodes for nodes in scopes)]
+            inside = np.concatenate([self.adjacency.induced_edges(nodes) for nodes in scopes])
+            edges = self.channels.keys_of(np.setdiff1d(self.channels.ids(), inside))
+            self.decohere(longest, hosts=hosts, edges=edges)
+
+        for index in unrouted:
+            results[index] = self.execute_request(requests[index])
+        return results
+
+    def draw_channel_probabilities(self):
+        """
+        Sorteia as probabilidades de criação de EPR sob demanda e de replay de cada canal. Os valores
+        fixados por load_topology são mantidos.
+        """
+        ids = self.channels.ids()
+        rng = self.rng['topology']
+        self.channels.column('prob_on_demand_epr_create')[ids] = rng.uniform_array(self.min_prob, self.max_prob, len(ids))
+        self.channels.column('prob_replay_epr_create')[ids] = rng.uniform_array(self.min_prob, self.max_prob, len(ids))
+        for name, (fixed_ids, values) in self._channel_overrides.items():
+            self.channels.column(name)[fixed_ids] = values
+        
+    def start_eprs(self, num_eprs=2):
+        """
+        Inicializa os pares EPRs nas arestas da rede. Os pares são criados de uma só vez e
+        distribuídos pelos canais na ordem das arestas.
+
+        Args:
+            num_eprs (int | tuple | np.ndarray): Número de pares EPR de cada canal, intervalo (mínimo, máximo)
+                sorteado para cada canal com o fluxo 'topology', ou vetor indexado pelo ID do canal.
+        """
+        edges = list(self.edges)
+        if isinstance(num_eprs, tuple):
+            low, high = num_eprs
+            counts = self.rng['topology'].integers_array(low, high + 1, len(edges))
+        elif isinstance(num_eprs, np.ndarray):
+            counts = num_eprs[np.fromiter((self.channels.id(u, v) for u, v in edges), dtype=np.int64, count=len(edges))]
+        else:
+            counts = np.full(len(edges), num_eprs, dtype=np.int64)
+        eprs = self.physical.create_epr_pairs(int(counts.sum()), increment_timeslot=False, increment_eprs=False)
+        bounds = np.concatenate([[0], np.cumsum(counts)]).tolist()
+        for index, edge in enumerate(edges):
+            self.channels.eprs(*edge).extend(eprs[bounds[index]:bounds[index + 1]])
+        self.logger.debug(f'{len(eprs)} pares EPR adicionados a {len(edges)} canais.')
         print("Pares EPRs adicionados")
         
     def timeslot(self):
@@ -515,6 +1102,34 @@ class Network():
         """
         self.qubit_timeslots[qubit_id] = {'timeslot': timeslot}
         
+    def qubit_creation_timeslot(self, qubit) -> int:
+        """
+        Timeslot em que um qubit foi criado. Qubits não registrados contam como criados agora.
+
+        Args:
+            qubit (Qubit): Qubit.
+
+        Returns:
+            int : Timeslot de criação.
+        """
+        return self.qubit_timeslots.get(qubit.qubit_id, {}).get('timeslot', self.timeslot_total)
+
+    def set_eviction_policy(self, eviction):
+        """
+        Define a política de descarte da memória de todos os hosts. Com uma política, cada memória
+        fica limitada ao memory_size do host e os excedentes são descartados; com None, as memórias
+        voltam a não ter limite, como por padrão.
+
+        Args:
+            eviction (str | callable | None): Nome em EVICTION_POLICIES ('fifo', 'lowest_fidelity', 'oldest'), função ou None.
+        """
+        for host in self._hosts.values():
+            if eviction is None:
+                host.memory.set_capacity(None)
+            else:
+                host.memory.set_eviction(eviction)
+                host.memory.set_capacity(host.memory_size)
+
     def display_all_qubit_timeslots(self):
         """
         Exibe o timeslot de todos os qubits criados nas diferentes camadas da rede.
@@ -622,14 +1237,49 @@ class Network():
     #0.0009875
     #0.00077 o melhor pra testes
     # 0.00057 A QUE ESTOU TESTANDO
-    def apply_decoherence_to_all_layers(self, decoherence_factor: float = 0.005):
+    def apply_decoherence_to_all_layers(self, decoherence_factor: float = None):
         """
         Aplica decoerência a todos os qubits e EPRs nas camadas da rede que já avançaram nos timeslots.
+
+        Args:
+            decoherence_factor (float, optional): Fator de decoerência. Se None, usa self.decoherence_factor.
+        """
+        if decoherence_factor is None:
+            decoherence_factor = self.decoherence_factor
+        if self._decoherence_scope is None:
+            hosts, edges = self.hosts, self.edges
+        else:
+            scope = self._decoherence_scope
+            hosts = [host_id for host_id in scope if host_id in self._hosts]
+            edges = self.induced_channels(scope)
+        self._apply_decoherence(decoherence_factor, hosts, edges)
+
+    def decohere(self, timeslots: int, nodes=None, hosts=None, edges=None):
         """
+        Aplica de uma só vez a decoerência de vários timeslots, sem avançar o relógio.
+
+        Args:
+            timeslots (int): Número de timeslots.
+            nodes (iterable, optional): Nós afetados: seus hosts e os canais entre eles. Por padrão, toda a rede.
+            hosts (iterable, optional): Hosts afetados, no lugar de nodes.
+            edges (iterable, optional): Canais afetados, no lugar de nodes.
+        """
+        factor = 1 - (1 - self.decoherence_factor) ** timeslots
+        if nodes is not None:
+            hosts = [host_id for host_id in nodes if host_id in self._hosts]
+            edges = self.induced_channels(nodes)
+        self._apply_decoherence(factor,
+                                self.hosts if hosts is None else hosts,
+                                self.edges if edges is None else edges)
+
+    def _apply_decoherence(self, decoherence_factor: float, hosts, edges):
         current_timeslot = self.get_timeslot()
 
         # Aplicar decoerência nos qubits de cada host
-        for host_id, host in self.hosts.items():
+        for host_id in hosts:
+            host = self._hosts[host_id]
+            if host.memory:
+                host.memory.touch()
             for qubit in host.memory:
                 creation_timeslot = self.qubit_timeslots[qubit.qubit_id]['timeslot']
                 if creation_timeslot < current_timeslot:
@@ -638,9 +1288,12 @@ class Network():
                     qubit.set_current_fidelity(new_fidelity)
 
         # Aplicar decoerência nos EPRs em todos os canais (arestas da rede)
-        for edge in self.edges:
-            if 'eprs' in self._graph.edges[edge]:
-                for epr in self._graph.edges[edge]['eprs']:
+        for edge in edges:
+            eprs = self.channels.get_eprs(*edge)
+            if eprs:
+                if isinstance(eprs, TrackedList):
+                    eprs.touch()
+                for epr in eprs:
                     current_fidelity = epr.get_current_fidelity()
                     new_fidelity = current_fidelity - (current_fidelity * decoherence_factor)
                     epr.set_fidelity(new_fidelity)
@@ -656,11 +1309,8 @@ class Network():
         Returns:
             bool: True se algum link está ocupado, False caso contrário.
         """
-        for neighbor in self._graph.neighbors(node):
-            edge_data = self._graph.get_edge_data(node, neighbor)
-            if 'busy_timeslots' in edge_data and timeslot in edge_data['busy_timeslots']:
-                return True  # Retorna True se qualquer link do nó estiver ocupado
-        return False
+        links = self.channels.keys_of(self.adjacency.incident_edges(node))
+        return not self.occupancy.is_route_free(links, timeslot)
     
     
     def reserve_link(self, node, timeslot):
@@ -671,15 +1321,17 @@ class Network():
             node (int): O nó atual sendo reservado.
             timeslot (int): O timeslot a ser reservado.
         """
-        for neighbor in self._graph.neighbors(node):
-            edge_data = self._graph.get_edge_data(node, neighbor)
-            if 'busy_timeslots' not in edge_data:
-                edge_data['busy_timeslots'] = set()
-            edge_data['busy_timeslots'].add(timeslot)
+        links = self.channels.keys_of(self.adjacency.incident_edges(node))
+        self.occupancy.reserve_route(links, timeslot)
     
     def restart_network(self):
         """
         Reinicia a rede, restaurando os EPRs e redefinindo qubits.
+
+        A primeira reinicialização parte do estado inicial da topologia, abastece os canais e hosts e
+        guarda o resultado em um snapshot. As seguintes restauram esse snapshot, copiando apenas os
+        canais e hosts modificados, então toda reinicialização deixa a rede no mesmo estado. O relógio
+        e os contadores das camadas não são reiniciados.
         """
         # Salva o estado original do log
         original_disabled_state = Logger.DISABLED
@@ -688,11 +1340,19 @@ class Network():
         Logger.DISABLED = True
 
         try:
-            # Reinicializar EPRs
-            self.start_eprs(num_eprs=10)  # Exemplo de reinício com 10 EPRs por canal
+            if self._restart_baseline is None:
+                if self._setup_snapshot is not None:
+                    self.restore(self._setup_snapshot, clock=False, counters=False)
+
+                # Reinicializar EPRs
+                self.start_eprs(num_eprs=10)  # Exemplo de reinício com 10 EPRs por canal
+
+                # Reinicializar qubits nos hosts
+                self.start_hosts(num_qubits=5)  # Exemplo de reinício com 5 qubits por host
 
-            # Reinicializar qubits nos hosts
-            self.start_hosts(num_qubits=5)  # Exemplo de reinício com 5 qubits por host
+                self._restart_baseline = self.snapshot()
+            else:
+                self.restore(self._restart_baseline, clock=False, counters=False)
         finally:
             # Restaura o estado original do log
             Logger.DISABLED = original_disabled_state
@@ -703,13 +1363,14 @@ class Network():
 
     # SIMULAÇÃO DA REDE
 
-    def generate_random_circuit(self, num_qubits=10, num_gates=30):
+    def generate_random_circuit(self, num_qubits=10, num_gates=30, display=True):
         """
         Gera um circuito quântico aleatório, armazena suas instruções e exibe o circuito.
         
         Args:
             num_qubits (int): Número de qubits no circuito.
             num_gates (int): Número de operações (portas) no circuito.
+            display (bool): Se False, o circuito não é impresso, desenhado nem registrado instrução por instrução.
 
         Returns:
             QuantumCircuit: O circuito quântico gerado.
@@ -722,19 +1383,20 @@ class Network():
         two_qubit_gates = ['cx', 'cz', 'swap']
 
         # Aplica operações aleatórias
+        rng = self.rng['workload']
         for _ in range(num_gates):
-            gate_type = random.choice(['single', 'two'])
+            gate_type = rng.choice(['single', 'two'])
 
             if gate_type == 'single':
-                gate = random.choice(single_qubit_gates)
-                qubit = random.randint(0, num_qubits - 1)
+                gate = rng.choice(single_qubit_gates)
+                qubit = rng.randint(0, num_qubits - 1)
                 getattr(qc, gate)(qubit)
             elif gate_type == 'two':
-                gate = random.choice(two_qubit_gates)
-                qubit1 = random.randint(0, num_qubits - 1)
-                qubit2 = random.randint(0, num_qubits - 1)
+                gate = rng.choice(two_qubit_gates)
+                qubit1 = rng.randint(0, num_qubits - 1)
+                qubit2 = rng.randint(0, num_qubits - 1)
                 while qubit1 == qubit2:
-                    qubit2 = random.randint(0, num_qubits - 1)
+                    qubit2 = rng.randint(0, num_qubits - 1)
 
                 if gate == 'cx':
                     qc.cx(qubit1, qubit2)
@@ -743,6 +1405,9 @@ class Network():
                 elif gate == 'swap':
                     qc.swap(qubit1, qubit2)
 
+        if not display:
+            return qc, num_qubits, qc.depth()
+
         # Exibe o circuito no console
         print(qc)
 
@@ -793,17 +1458,45 @@ class Network():
             scenario (int, opcional): Cenário para execução (1 ou 2).
 
         """
+        request = self.build_request(alice_id, bob_id, num_qubits, num_gates, protocols, slice_path, scenario)
+
+        # Adiciona a requisição à fila
+        self.requests_queue.append(request)
+        self.logger.log(f"Requisição adicionada: Alice {alice_id} -> Bob {bob_id} com protocolo {request['protocol']} e cenário {scenario}.")
+        return request
+
+    def build_request(self, alice_id, bob_id, num_qubits, num_gates=None, protocols=None, slice_path=None, scenario=None, circuit=None, display=True):
+        """
+        Monta uma requisição de teletransporte de qubits, sem adicioná-la à fila da rede.
+
+        Args:
+            alice_id (int): ID do cliente (Alice).
+            bob_id (int): ID do servidor (Bob).
+            num_qubits (int): Número de qubits a serem teletransportados.
+            num_gates (int, opcional): Número de portas do circuito aleatório. Ignorado se circuit for informado.
+            protocols (str | list, opcional): Protocolo. Se None ou vazio, é sorteado entre 'AC_BQC' e 'BFK_BQC'.
+            slice_path (list, opcional): Caminho do slice associado.
+            scenario (int, opcional): Cenário para execução (1 ou 2).
+            circuit (QuantumCircuit, opcional): Circuito da requisição. Se None, um circuito aleatório é gerado.
+            display (bool): Se False, o circuito aleatório não é exibido.
+
+        Returns:
+            dict : Requisição.
+        """
         # Se protocolos não forem especificados, escolhe aleatoriamente entre 'AC_BQC' e 'BFK_BQC'
         if protocols is None:
-            protocols = random.choice(['AC_BQC', 'BFK_BQC'])
+            protocols = self.rng['workload'].choice(['AC_BQC', 'BFK_BQC'])
         elif isinstance(protocols, list) and len(protocols) == 0:
-            protocols = random.choice(['AC_BQC', 'BFK_BQC'])  # Caso a lista esteja vazia, escolhe aleatoriamente
+            protocols = self.rng['workload'].choice(['AC_BQC', 'BFK_BQC'])  # Caso a lista esteja vazia, escolhe aleatoriamente
         
         # Gere um circuito quântico aleatório
-        quantum_circuit,_,circuit_depth = self.generate_random_circuit(num_qubits, num_gates)
+        if circuit is None:
+            quantum_circuit,_,circuit_depth = self.generate_random_circuit(num_qubits, num_gates, display)
+        else:
+            quantum_circuit, circuit_depth = circuit, circuit.depth()
         
         # Cria a requisição com os dados fornecidos
-        request = {
+        return {
             "alice_id": alice_id,
             "bob_id": bob_id,
             "num_qubits": num_qubits,
@@ -814,11 +1507,6 @@ class Network():
             "scenario": scenario  
         }
 
-        # Adiciona a requisição à fila
-        self.requests_queue.append(request)
-        self.logger.log(f"Requisição adicionada: Alice {alice_id} -> Bob {bob_id} com protocolo {protocols} e cenário {scenario}.")
-        return request
-
 
     def generate_request_slice(self, alice_id, bob_id, num_qubits, num_gates, protocol=None, slice_path=None,scenario=None):
         """
@@ -871,13 +1559,14 @@ class Network():
         else:
             raise AttributeError("O controlador fornecido não possui o método 'schedule_requests'.")
 
-    def execute_scheduled_requests(self, scheduled_requests, slice_paths=None):
+    def execute_scheduled_requests(self, scheduled_requests, slice_paths=None, concurrent=False):
         """
         Recebe e executa as requisições agendadas pelo controlador na rede.
         
         Args:
             scheduled_requests (dict): Dicionário de requisições agendadas por timeslot.
             slice_paths (dict, optional): Caminhos associados aos slices, se disponíveis.
+            concurrent (bool): Se True, as requisições de cada timeslot são executadas com execute_concurrent.
         """
         for timeslot, requests in scheduled_requests.items():
             # Reinicia a rede antes de processar o timeslot atual
@@ -892,6 +1581,14 @@ class Network():
 
             # Executa as requisições do timeslot
             self.logger.log(f"Executando requisições do timeslot {timeslot}.")
+            if self.provisioner is not None:
+                self.provisioner.provision(self)
+                self.provisioner.observe_requests(requests, self.request_route)
+            if concurrent:
+                for request, status in zip(requests, self.execute_concurrent(requests)):
+                    request['status'] = 'executado' if status else 'falhou'
+                    self.logger.log(f"Requisição {request} - Status: {request['status']}")
+                continue
             for request in requests:
                 # Adiciona status à requisição
                 status = self.execute_request(request, slice_paths)
@@ -915,6 +1612,9 @@ class Network():
         circuit_depth = request.get('circuit_depth', 0)
         scenario = request.get('scenario', 1)
 
+        if self.cutoff is not None:
+            # Os itens vencidos saem entre as requisições, nunca no meio de um protocolo
+            self.cutoff.expire()
         self.logger.log(f"Executando requisição: Alice {alice_id} -> Bob {bob_id}, Protocolo: {protocol}")
 
         # Verifica se a requisição já possui um slice_path
@@ -932,6 +1632,9 @@ class Network():
                 route = slice_path  # Já é uma lista
             else:
                 raise ValueError(f"Formato inválido para slice_path: {slice_path}")
+        elif request.get('route') and self.is_route_valid(request['route']):
+            # Rota fixada pelo controlador na admissão da requisição
+            route = request['route']
         else:
             # Se não há slice_path, calcula a rota automaticamente
             self.logger.log("Nenhum slice_path fornecido. Tentando calcular rota automaticamente.")
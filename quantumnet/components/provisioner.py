@@ -0,0 +1,171 @@
+import math
+from ..objects import Logger, LinkOccupancy
+
+class EprProvisioner():
+    """
+    Política de pré-provisionamento de pares EPR. A demanda de cada rota é acompanhada por uma
+    média móvel exponencial dos pares EPR consumidos por timeslot em cada canal, calculada a partir
+    das requisições executadas. Antes de cada timeslot, os canais das rotas quentes são abastecidos
+    até a demanda prevista, limitada pela memória dos hosts das pontas, e os pares com fidelidade
+    abaixo do corte são descartados. Assim, as requisições encontram os pares já criados.
+    """
+    def __init__(self, alpha: float = 0.3, hot_threshold: float = 1.0, lead_timeslots: int = 1, fidelity_cutoff: float = 0.9, fidelity_threshold: float = 0.85) -> None:
+        """
+        Args:
+            alpha (float): Peso do timeslot mais recente na média móvel.
+            hot_threshold (float): Demanda mínima, em pares por timeslot, para que a rota seja abastecida.
+            lead_timeslots (int): Número de timeslots de demanda mantidos em estoque.
+            fidelity_cutoff (float): Pares com fidelidade abaixo deste valor são descartados.
+            fidelity_threshold (float): Fidelidade mínima da rota exigida pela camada de transporte.
+        """
+        self.alpha = alpha
+        self.hot_threshold = hot_threshold
+        self.lead_timeslots = lead_timeslots
+        self.fidelity_cutoff = fidelity_cutoff
+        self.fidelity_threshold = fidelity_threshold
+        self.demand = {}  # Rota -> média móvel de pares EPR por canal por timeslot
+        self.provisioned_eprs = 0
+        self.retired_eprs = 0
+        self.logger = Logger.get_instance()
+
+    @staticmethod
+    def eprs_per_channel(request: dict) -> int:
+        """
+        Pares EPR que uma requisição consome em cada canal da rota: no AC_BQC os qubits vão e voltam.
+
+        Args:
+            request (dict): Requisição.
+
+        Returns:
+            int : Número de pares por canal.
+        """
+        factor = 2 if request.get('protocol') == 'AC_BQC' else 1
+        return factor * request.get('num_qubits', 1)
+
+    def observe(self, routes_demand: dict):
+        """
+        Atualiza a demanda das rotas com o consumo de um timeslot. Rotas sem consumo decaem.
+
+        Args:
+            routes_demand (dict): Rota (tupla de nós) -> pares EPR consumidos por canal no timeslot.
+        """
+        for route in set(self.demand) | set(routes_demand):
+            value = self.alpha * routes_demand.get(route, 0) + (1 - self.alpha) * self.demand.get(route, 0.0)
+            if value < 1e-3:
+                self.demand.pop(route, None)
+            else:
+                self.demand[route] = value
+
+    def observe_requests(self, requests: list, route_of):
+        """
+        Atualiza a demanda com as requisições executadas em um timeslot.
+
+        Args:
+            requests (list): Requisições do timeslot.
+            route_of (callable): Função que retorna a rota de uma requisição.
+        """
+        routes_demand = {}
+        for request in requests:
+            for member in request.get('batch', (request,)):
+                route = route_of(member)
+                if route:
+                    routes_demand[tuple(route)] = routes_demand.get(tuple(route), 0) + self.eprs_per_channel(member)
+        self.observe(routes_demand)
+
+    def hot_routes(self) -> dict:
+        """
+        Rotas cuja demanda atinge hot_threshold.
+
+        Returns:
+            dict : Rota -> demanda.
+        """
+        return {route: value for route, value in self.demand.items() if value >= self.hot_threshold}
+
+    def targets(self, network) -> dict:
+        """
+        Estoque desejado de cada canal das rotas quentes: a soma da demanda das rotas que passam
+        pelo canal durante lead_timeslots, limitada pela menor memória entre os hosts das pontas.
+
+        Args:
+            network (Network): Rede.
+
+        Returns:
+            dict : Canal -> número de pares.
+        """
+        demand = {}
+        for route, value in self.hot_routes().items():
+            for link in LinkOccupancy.route_links(route):
+                demand[link] = demand.get(link, 0.0) + value
+        targets = {}
+        for (u, v), value in demand.items():
+            capacity = min(network.hosts[u].memory_size, network.hosts[v].memory_size)
+            targets[(u, v)] = min(math.ceil(value * self.lead_timeslots), capacity)
+        return targets
+
+    def route_cutoff(self, network, route: list, exposure: int = 0) -> float:
+        """
+        Corte de fidelidade dos pares de uma rota que um protocolo vai usar por exposure timeslots:
+        o produto das fidelidades dos canais, depois da decoerência desse período, ainda deve atingir
+        fidelity_threshold. Nunca é menor que fidelity_cutoff.
+
+        Args:
+            network (Network): Rede.
+            route (list): Rota.
+            exposure (int): Timeslots em que os pares da rota serão usados.
+
+        Returns:
+            float : Fidelidade mínima de um par da rota; acima de 1, nenhum par do estoque serve.
+        """
+        hops = max(len(route) - 1, 1)
+        decay = (1 - network.decoherence_factor) ** (hops * exposure)
+        return max(self.fidelity_cutoff, (self.fidelity_threshold / decay) ** (1 / hops))
+
+    def retire(self, network, channels, cutoff: float = None):
+        """
+        Descarta os pares com fidelidade abaixo do corte.
+
+        Args:
+            network (Network): Rede.
+            channels (iterable): Canais a verificar.
+            cutoff (float, optional): Corte de fidelidade. Por padrão, fidelity_cutoff.
+
+        Returns:
+            int : Número de pares descartados.
+        """
+        cutoff = self.fidelity_cutoff if cutoff is None else cutoff
+        retired = 0
+        for u, v in channels:
+            eprs = network.channels.get_eprs(u, v)
+            if eprs is None:
+                continue
+            stale = [epr for epr in eprs if epr.get_current_fidelity() < cutoff]
+            for epr in stale:
+                network.physical.remove_epr_from_channel(epr, (u, v))
+            retired += len(stale)
+        self.retired_eprs += retired
+        return retired
+
+    def provision(self, network) -> int:
+        """
+        Abastece os canais das rotas quentes até o estoque desejado, depois de descartar os pares
+        vencidos. Os pares são criados sem avançar o relógio.
+
+        Args:
+            network (Network): Rede.
+
+        Returns:
+            int : Número de pares criados.
+        """
+        targets = self.targets(network)
+        self.retire(network, targets)
+        created = 0
+        for (u, v), target in targets.items():
+            missing = target - len(network.channels.get_eprs(u, v, ()))
+            for _ in range(max(missing, 0)):
+                epr = network.physical.create_epr_pair(fidelity=1.0, increment_timeslot=False)
+                network.physical.add_epr_to_channel(epr, (u, v))
+            created += max(missing, 0)
+        self.provisioned_eprs += created
+        if created:
+            self.logger.log(f"Timeslot {network.get_timeslot()}: {created} pares EPR pré-provisionados em {len(targets)} canais.")
+        return created
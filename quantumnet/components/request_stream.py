@@ -0,0 +1,135 @@
+import csv
+import json
+import os
+from qiskit import QuantumCircuit
+from ..objects import Logger
+
+REQUEST_FORMATS = ('jsonl', 'csv')
+
+
+class RequestStream():
+    """
+    Leitor de requisições a partir de um arquivo JSONL (um objeto por linha) ou CSV (com cabeçalho).
+    As requisições são montadas uma a uma, à medida que o fluxo é percorrido, com
+    Network.build_request: nem o arquivo nem os circuitos são carregados de uma só vez, e cada
+    circuito só existe enquanto a sua requisição está em uso. Um fluxo pode ser percorrido mais de
+    uma vez; cada passagem relê o arquivo.
+
+    Campos de cada registro:
+        alice_id, bob_id, num_qubits (obrigatórios);
+        num_gates (padrão: 3 * num_qubits), protocol, slice_path (lista de nós), scenario;
+        circuit (opcional): circuito em OpenQASM 2, usado no lugar do circuito aleatório.
+    Os demais campos (por exemplo duration ou arrival_timeslot) são copiados para a requisição.
+    """
+    REQUIRED = ('alice_id', 'bob_id', 'num_qubits')
+    INTEGER_FIELDS = ('alice_id', 'bob_id', 'num_qubits', 'num_gates', 'scenario', 'duration', 'arrival_timeslot', 'circuit_depth')
+
+    def __init__(self, path, network, format=None, protocol=None, scenario=1, limit=None) -> None:
+        """
+        Args:
+            path (str): Caminho do arquivo.
+            network (Network): Rede usada para montar as requisições.
+            format (str, optional): 'jsonl' ou 'csv'. Se None, é deduzido da extensão do arquivo.
+            protocol (str, optional): Protocolo das requisições que não informam o seu.
+            scenario (int): Cenário das requisições que não informam o seu.
+            limit (int, optional): Número máximo de requisições lidas.
+        """
+        if format is None:
+            extension = os.path.splitext(str(path))[1].lower().lstrip('.')
+            format = 'csv' if extension == 'csv' else 'jsonl'
+        if format not in REQUEST_FORMATS:
+            raise ValueError(f'Formato de requisições desconhecido: {format}. Opções: {list(REQUEST_FORMATS)}.')
+        self.path = path
+        self.network = network
+        self.format = format
+        self.protocol = protocol
+        self.scenario = scenario
+        self.limit = limit
+        self.logger = Logger.get_instance()
+
+    def __iter__(self):
+        count = 0
+        for line, record in self._records():
+            if self.limit is not None and count >= self.limit:
+                return
+            try:
+                request = self.build(record)
+            except (KeyError, TypeError, ValueError) as error:
+                raise self._invalid(line, error) from error
+            count += 1
+            yield request
+        self.logger.log(f"{count} requisições lidas de {self.path}.")
+
+    def _invalid(self, line, error) -> ValueError:
+        return ValueError(f'Requisição inválida em {self.path}, linha {line}: {error}')
+
+    def _records(self):
+        # Registros do arquivo, com o número da linha de origem; erros de leitura indicam o arquivo e a linha
+        with open(self.path, newline='' if self.format == 'csv' else None) as handle:
+            if self.format == 'jsonl':
+                for line, text in enumerate(handle, start=1):
+                    text = text.strip()
+                    if not text or text.startswith('#'):
+                        continue
+                    try:
+                        record = json.loads(text)
+                    except ValueError as error:
+                        raise self._invalid(line, error) from error
+                    yield line, record
+            else:
+                reader = csv.DictReader(handle)
+                while True:
+                    try:
+                        record = next(reader, None)
+                        if record is None:
+                            return
+                        record = self._parse_csv(record)
+                    except csv.Error as error:
+                        # O leitor só conta a linha depois de lê-la por inteiro
+                        raise self._invalid(reader.line_num + 1, error) from error
+                    except ValueError as error:
+                        raise self._invalid(reader.line_num, error) from error
+                    yield reader.line_num, record
+
+    def _parse_csv(self, record: dict) -> dict:
+        # Campos vazios são omitidos; slice_path vem como lista JSON
+        parsed = {}
+        for name, value in record.items():
+            if name is None or value is None or value.strip() == '':
+                continue
+            value = value.strip()
+            if name == 'slice_path':
+                value = json.loads(value)
+            elif name in self.INTEGER_FIELDS:
+                value = int(value)
+            parsed[name] = value
+        return parsed
+
+    def build(self, record: dict) -> dict:
+        """
+        Monta a requisição de um registro.
+
+        Args:
+            record (dict): Registro lido do arquivo.
+
+        Returns:
+            dict : Requisição, no formato de Network.generate_request.
+        """
+        missing = [name for name in self.REQUIRED if name not in record]
+        if missing:
+            raise KeyError(f'campos ausentes: {missing}')
+        extra = dict(record)
+        alice_id, bob_id, num_qubits = (int(extra.pop(name)) for name in self.REQUIRED)
+        num_gates = extra.pop('num_gates', None)
+        num_gates = 3 * num_qubits if num_gates is None else int(num_gates)
+        protocol = extra.pop('protocol', None) or self.protocol
+        circuit = extra.pop('circuit', None)
+        if circuit is not None:
+            circuit = QuantumCircuit.from_qasm_str(circuit)
+        request = self.network.build_request(alice_id, bob_id, num_qubits, num_gates,
+                                             protocols=protocol,
+                                             slice_path=extra.pop('slice_path', None),
+                                             scenario=extra.pop('scenario', None) or self.scenario,
+                                             circuit=circuit, display=False)
+        request.update(extra)
+        return request
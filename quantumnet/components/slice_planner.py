@@ -0,0 +1,117 @@
+import math
+from collections import Counter
+import networkx as nx
+
+SLICE_DISJOINTNESS = ('edge', 'node')
+
+
+def _flow_costs(graph, weight: str) -> dict:
+    # Custos inteiros para o network simplex: pesos inteiros são usados como estão e os
+    # fracionários são escalados, mantendo a ordem entre caminhos com folga de 1e-6
+    costs = {(u, v): data.get(weight, 1) for u, v, data in graph.edges(data=True)}
+    if any(cost < 0 for cost in costs.values()):
+        raise ValueError('Os pesos das arestas não podem ser negativos.')
+    if all(float(cost).is_integer() for cost in costs.values()):
+        return {edge: int(cost) for edge, cost in costs.items()}
+    return {edge: int(math.ceil(cost * 1_000_000)) for edge, cost in costs.items()}
+
+
+def _flow_network(graph, clients: Counter, server: int, disjoint: str, weight: str):
+    # Rede de fluxo com uma fonte artificial ligada a cada cliente. Sem restrição de nós, cada aresta
+    # vira dois arcos de capacidade 1; com ela, cada nó é dividido em entrada e saída ligadas por um
+    # arco de capacidade 1 (a multiplicidade, para clientes), e o destino é a entrada do servidor
+    source = ('fonte',)
+    flow = nx.DiGraph()
+    costs = _flow_costs(graph, weight)
+    if disjoint == 'edge':
+        sink = server
+        arcs = [(u, v) for u, v in costs] + [(v, u) for u, v in costs]
+        flow.add_edges_from((u, v, {'capacity': 1, 'weight': costs.get((u, v), costs.get((v, u)))}) for u, v in arcs)
+        flow.add_edges_from((source, client, {'capacity': count, 'weight': 0}) for client, count in clients.items())
+    else:
+        sink = ('in', server)
+        flow.add_edges_from((('in', node), ('out', node), {'capacity': clients.get(node, 1), 'weight': 0})
+                            for node in graph.nodes if node != server)
+        flow.add_edges_from((('out', u), ('in', v), {'capacity': 1, 'weight': cost}) for (u, v), cost in costs.items() if u != server)
+        flow.add_edges_from((('out', v), ('in', u), {'capacity': 1, 'weight': cost}) for (u, v), cost in costs.items() if v != server)
+        flow.add_edges_from((source, ('in', client), {'capacity': count, 'weight': 0}) for client, count in clients.items())
+    return flow, source, sink
+
+
+def _cancel_opposite(flow_dict: dict):
+    # Fluxos em sentidos opostos na mesma aresta (possíveis com peso 0) se anulam
+    for u, targets in flow_dict.items():
+        for v, amount in targets.items():
+            back = flow_dict.get(v, {}).get(u, 0)
+            if amount > 0 and back > 0:
+                cancel = min(amount, back)
+                targets[v] -= cancel
+                flow_dict[v][u] -= cancel
+
+
+def _walk(flow_dict: dict, start, sink) -> list:
+    # Segue um caminho com fluxo positivo de start até sink, consumindo uma unidade de cada arco;
+    # ciclos de custo 0 encontrados no caminho são descartados
+    path, seen = [start], {start: 0}
+    node = start
+    while node != sink:
+        node = next(target for target, amount in flow_dict[node].items() if amount > 0)
+        flow_dict[path[-1]][node] -= 1
+        if node in seen:
+            del path[seen[node] + 1:]
+            seen = {item: index for index, item in enumerate(path)}
+            continue
+        seen[node] = len(path)
+        path.append(node)
+    return path
+
+
+def plan_slice_paths(graph, clients, server: int, disjoint: str = 'edge', weight: str = 'weight') -> list:
+    """
+    Calcula, em uma única resolução de fluxo de custo mínimo, um caminho de cada cliente até o
+    servidor sem arestas (disjoint='edge') ou sem nós intermediários (disjoint='node') em comum,
+    com a menor soma de pesos entre as escolhas que atendem o maior número de clientes. O grafo não
+    é alterado.
+
+    Args:
+        graph (nx.Graph): Topologia.
+        clients (list): IDs dos nós clientes, um slice por entrada.
+        server (int): ID do nó servidor.
+        disjoint (str): 'edge' ou 'node'.
+        weight (str): Atributo das arestas usado como custo (padrão 1).
+
+    Returns:
+        list : Caminho de cada cliente, na ordem de clients, do cliente ao servidor; None para os
+            clientes que não puderam receber um caminho disjunto dos demais.
+    """
+    if disjoint not in SLICE_DISJOINTNESS:
+        raise ValueError(f'Disjunção desconhecida: {disjoint}. Opções: {list(SLICE_DISJOINTNESS)}.')
+    for node in list(clients) + [server]:
+        if node not in graph:
+            raise nx.NodeNotFound(f'Nó {node} não está no grafo.')
+
+    routed = Counter(client for client in clients if client != server)
+    if not routed:
+        return [[server] for _ in clients]
+    flow, source, sink = _flow_network(graph, routed, server, disjoint, weight)
+    if sink not in flow:
+        return [None if client != server else [server] for client in clients]
+    flow_dict = nx.max_flow_min_cost(flow, source, sink)
+    if disjoint == 'edge':
+        _cancel_opposite(flow_dict)
+
+    paths = []
+    for client in clients:
+        if client == server:
+            paths.append([server])
+            continue
+        first = client if disjoint == 'edge' else ('in', client)
+        if flow_dict[source].get(first, 0) <= 0:
+            paths.append(None)
+            continue
+        flow_dict[source][first] -= 1
+        path = _walk(flow_dict, first, sink)
+        if disjoint == 'node':
+            path = [node for side, node in path if side == 'in']
+        paths.append(path)
+    return paths
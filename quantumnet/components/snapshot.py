@@ -0,0 +1,150 @@
+import copy
+from ..objects import TrackedList, ChannelTable
+
+# Contadores e listas de cada camada que fazem parte do estado da simulação
+LAYER_STATE = {
+    '_physical': ('_count_qubit', '_count_epr', 'used_eprs', 'used_qubits', '_qubits', '_failed_eprs', 'created_eprs'),
+    '_link': ('used_eprs', 'used_qubits', '_requests', '_failed_requests', 'created_eprs'),
+    '_network': ('avg_size_routes', 'used_eprs', 'used_qubits', 'routes_used'),
+    '_transport': ('used_eprs', 'used_qubits', 'transmitted_qubits', 'created_eprs'),
+    '_application': ('used_eprs', 'used_qubits', 'route_fidelities', 'qkd_metrics'),
+}
+# Estado que Network.execute_concurrent incorpora de cada cópia (Network._merge_fork): contadores
+# inteiros somam a diferença, listas recebem os itens acrescentados e dicionários, as entradas
+# alteradas. O tamanho médio das rotas é recalculado a partir de routes_used
+MERGE_STATE = {
+    'network': ('count_qubit', 'requests_queue', 'qubit_timeslots'),
+    '_physical': ('_count_qubit', '_count_epr', 'used_eprs', 'used_qubits', '_qubits', '_failed_eprs', 'created_eprs'),
+    '_link': ('used_eprs', 'used_qubits', '_requests', '_failed_requests', 'created_eprs'),
+    '_network': ('used_eprs', 'used_qubits', 'routes_used'),
+    '_transport': ('used_eprs', 'used_qubits', 'transmitted_qubits', 'created_eprs'),
+    '_application': ('used_eprs', 'used_qubits', 'route_fidelities', 'qkd_metrics'),
+}
+NETWORK_STATE = ('count_qubit', 'decoherence_factor', 'requests_queue', 'qubit_timeslots')
+# Atributos dos canais guardados no grafo, além das colunas da tabela de canais
+CHANNEL_ATTRIBUTES = ('weight',)
+
+
+def channel_key(u, v) -> tuple:
+    """
+    Chave canônica de um canal, independente da orientação da aresta.
+
+    Args:
+        u (int): Nó de uma ponta.
+        v (int): Nó da outra ponta.
+
+    Returns:
+        tuple : Aresta (menor nó, maior nó).
+    """
+    return (u, v) if u <= v else (v, u)
+
+
+def _copy_value(value):
+    if isinstance(value, (list, dict, set)):
+        return copy.copy(value)
+    return value
+
+
+def _clone(item):
+    # Cópia rasa de um par EPR ou qubit, equivalente a copy.copy sem o protocolo de redução
+    clone = object.__new__(type(item))
+    clone.__dict__.update(item.__dict__)
+    return clone
+
+
+def _restore_value(obj, name: str, value):
+    # Listas e dicionários são atualizados no lugar, pois podem estar referenciados em outros objetos
+    current = getattr(obj, name, None)
+    if isinstance(value, list) and isinstance(current, list):
+        current[:] = value
+    elif isinstance(value, dict) and isinstance(current, dict):
+        current.clear()
+        current.update(value)
+    else:
+        setattr(obj, name, _copy_value(value))
+
+
+class NetworkSnapshot():
+    """
+    Estado de uma rede em um instante: pares EPR e atributos dos canais, memória dos hosts,
+    contadores das camadas, relógio e reservas dos enlaces. Os objetos guardados são cópias privadas, então o snapshot
+    não é afetado pela simulação e pode ser restaurado quantas vezes for necessário.
+    """
+    def __init__(self, network) -> None:
+        """
+        Args:
+            network (Network): Rede a ser capturada.
+        """
+        graph = network.graph
+        table = network.channels
+        self.clock = network.timeslot_total
+        self.occupancy = network.occupancy.copy()
+        self.channels = {}
+        # As colunas são lidas de uma vez, na ordem dos IDs, que é a mesma de table.items()
+        ids = table.ids()
+        columns = [(name, table.column(name)[ids].tolist()) for name in ChannelTable.COLUMNS]
+        for index, (key, store) in enumerate(table.items()):
+            data = graph.edges[key]
+            attributes = {name: _copy_value(data[name]) for name in CHANNEL_ATTRIBUTES if name in data}
+            attributes.update((name, values[index]) for name, values in columns)
+            self.channels[key] = ([_clone(epr) for epr in store], attributes)
+        self.hosts = {host_id: [_clone(qubit) for qubit in host.memory] for host_id, host in network.hosts.items()}
+        self.network_state = {name: _copy_value(getattr(network, name)) for name in NETWORK_STATE}
+        self.layer_state = {
+            layer: {name: _copy_value(getattr(getattr(network, layer), name)) for name in names}
+            for layer, names in LAYER_STATE.items()
+        }
+
+    def restore_channel(self, network, key):
+        """
+        Restaura um canal. Canais criados depois do snapshot, como os virtuais do entanglement swapping, são removidos.
+
+        Args:
+            network (Network): Rede a ser restaurada.
+            key (tuple): Aresta do canal.
+        """
+        if key not in self.channels:
+            network.remove_channel(*key)
+            return
+        eprs, attributes = self.channels[key]
+        store = network.channels.get_eprs(*key)
+        if not isinstance(store, TrackedList):
+            store = network.create_channel(*key)
+        store.replace(_clone(epr) for epr in eprs)
+        data = network.graph.edges[key]
+        for name, value in attributes.items():
+            if name in ChannelTable.COLUMNS:
+                network.channels.set(*key, name, value)
+            else:
+                data[name] = _copy_value(value)
+
+    def restore_host(self, network, host_id: int, register_timeslot: int = None):
+        """
+        Restaura a memória de um host.
+
+        Args:
+            network (Network): Rede a ser restaurada.
+            host_id (int): ID do host.
+            register_timeslot (int, optional): Se informado, os qubits restaurados são registrados como criados neste timeslot.
+        """
+        qubits = [_clone(qubit) for qubit in self.hosts.get(host_id, ())]
+        for qubit in qubits:
+            qubit._rng = network.rng['qubits']  # O qubit restaurado pertence à rede de destino
+        network.hosts[host_id].memory.replace(qubits)
+        if register_timeslot is not None:
+            for qubit in qubits:
+                network.register_qubit_creation(qubit.qubit_id, register_timeslot)
+
+    def restore_counters(self, network):
+        """
+        Restaura os contadores e listas das camadas e da rede.
+
+        Args:
+            network (Network): Rede a ser restaurada.
+        """
+        for name, value in self.network_state.items():
+            _restore_value(network, name, value)
+        for layer, state in self.layer_state.items():
+            layer_obj = getattr(network, layer)
+            for name, value in state.items():
+                _restore_value(layer_obj, name, value)
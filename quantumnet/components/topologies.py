@@ -0,0 +1,305 @@
+import inspect
+import math
+import networkx as nx
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+
+def _integer_graph(graph, positions=None) -> nx.Graph:
+    # Rótulos inteiros 0..n-1, na ordem dos nós do grafo original; positions, se dado, leva cada
+    # nó original à sua posição no desenho, guardada no atributo 'pos'
+    if positions is not None:
+        nx.set_node_attributes(graph, {node: positions(node) for node in graph.nodes}, 'pos')
+    return nx.convert_node_labels_to_integers(graph)
+
+
+def _grid_position(node) -> tuple:
+    row, col = node
+    return (float(col), -float(row))
+
+
+def _from_edges(num_nodes: int, edges: np.ndarray, positions: np.ndarray = None) -> nx.Graph:
+    # Monta o grafo de uma só vez a partir de um vetor (m, 2) de arestas
+    graph = nx.Graph()
+    if positions is None:
+        graph.add_nodes_from(range(num_nodes))
+    else:
+        graph.add_nodes_from((node, {'pos': (float(x), float(y))}) for node, (x, y) in enumerate(positions))
+    graph.add_edges_from(edges.tolist())
+    return graph
+
+
+def _connect_components(graph: nx.Graph) -> nx.Graph:
+    """
+    Liga as componentes conexas em cadeia, pelo menor nó de cada uma, para que toda requisição tenha rota.
+    """
+    components = sorted(min(component) for component in nx.connected_components(graph))
+    graph.add_edges_from(zip(components[:-1], components[1:]))
+    return graph
+
+
+def grid(rows: int, cols: int, rng=None) -> nx.Graph:
+    """
+    Grade rows x cols, com a posição de cada nó na grade no atributo 'pos'.
+    """
+    return _integer_graph(nx.grid_2d_graph(rows, cols), _grid_position)
+
+
+def line(num_nodes: int, rng=None) -> nx.Graph:
+    """
+    Linha com num_nodes nós, dispostos na horizontal.
+    """
+    return _integer_graph(nx.path_graph(num_nodes), lambda node: (float(node), 0.0))
+
+
+def ring(num_nodes: int, rng=None) -> nx.Graph:
+    """
+    Anel com num_nodes nós, dispostos em um círculo.
+    """
+    step = 2 * math.pi / max(num_nodes, 1)
+    return _integer_graph(nx.cycle_graph(num_nodes), lambda node: (math.cos(node * step), math.sin(node * step)))
+
+
+def torus(rows: int, cols: int, rng=None) -> nx.Graph:
+    """
+    Grade rows x cols com as bordas ligadas, em que todo nó tem grau 4. As posições são as da grade.
+    """
+    return _integer_graph(nx.grid_2d_graph(rows, cols, periodic=True), _grid_position)
+
+
+def random_geometric(num_nodes: int, radius: float = None, rng=None) -> nx.Graph:
+    """
+    Grafo geométrico aleatório: nós uniformes no quadrado unitário, ligados quando a distância é
+    menor que radius. Os pares vizinhos vêm de uma KD-tree, sem comparar todos os pares.
+
+    Args:
+        num_nodes (int): Número de nós.
+        radius (float, optional): Alcance dos enlaces. Por padrão, 1,5 vez o limiar de conectividade, sqrt(ln n / (pi n)).
+        rng (np.random.Generator, optional): Gerador das posições.
+
+    Returns:
+        nx.Graph : Grafo conexo, com a posição de cada nó no atributo 'pos'.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    if radius is None:
+        radius = 1.5 * math.sqrt(math.log(max(num_nodes, 2)) / (math.pi * max(num_nodes, 2)))
+    positions = rng.random((num_nodes, 2))
+    edges = cKDTree(positions).query_pairs(radius, output_type='ndarray')
+    return _connect_components(_from_edges(num_nodes, edges, positions))
+
+
+def waxman(num_nodes: int, beta: float = 0.4, alpha: float = 0.1, rng=None) -> nx.Graph:
+    """
+    Grafo de Waxman: nós uniformes no quadrado unitário, e cada par ligado com probabilidade
+    beta * exp(-d / (alpha * L)), com L a diagonal do quadrado. Os pares são sorteados em blocos de
+    linhas vetorizados, sem laço por par.
+
+    Args:
+        num_nodes (int): Número de nós.
+        beta (float): Densidade de enlaces.
+        alpha (float): Fração de enlaces longos em relação aos curtos.
+        rng (np.random.Generator, optional): Gerador das posições e dos enlaces.
+
+    Returns:
+        nx.Graph : Grafo conexo, com a posição de cada nó no atributo 'pos'.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    positions = rng.random((num_nodes, 2))
+    x, y = positions.astype(np.float32).T
+    scale = np.float32(alpha * math.sqrt(2))
+    block = max(1, 2 ** 23 // max(num_nodes, 1))  # Cerca de 8 milhões de pares por bloco
+    edges = []
+    for start in range(0, num_nodes, block):
+        stop = min(start + block, num_nodes)
+        # Só as colunas à direita do bloco: cada par é sorteado uma vez, sem laços
+        distances = np.hypot(x[start:stop, None] - x[None, start:], y[start:stop, None] - y[None, start:])
+        linked = rng.random(distances.shape, dtype=np.float32) < np.float32(beta) * np.exp(-distances / scale)
+        linked &= np.arange(start, num_nodes)[None, :] > np.arange(start, stop)[:, None]
+        sources, targets = np.nonzero(linked)
+        edges.append(np.column_stack([sources + start, targets + start]))
+    edges = np.concatenate(edges) if edges else np.empty((0, 2), dtype=np.int64)
+    return _connect_components(_from_edges(num_nodes, edges, positions))
+
+
+def barabasi_albert(num_nodes: int, m: int = 2, rng=None) -> nx.Graph:
+    """
+    Grafo de Barabási–Albert, livre de escala: cada nó novo se liga a m nós existentes, com
+    probabilidade proporcional ao grau.
+
+    Args:
+        num_nodes (int): Número de nós.
+        m (int): Enlaces de cada nó novo.
+        rng (np.random.Generator, optional): Gerador dos enlaces.
+
+    Returns:
+        nx.Graph : Grafo conexo.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    return nx.barabasi_albert_graph(num_nodes, m, seed=int(rng.integers(2 ** 32)))
+
+
+def fat_tree(k: int = 4, rng=None) -> nx.Graph:
+    """
+    Fat-tree k-ária de data center: (k/2)^2 núcleos, k pods com k/2 switches de agregação e k/2 de
+    borda, e k/2 hosts finais por switch de borda. Os IDs seguem essa ordem: núcleos, agregação,
+    borda e hosts finais.
+
+    Args:
+        k (int): Aridade, par.
+
+    Returns:
+        nx.Graph : Grafo com 5k^2/4 + k^3/4 nós, com cada camada em uma altura no atributo 'pos'.
+    """
+    if k < 2 or k % 2:
+        raise ValueError('A aridade da fat-tree deve ser um número par maior ou igual a 2.')
+    half = k // 2
+    num_core, num_pod = half * half, k * half
+    core = np.arange(num_core)
+    aggregation = num_core + np.arange(num_pod).reshape(k, half)  # [pod, switch]
+    edge = num_core + num_pod + np.arange(num_pod).reshape(k, half)
+    hosts = num_core + 2 * num_pod + np.arange(num_pod * half).reshape(k, half, half)  # [pod, switch, host]
+    # Núcleo i liga ao switch de agregação i // (k/2) de cada pod
+    core_links = np.column_stack([np.repeat(core, k), aggregation[:, core // half].T.ravel()])
+    # Agregação e borda de um pod formam um bipartido completo
+    pod_links = np.column_stack([np.repeat(aggregation, half, axis=1).ravel(), np.tile(edge, (1, half)).ravel()])
+    host_links = np.column_stack([np.repeat(edge.ravel(), half), hosts.ravel()])
+    edges = np.concatenate([core_links, pod_links, host_links])
+    # Camadas de cima para baixo, cada uma centrada na largura da camada de hosts
+    layers = [core.ravel(), aggregation.ravel(), edge.ravel(), hosts.ravel()]
+    width = len(layers[-1])
+    positions = np.concatenate([np.column_stack([(np.arange(len(layer)) + 0.5) * width / len(layer), np.full(len(layer), 3.0 - depth)])
+                                for depth, layer in enumerate(layers)])
+    return _from_edges(num_core + 2 * num_pod + num_pod * half, edges, positions)
+
+
+TOPOLOGIES = {
+    'grade': grid,
+    'linha': line,
+    'anel': ring,
+    'toro': torus,
+    'geometrica': random_geometric,
+    'waxman': waxman,
+    'barabasi_albert': barabasi_albert,
+    'fat_tree': fat_tree,
+}
+
+TOPOLOGY_ALIASES = {
+    'grid': 'grade',
+    'line': 'linha',
+    'ring': 'anel',
+    'torus': 'toro',
+    'random_geometric': 'geometrica',
+    'barabasi': 'barabasi_albert',
+    'fattree': 'fat_tree',
+}
+
+
+def build_topology(name: str, *args, rng=None, **params) -> nx.Graph:
+    """
+    Constrói o grafo de uma topologia pelo nome, com nós inteiros 0..n-1 e peso 1 em todas as arestas.
+
+    Args:
+        name (str): Nome em TOPOLOGIES ('grade', 'linha', 'anel', 'toro', 'geometrica', 'waxman',
+            'barabasi_albert', 'fat_tree') ou um apelido em TOPOLOGY_ALIASES.
+        *args: Dimensões da topologia, como (linhas, colunas) ou (número de nós,).
+        rng (np.random.Generator, optional): Gerador das topologias aleatórias.
+        **params: Parâmetros da topologia, como radius, alpha, beta ou m.
+
+    Returns:
+        nx.Graph : Grafo.
+    """
+    key = name.lower()
+    key = TOPOLOGY_ALIASES.get(key, key)
+    if key not in TOPOLOGIES:
+        raise ValueError(f"Topologia '{name}' não suportada. Opções: {list(TOPOLOGIES)}.")
+    builder = TOPOLOGIES[key]
+    try:
+        inspect.signature(builder).bind(*args, rng=rng, **params)
+    except TypeError as error:
+        raise ValueError(f"Argumentos inválidos para a topologia '{name}': {args} {params}. Assinatura: {key}{inspect.signature(builder)}.") from error
+    graph = builder(*args, rng=rng, **params)
+    nx.set_edge_attributes(graph, 1, 'weight')
+    return graph
+
+
+# Atributos por aresta aceitos nos arquivos de topologia, além do peso
+EDGE_FIELDS = ('prob_on_demand_epr_create', 'prob_replay_epr_create', 'eprs')
+TOPOLOGY_FORMATS = ('edgelist', 'csv', 'graphml')
+
+
+def topology_format(path: str, format: str = None) -> str:
+    """
+    Formato de um arquivo de topologia: o informado, ou deduzido da extensão (.graphml, .csv; as
+    demais são listas de arestas separadas por espaços).
+    """
+    if format is None:
+        extension = str(path).lower().rsplit('.', 1)[-1]
+        format = {'graphml': 'graphml', 'csv': 'csv'}.get(extension, 'edgelist')
+    if format not in TOPOLOGY_FORMATS:
+        raise ValueError(f"Formato de topologia '{format}' não suportado. Opções: {list(TOPOLOGY_FORMATS)}.")
+    return format
+
+
+def _read_edge_table(path: str, separator: str) -> pd.DataFrame:
+    # Lê a tabela de arestas com o leitor em C do pandas. Sem cabeçalho, as colunas são posicionais:
+    # u, v e, opcionalmente, os campos de EDGE_FIELDS nessa ordem
+    with open(path) as file:
+        first = next((line for line in file if line.strip() and not line.lstrip().startswith('#')), '')
+    tokens = first.replace(',', ' ').split() if separator == ',' else first.split()
+    has_header = bool(tokens) and not tokens[0].lstrip('-').isdigit()
+    if has_header:
+        table = pd.read_csv(path, sep=separator, comment='#', skipinitialspace=True)
+        table = table.rename(columns={'source': 'u', 'target': 'v'})
+        if 'u' not in table or 'v' not in table:
+            raise ValueError(f'O cabeçalho de {path} deve ter as colunas u e v (ou source e target).')
+    else:
+        table = pd.read_csv(path, sep=separator, comment='#', header=None, skipinitialspace=True)
+        columns = ('u', 'v') + EDGE_FIELDS
+        if table.shape[1] > len(columns):
+            raise ValueError(f'{path} tem {table.shape[1]} colunas; sem cabeçalho, o máximo é {len(columns)}: {columns}.')
+        table.columns = columns[:table.shape[1]]
+    return table
+
+
+def read_topology(path: str, format: str = None) -> nx.Graph:
+    """
+    Lê uma topologia de arquivo. Listas de arestas (texto separado por espaços ou CSV) têm uma aresta
+    por linha, u e v, seguidas opcionalmente de prob_on_demand_epr_create, prob_replay_epr_create e
+    eprs (estoque inicial de pares), posicionais ou nomeadas por um cabeçalho; linhas iniciadas por #
+    são ignoradas. Em GraphML, esses campos são atributos das arestas. Nós que não são inteiros são
+    renumerados a partir de 0, com o rótulo original no atributo 'label'.
+
+    Args:
+        path (str): Caminho do arquivo.
+        format (str, optional): 'edgelist', 'csv' ou 'graphml'. Por padrão, deduzido da extensão.
+
+    Returns:
+        nx.Graph : Grafo com peso em todas as arestas (1, se o arquivo não informar) e os campos de EDGE_FIELDS presentes no arquivo.
+    """
+    format = topology_format(path, format)
+    if format == 'graphml':
+        graph = nx.Graph(nx.read_graphml(path))
+        try:
+            graph = nx.relabel_nodes(graph, {node: int(node) for node in graph.nodes})
+        except ValueError:
+            graph = nx.convert_node_labels_to_integers(graph, label_attribute='label')
+    else:
+        table = _read_edge_table(path, ',' if format == 'csv' else r'\s+')
+        sources, targets = table['u'].to_numpy(), table['v'].to_numpy()
+        graph = nx.Graph()
+        if np.issubdtype(sources.dtype, np.integer) and np.issubdtype(targets.dtype, np.integer):
+            graph.add_edges_from(zip(sources.tolist(), targets.tolist()))
+        else:
+            codes, labels = pd.factorize(np.concatenate([sources.astype(str), targets.astype(str)]))
+            graph.add_nodes_from((node, {'label': label}) for node, label in enumerate(labels))
+            sources, targets = codes[:len(sources)], codes[len(sources):]
+            graph.add_edges_from(zip(sources.tolist(), targets.tolist()))
+        for name in EDGE_FIELDS + ('weight',):
+            if name in table:
+                values = table[name].to_numpy()
+                present = ~pd.isna(values)
+                nx.set_edge_attributes(graph, dict(zip(zip(sources[present].tolist(), targets[present].tolist()), values[present].tolist())), name)
+    for _, _, data in graph.edges(data=True):
+        data.setdefault('weight', 1)
+    return graph
@@ -0,0 +1,256 @@
+import atexit
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import networkx as nx
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+try:
+    import rustworkx as rx
+except ImportError:  # Opcional; sem ele, todos os layouts vêm do networkx
+    rx = None
+
+# Layouts calculados, por impressão digital da topologia; os mais antigos são descartados
+_layouts = OrderedDict()
+_layouts_lock = threading.Lock()
+LAYOUT_CACHE_SIZE = 16
+# Acima deste número de nós, os rótulos são omitidos por padrão
+MAX_LABELED_NODES = 200
+# A partir deste número de nós, o spring layout nativo do rustworkx é usado, se instalado
+NATIVE_LAYOUT_THRESHOLD = 512
+
+
+def topology_fingerprint(graph) -> tuple:
+    """
+    Impressão digital da topologia: muda se algum nó ou aresta muda, mas não com os atributos.
+
+    Returns:
+        tuple : (número de nós, número de arestas, hash dos nós e das arestas).
+    """
+    nodes = np.array(sorted(graph.nodes), dtype=np.int64)
+    edges = np.array([(u, v) if u <= v else (v, u) for u, v in graph.edges], dtype=np.int64).reshape(-1, 2)
+    edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+    return (len(nodes), len(edges), hash((nodes.tobytes(), edges.tobytes())))
+
+
+def known_layout(graph, seed: int = 42):
+    """
+    Posições dos nós já conhecidas, sem calcular nada: o atributo 'pos' de todos os nós, como nas
+    topologias de build_topology com geometria conhecida (grade, toro, linha, anel, fat-tree,
+    geométrica e Waxman), ou um layout guardado para a mesma topologia.
+
+    Returns:
+        dict | None : Nó -> (x, y), ou None se o layout ainda precisa ser calculado.
+    """
+    positions = nx.get_node_attributes(graph, 'pos')
+    if len(positions) == graph.number_of_nodes():
+        return positions
+    key = (topology_fingerprint(graph), seed)
+    with _layouts_lock:
+        if key in _layouts:
+            _layouts.move_to_end(key)
+            return _layouts[key]
+    return None
+
+
+def _spring_layout(graph, seed: int) -> dict:
+    if rx is not None and graph.number_of_nodes() >= NATIVE_LAYOUT_THRESHOLD:
+        nodes = list(graph.nodes)
+        index = {node: position for position, node in enumerate(nodes)}
+        mirror = rx.PyGraph(multigraph=False)
+        mirror.add_nodes_from(nodes)
+        mirror.add_edges_from_no_data([(index[u], index[v]) for u, v in graph.edges])
+        layout = rx.spring_layout(mirror, seed=seed)
+        return {nodes[position]: (float(x), float(y)) for position, (x, y) in layout.items()}
+    return {node: (float(x), float(y)) for node, (x, y) in nx.spring_layout(graph, seed=seed).items()}
+
+
+def graph_layout(graph, seed: int = 42) -> dict:
+    """
+    Posições dos nós para desenho: as de known_layout, se houver. Caso contrário, o spring layout
+    (nativo, do rustworkx, nos grafos grandes) é calculado uma única vez por topologia e
+    reaproveitado nas chamadas seguintes.
+
+    Args:
+        graph (nx.Graph): Topologia.
+        seed (int): Semente do spring layout.
+
+    Returns:
+        dict : Nó -> (x, y).
+    """
+    layout = known_layout(graph, seed)
+    if layout is not None:
+        return layout
+    key = (topology_fingerprint(graph), seed)
+    layout = _spring_layout(graph, seed)
+    with _layouts_lock:
+        _layouts[key] = layout
+        while len(_layouts) > LAYOUT_CACHE_SIZE:
+            _layouts.popitem(last=False)
+    return layout
+
+
+def clear_layout_cache():
+    """
+    Descarta os layouts guardados.
+    """
+    with _layouts_lock:
+        _layouts.clear()
+
+
+def prepare_scene(graph, node_colors=None, highlights=(), markers=(), title=None, with_labels=None, seed: int = 42) -> dict:
+    """
+    Extrai do grafo tudo o que o desenho precisa, em estruturas independentes da rede. A cena pode
+    ser desenhada em outra thread enquanto a simulação continua alterando a rede; se o layout da
+    topologia ainda não é conhecido, a cena leva uma cópia da topologia e ele é calculado por
+    resolve_scene, na hora do desenho.
+
+    Args:
+        graph (nx.Graph): Topologia.
+        node_colors (dict, optional): Nó -> cor. Nós ausentes ficam em cinza claro.
+        highlights (list): Tuplas (caminho, cor, legenda) desenhadas sobre as arestas.
+        markers (list): Tuplas (nós, cor, legenda) desenhadas sobre os nós.
+        title (str, optional): Título da figura.
+        with_labels (bool, optional): Se os IDs dos nós são escritos. Por padrão, só até MAX_LABELED_NODES nós.
+        seed (int): Semente do layout, quando calculado.
+
+    Returns:
+        dict : Cena.
+    """
+    nodes = list(graph.nodes)
+    index = {node: position for position, node in enumerate(nodes)}
+    layout = known_layout(graph, seed)
+    node_colors = node_colors or {}
+    if with_labels is None:
+        with_labels = len(nodes) <= MAX_LABELED_NODES
+    return {
+        'nodes': nodes,
+        'edges': np.array([(index[u], index[v]) for u, v in graph.edges], dtype=np.int64).reshape(-1, 2),
+        'layout': layout,
+        'topology': None if layout is not None else _topology_copy(graph),
+        'seed': seed,
+        'labels': [str(node) for node in nodes] if with_labels else None,
+        'colors': [node_colors.get(node, 'lightgray') for node in nodes],
+        'highlights': [([index[node] for node in path], color, label) for path, color, label in highlights if path],
+        'markers': [([index[node] for node in group], color, label) for group, color, label in markers if len(group)],
+        'title': title,
+    }
+
+
+def _topology_copy(graph) -> nx.Graph:
+    # Só os nós e as arestas, na mesma ordem, para calcular o layout fora da thread da simulação
+    copy = nx.Graph()
+    copy.add_nodes_from(graph.nodes)
+    copy.add_edges_from(graph.edges)
+    return copy
+
+
+def resolve_scene(scene: dict) -> np.ndarray:
+    """
+    Posições dos nós de uma cena, calculando e guardando o layout se preciso.
+
+    Returns:
+        np.ndarray : Vetor (n, 2), na ordem de scene['nodes'].
+    """
+    layout = scene['layout']
+    if layout is None:
+        layout = scene['layout'] = graph_layout(scene['topology'], scene['seed'])
+        scene['topology'] = None
+    return np.array([layout[node] for node in scene['nodes']], dtype=float).reshape(-1, 2)
+
+
+def paint_scene(ax, scene: dict):
+    """
+    Desenha uma cena em um eixo do matplotlib, com coleções de linhas e pontos: o custo cresce com
+    o número de arestas, sem um artista por aresta.
+
+    Args:
+        ax (matplotlib.axes.Axes): Eixo.
+        scene (dict): Cena de prepare_scene.
+    """
+    xy = resolve_scene(scene)
+    size = 300 if scene['labels'] is not None else max(2.0, 3000.0 / max(len(xy), 1))
+    ax.add_collection(LineCollection(xy[scene['edges']], colors='gray', linewidths=0.8, zorder=1))
+    ax.scatter(xy[:, 0], xy[:, 1], s=size, c=scene['colors'], zorder=2)
+    for positions, color, label in scene['highlights']:
+        ax.plot(xy[positions, 0], xy[positions, 1], color=color, linewidth=2.5, label=label, zorder=3)
+    for positions, color, label in scene['markers']:
+        ax.scatter(xy[positions, 0], xy[positions, 1], s=size, c=color, label=label, zorder=4)
+    if scene['labels'] is not None:
+        for (x, y), label in zip(xy, scene['labels']):
+            ax.annotate(label, (x, y), ha='center', va='center', fontsize=8, zorder=5)
+    if scene['highlights'] or scene['markers']:
+        ax.legend(loc='upper right')
+    if scene['title']:
+        ax.set_title(scene['title'])
+    ax.set_aspect('equal', adjustable='datalim')
+    ax.autoscale_view()
+    ax.set_axis_off()
+
+
+def render_scene(scene: dict, path: str, figsize=(10, 10), dpi: int = 100) -> str:
+    """
+    Desenha uma cena em um arquivo, sem pyplot: a figura é criada com a API orientada a objetos e
+    o backend Agg, então pode ser desenhada fora da thread principal.
+
+    Args:
+        scene (dict): Cena de prepare_scene.
+        path (str): Arquivo de saída; o formato segue a extensão (png, svg, pdf...).
+
+    Returns:
+        str : O próprio caminho.
+    """
+    figure = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(figure)
+    paint_scene(figure.add_subplot(), scene)
+    figure.savefig(path, bbox_inches='tight')
+    return path
+
+
+class Renderer():
+    """
+    Desenha figuras em arquivos em uma única thread de fundo, na ordem de envio. A simulação só
+    paga a extração da cena; a renderização e a escrita do arquivo acontecem em paralelo.
+    """
+    def __init__(self) -> None:
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, scene: dict, path: str, **options):
+        """
+        Agenda o desenho de uma cena.
+
+        Args:
+            scene (dict): Cena de prepare_scene.
+            path (str): Arquivo de saída.
+            **options: figsize e dpi, repassados a render_scene.
+
+        Returns:
+            concurrent.futures.Future : Resolvido com o caminho do arquivo quando ele estiver escrito.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='quantumnet-render')
+            return self._executor.submit(render_scene, scene, path, **options)
+
+    def wait(self):
+        """
+        Espera todos os desenhos agendados terminarem.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_renderer = Renderer()
+atexit.register(_renderer.wait)
+
+
+def get_renderer() -> Renderer:
+    """
+    Renderizador compartilhado pelo processo.
+    """
+    return _renderer
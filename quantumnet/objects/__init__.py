@@ -1,3 +1,11 @@
 from .logger import Logger
+from .random_streams import RandomStream, RandomStreams
+from .tracked_list import DirtySet, TrackedList
+from .qubit_memory import QubitMemory, EVICTION_POLICIES
+from .request_queue import RequestQueue
+from .link_occupancy import LinkOccupancy
+from .channel_table import ChannelTable
+from .csr_adjacency import CsrAdjacency
+from .timer_wheel import TimerWheel
 from .qubit import Qubit
 from .epr import Epr
\ No newline at end of file
@@ -0,0 +1,228 @@
+import numpy as np
+
+class ChannelTable():
+    """
+    Tabela dos canais da rede. Cada aresta não direcionada recebe um ID inteiro denso, pela chave
+    canônica (menor nó, maior nó), e os atributos numéricos dos canais ficam em colunas NumPy
+    indexadas por esse ID. A lista de pares EPR de cada canal também é guardada aqui. O grafo do
+    networkx fica apenas com a topologia, para os algoritmos de caminhos.
+
+    IDs de canais removidos não são reaproveitados por outras arestas: se a mesma aresta volta,
+    recebe o ID antigo.
+    """
+    COLUMNS = ('prob_on_demand_epr_create', 'prob_replay_epr_create')
+
+    def __init__(self, capacity: int = 16) -> None:
+        """
+        Args:
+            capacity (int): Número inicial de linhas das colunas.
+        """
+        self._ids = {}  # Chave canônica -> ID
+        self._keys = []  # ID -> chave canônica
+        self._stores = []  # ID -> lista de pares EPR, ou None se o canal foi removido
+        self._active = np.zeros(capacity, dtype=bool)
+        self._columns = {name: np.full(capacity, np.nan) for name in self.COLUMNS}
+
+    @staticmethod
+    def key(u: int, v: int) -> tuple:
+        """
+        Chave canônica de um canal, independente da orientação da aresta.
+
+        Returns:
+            tuple : (menor nó, maior nó).
+        """
+        return (u, v) if u <= v else (v, u)
+
+    def __len__(self):
+        return int(self._active[:len(self._keys)].sum())
+
+    def __contains__(self, edge) -> bool:
+        channel_id = self._ids.get(self.key(*edge))
+        return channel_id is not None and self._stores[channel_id] is not None
+
+    def __iter__(self):
+        """
+        Percorre as chaves dos canais existentes.
+        """
+        return (key for key, store in zip(self._keys, self._stores) if store is not None)
+
+    def items(self):
+        """
+        Percorre os canais existentes.
+
+        Returns:
+            iterator : Pares (chave, lista de pares EPR).
+        """
+        return ((key, store) for key, store in zip(self._keys, self._stores) if store is not None)
+
+    def _grow(self, size: int):
+        capacity = len(self._active)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        self._active = np.concatenate([self._active, np.zeros(capacity - len(self._active), dtype=bool)])
+        for name, column in self._columns.items():
+            self._columns[name] = np.concatenate([column, np.full(capacity - len(column), np.nan)])
+
+    def add(self, u: int, v: int, store) -> int:
+        """
+        Registra um canal, ou substitui a lista de pares de um canal existente.
+
+        Args:
+            u (int): Nó de uma ponta.
+            v (int): Nó da outra ponta.
+            store (list): Lista de pares EPR do canal.
+
+        Returns:
+            int : ID do canal.
+        """
+        key = self.key(u, v)
+        channel_id = self._ids.get(key)
+        if channel_id is None:
+            channel_id = len(self._keys)
+            self._grow(channel_id + 1)
+            self._ids[key] = channel_id
+            self._keys.append(key)
+            self._stores.append(None)
+        self._stores[channel_id] = store
+        self._active[channel_id] = True
+        return channel_id
+
+    def add_many(self, edges: list, stores: list) -> np.ndarray:
+        """
+        Registra vários canais de uma só vez, com as colunas alocadas uma única vez.
+
+        Args:
+            edges (list): Arestas (u, v).
+            stores (list): Lista de pares EPR de cada aresta.
+
+        Returns:
+            np.ndarray : IDs dos canais, na ordem das arestas.
+        """
+        self._grow(len(self._keys) + len(edges))
+        return np.fromiter((self.add(u, v, store) for (u, v), store in zip(edges, stores)), dtype=np.int64, count=len(edges))
+
+    def remove(self, u: int, v: int):
+        """
+        Remove um canal. Seus atributos são apagados.
+
+        Args:
+            u (int): Nó de uma ponta.
+            v (int): Nó da outra ponta.
+        """
+        channel_id = self._ids.get(self.key(u, v))
+        if channel_id is None:
+            return
+        self._stores[channel_id] = None
+        self._active[channel_id] = False
+        for column in self._columns.values():
+            column[channel_id] = np.nan
+
+    def id(self, u: int, v: int) -> int:
+        """
+        ID de um canal existente.
+
+        Raises:
+            KeyError : Se o canal não existe.
+        """
+        channel_id = self._ids.get(self.key(u, v))
+        if channel_id is None or self._stores[channel_id] is None:
+            raise KeyError((u, v))
+        return channel_id
+
+    def get_id(self, u: int, v: int, default: int = -1) -> int:
+        """
+        ID de um canal, ou default se o canal não existe.
+        """
+        channel_id = self._ids.get(self.key(u, v))
+        if channel_id is None or self._stores[channel_id] is None:
+            return default
+        return channel_id
+
+    def route_ids(self, route: list) -> np.ndarray:
+        """
+        IDs dos canais de uma rota.
+
+        Args:
+            route (list): Rota como lista de nós.
+
+        Returns:
+            np.ndarray : Vetor com um ID por canal da rota.
+        """
+        return np.fromiter((self.id(route[i], route[i + 1]) for i in range(len(route) - 1)), dtype=np.int64)
+
+    def eprs(self, u: int, v: int):
+        """
+        Lista de pares EPR de um canal.
+
+        Raises:
+            KeyError : Se o canal não existe.
+        """
+        return self._stores[self.id(u, v)]
+
+    def get_eprs(self, u: int, v: int, default=None):
+        """
+        Lista de pares EPR de um canal, ou default se o canal não existe.
+        """
+        channel_id = self._ids.get(self.key(u, v))
+        if channel_id is None:
+            return default
+        store = self._stores[channel_id]
+        return default if store is None else store
+
+    def set_eprs(self, u: int, v: int, store):
+        """
+        Substitui a lista de pares EPR de um canal existente.
+        """
+        self._stores[self.id(u, v)] = store
+
+    def get(self, u: int, v: int, name: str) -> float:
+        """
+        Atributo de um canal.
+        """
+        return float(self._columns[name][self.id(u, v)])
+
+    def set(self, u: int, v: int, name: str, value: float):
+        """
+        Define um atributo de um canal.
+        """
+        self._columns[name][self.id(u, v)] = value
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Coluna de um atributo, indexada pelo ID dos canais. Canais removidos valem NaN.
+
+        Returns:
+            np.ndarray : Visão da coluna, que pode ser lida e escrita.
+        """
+        return self._columns[name][:len(self._keys)]
+
+    def ids(self) -> np.ndarray:
+        """
+        IDs dos canais existentes.
+
+        Returns:
+            np.ndarray : Vetor de IDs, em ordem crescente.
+        """
+        return np.flatnonzero(self._active[:len(self._keys)])
+
+    def keys_of(self, ids) -> list:
+        """
+        Chaves dos canais de uma lista de IDs. IDs negativos, de arestas sem canal, são ignorados.
+        """
+        return [self._keys[channel_id] for channel_id in ids if channel_id >= 0]
+
+    def copy(self) -> 'ChannelTable':
+        """
+        Cópia da tabela. As colunas são copiadas; as listas de pares EPR são as mesmas.
+
+        Returns:
+            ChannelTable : Cópia.
+        """
+        other = ChannelTable.__new__(ChannelTable)
+        other._ids = dict(self._ids)
+        other._keys = list(self._keys)
+        other._stores = list(self._stores)
+        other._active = self._active.copy()
+        other._columns = {name: column.copy() for name, column in self._columns.items()}
+        return other
@@ -0,0 +1,143 @@
+import numpy as np
+
+class CsrAdjacency():
+    """
+    Lista de adjacência congelada da topologia, no formato CSR: os vizinhos do nó de posição i estão
+    em indices[indptr[i]:indptr[i + 1]], em ordem crescente, e edge_ids traz o ID do canal de cada
+    vizinho. Consultas de vizinhos e de canais incidentes são fatias dos vetores, e consultas sobre
+    vários nós são vetorizadas. Os vetores são somente leitura; quando a topologia muda, a rede
+    constrói uma nova adjacência.
+    """
+    def __init__(self, graph, edge_id=None) -> None:
+        """
+        Args:
+            graph (nx.Graph): Topologia, com nós inteiros não negativos.
+            edge_id (callable, optional): Função (u, v) -> ID do canal, ou -1 se a aresta não tem canal.
+        """
+        nodes = np.array(sorted(graph.nodes), dtype=np.int64)
+        neighbors = [sorted(graph.neighbors(node)) for node in nodes.tolist()]
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(adjacent) for adjacent in neighbors], dtype=np.int64)
+        indices = np.fromiter((neighbor for adjacent in neighbors for neighbor in adjacent), dtype=np.int64, count=int(indptr[-1]))
+        if edge_id is None:
+            edge_ids = np.full(len(indices), -1, dtype=np.int64)
+        else:
+            edge_ids = np.fromiter((edge_id(node, neighbor) for node, adjacent in zip(nodes.tolist(), neighbors) for neighbor in adjacent),
+                                   dtype=np.int64, count=int(indptr[-1]))
+        lookup = np.full(int(nodes.max()) + 1 if len(nodes) else 0, -1, dtype=np.int64)
+        lookup[nodes] = np.arange(len(nodes))
+        for array in (nodes, indptr, indices, edge_ids, lookup):
+            array.flags.writeable = False
+        self.nodes = nodes
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_ids = edge_ids
+        self._lookup = lookup
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def position(self, node: int) -> int:
+        """
+        Posição de um nó nos vetores.
+
+        Raises:
+            KeyError : Se o nó não existe.
+        """
+        if 0 <= node < len(self._lookup) and self._lookup[node] >= 0:
+            return int(self._lookup[node])
+        raise KeyError(node)
+
+    def positions(self, nodes) -> np.ndarray:
+        """
+        Posições de vários nós. Nós inexistentes valem -1.
+
+        Args:
+            nodes (iterable): Nós.
+
+        Returns:
+            np.ndarray : Vetor de posições.
+        """
+        nodes = np.asarray(list(nodes) if not isinstance(nodes, np.ndarray) else nodes, dtype=np.int64)
+        valid = (nodes >= 0) & (nodes < len(self._lookup))
+        positions = np.full(len(nodes), -1, dtype=np.int64)
+        positions[valid] = self._lookup[nodes[valid]]
+        return positions
+
+    def neighbors(self, node: int) -> np.ndarray:
+        """
+        Vizinhos de um nó, em ordem crescente.
+        """
+        position = self.position(node)
+        return self.indices[self.indptr[position]:self.indptr[position + 1]]
+
+    def incident_edges(self, node: int) -> np.ndarray:
+        """
+        IDs dos canais incidentes a um nó, na ordem dos vizinhos.
+        """
+        position = self.position(node)
+        return self.edge_ids[self.indptr[position]:self.indptr[position + 1]]
+
+    def degree(self, node: int) -> int:
+        """
+        Grau de um nó.
+        """
+        position = self.position(node)
+        return int(self.indptr[position + 1] - self.indptr[position])
+
+    def edge_id(self, u: int, v: int) -> int:
+        """
+        ID do canal entre dois nós, ou -1 se não há aresta ou a aresta não tem canal.
+        """
+        if not (0 <= u < len(self._lookup)) or self._lookup[u] < 0:
+            return -1
+        position = self._lookup[u]
+        start, end = self.indptr[position], self.indptr[position + 1]
+        index = start + np.searchsorted(self.indices[start:end], v)
+        if index < end and self.indices[index] == v:
+            return int(self.edge_ids[index])
+        return -1
+
+    def has_edge(self, u: int, v: int) -> bool:
+        """
+        Verifica se há aresta entre dois nós, por busca binária nos vizinhos de u.
+        """
+        if not (0 <= u < len(self._lookup)) or self._lookup[u] < 0:
+            return False
+        position = self._lookup[u]
+        start, end = self.indptr[position], self.indptr[position + 1]
+        index = start + np.searchsorted(self.indices[start:end], v)
+        return bool(index < end and self.indices[index] == v)
+
+    def incidences(self, nodes) -> tuple:
+        """
+        Todas as incidências de vários nós de uma só vez.
+
+        Args:
+            nodes (iterable): Nós. Nós inexistentes são ignorados.
+
+        Returns:
+            tuple : Vetores (nó, vizinho, ID do canal), com uma linha por incidência.
+        """
+        positions = self.positions(nodes)
+        positions = positions[positions >= 0]
+        starts = self.indptr[positions]
+        counts = self.indptr[positions + 1] - starts
+        # Índice de cada incidência: o início do nó mais o deslocamento dentro dele
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(int(counts.sum()))
+        return np.repeat(self.nodes[positions], counts), self.indices[offsets], self.edge_ids[offsets]
+
+    def induced_edges(self, nodes) -> np.ndarray:
+        """
+        IDs dos canais com as duas pontas no conjunto de nós.
+
+        Args:
+            nodes (iterable): Nós.
+
+        Returns:
+            np.ndarray : IDs dos canais, cada um uma vez.
+        """
+        nodes = np.asarray(list(nodes) if not isinstance(nodes, np.ndarray) else nodes, dtype=np.int64)
+        sources, targets, edge_ids = self.incidences(nodes)
+        keep = (sources < targets) & np.isin(targets, nodes) & (edge_ids >= 0)
+        return edge_ids[keep]
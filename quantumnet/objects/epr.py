@@ -1,9 +1,12 @@
-import random
+from .random_streams import RandomStreams
+
 class Epr():
-    def __init__(self,  epr_id: int, initial_fidelity: float = None) -> None:
+    def __init__(self,  epr_id: int, initial_fidelity: float = None, rng=None) -> None:
         self._epr_id = epr_id
-        self._initial_fidelity = initial_fidelity  if initial_fidelity is not None else random.uniform(0, 1)
-        self._current_fidelity = initial_fidelity  if initial_fidelity is not None else random.uniform(0, 1)
+        if initial_fidelity is None:
+            rng = rng if rng is not None else RandomStreams.get_default()['physical']
+        self._initial_fidelity = initial_fidelity  if initial_fidelity is not None else rng.uniform(0, 1)
+        self._current_fidelity = initial_fidelity  if initial_fidelity is not None else rng.uniform(0, 1)
         # Ainda vamos ver se isso vai ser necessário
         # self.qubits = qubits
     
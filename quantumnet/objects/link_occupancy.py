@@ -0,0 +1,314 @@
+import numpy as np
+
+class LinkOccupancy():
+    """
+    Ocupação dos enlaces da rede ao longo do tempo, em uma matriz de bits (timeslot × enlace).
+    Cada linha é um timeslot e cada enlace é um bit, agrupados em palavras de 64 bits. Conflitos
+    de uma rota são um AND vetorizado com a máscara dos seus enlaces e reservas são um OR.
+    A janela de timeslots cresce conforme necessário e pode ser descartada com prune.
+    """
+    def __init__(self, window: int = 64) -> None:
+        """
+        Args:
+            window (int): Número inicial de timeslots da janela.
+        """
+        self._index = {}  # Enlace -> bit
+        self._words = np.zeros((window, 1), dtype=np.uint64)
+        self._base = 0  # Timeslot da primeira linha da matriz
+
+    @staticmethod
+    def link_key(u: int, v: int) -> tuple:
+        """
+        Chave do enlace, independente do sentido em que a rota o percorre.
+
+        Returns:
+            tuple : Enlace (menor nó, maior nó).
+        """
+        return (u, v) if u <= v else (v, u)
+
+    @staticmethod
+    def route_links(route: list) -> list:
+        """
+        Enlaces percorridos por uma rota.
+
+        Args:
+            route (list): Rota como lista de nós.
+
+        Returns:
+            list : Chaves dos enlaces da rota.
+        """
+        return [LinkOccupancy.link_key(route[i], route[i + 1]) for i in range(len(route) - 1)]
+
+    @property
+    def window(self) -> tuple:
+        """
+        Intervalo de timeslots representado na matriz.
+
+        Returns:
+            tuple : (primeiro timeslot, último timeslot + 1).
+        """
+        return self._base, self._base + self._words.shape[0]
+
+    def index(self, link: tuple) -> int:
+        """
+        Bit do enlace na matriz, criado na primeira consulta.
+
+        Args:
+            link (tuple): Enlace.
+
+        Returns:
+            int : Índice do enlace.
+        """
+        bit = self._index.get(link)
+        if bit is None:
+            bit = len(self._index)
+            self._index[link] = bit
+            if bit >> 6 >= self._words.shape[1]:
+                extra = np.zeros((self._words.shape[0], self._words.shape[1]), dtype=np.uint64)
+                self._words = np.hstack([self._words, extra])
+        return bit
+
+    def mask(self, links) -> np.ndarray:
+        """
+        Máscara de bits de um conjunto de enlaces.
+
+        Args:
+            links (iterable): Enlaces, por exemplo os de uma rota.
+
+        Returns:
+            np.ndarray : Vetor de palavras uint64 com os bits dos enlaces.
+        """
+        bits = np.fromiter((self.index(link) for link in links), dtype=np.int64)
+        mask = np.zeros(self._words.shape[1], dtype=np.uint64)
+        np.bitwise_or.at(mask, bits >> 6, np.left_shift(np.uint64(1), (bits & 63).astype(np.uint64)))
+        return mask
+
+    def masks(self, routes: list) -> np.ndarray:
+        """
+        Máscaras de várias rotas, uma por linha.
+
+        Args:
+            routes (list): Rotas como listas de nós.
+
+        Returns:
+            np.ndarray : Matriz (rotas × palavras).
+        """
+        route_links = [self.route_links(route) for route in routes]
+        for links in route_links:
+            for link in links:
+                self.index(link)
+        return np.array([self.mask(links) for links in route_links], dtype=np.uint64).reshape(len(routes), -1)
+
+    def _fit(self, masks: np.ndarray) -> np.ndarray:
+        # Completa com zeros máscaras calculadas antes de novos enlaces serem adicionados
+        width = self._words.shape[1]
+        if masks.shape[-1] < width:
+            pad = [(0, 0)] * (masks.ndim - 1) + [(0, width - masks.shape[-1])]
+            masks = np.pad(masks, pad)
+        return masks
+
+    def _ensure(self, start: int, end: int):
+        # Estende a janela para cobrir os timeslots [start, end)
+        if start < self._base:
+            extra = np.zeros((self._base - start, self._words.shape[1]), dtype=np.uint64)
+            self._words = np.vstack([extra, self._words])
+            self._base = start
+        rows = self._words.shape[0]
+        if end - self._base > rows:
+            new_rows = max(end - self._base, 2 * rows)
+            extra = np.zeros((new_rows - rows, self._words.shape[1]), dtype=np.uint64)
+            self._words = np.vstack([self._words, extra])
+
+    def _rows(self, start: int, duration: int) -> np.ndarray:
+        # Linhas existentes dos timeslots [start, start + duration); timeslots fora da janela estão livres
+        first = max(start - self._base, 0)
+        last = min(start + duration - self._base, self._words.shape[0])
+        return self._words[first:max(first, last)]
+
+    def is_route_free(self, links, start: int, duration: int = 1) -> bool:
+        """
+        Verifica se todos os enlaces estão livres nos timeslots [start, start + duration).
+
+        Args:
+            links (iterable): Enlaces.
+            start (int): Primeiro timeslot.
+            duration (int): Número de timeslots.
+
+        Returns:
+            bool : True se não há conflito.
+        """
+        return not (self._rows(start, duration) & self.mask(links)).any()
+
+    def is_free(self, link: tuple, start: int, duration: int = 1) -> bool:
+        """
+        Verifica se um enlace está livre nos timeslots [start, start + duration).
+        """
+        return self.is_route_free((link,), start, duration)
+
+    def conflicts(self, masks: np.ndarray, start: int, duration: int = 1) -> np.ndarray:
+        """
+        Verifica de uma só vez o conflito de várias rotas com as reservas nos timeslots [start, start + duration).
+
+        Args:
+            masks (np.ndarray): Máscaras das rotas, como retornadas por masks().
+            start (int): Primeiro timeslot.
+            duration (int): Número de timeslots.
+
+        Returns:
+            np.ndarray : Vetor booleano, True para as rotas em conflito.
+        """
+        rows = self._rows(start, duration)
+        if not len(rows):
+            return np.zeros(len(masks), dtype=bool)
+        occupied = np.bitwise_or.reduce(rows, axis=0)
+        return (self._fit(masks) & occupied).any(axis=1)
+
+    def earliest_common_slot(self, links, start: int, duration: int = 1) -> int:
+        """
+        Primeiro timeslot a partir de start em que todos os enlaces ficam livres por duration timeslots.
+
+        Args:
+            links (iterable): Enlaces, por exemplo os de uma rota.
+            start (int): Timeslot inicial da busca.
+            duration (int): Número de timeslots.
+
+        Returns:
+            int : Primeiro timeslot livre.
+        """
+        mask = self.mask(links)
+        first = max(start - self._base, 0)
+        busy = (self._words[first:] & mask).any(axis=1)
+        if start < self._base:
+            busy = np.concatenate([np.zeros(self._base - start, dtype=bool), busy])
+        # Janelas de duration timeslots sem nenhum ocupado; depois do fim da matriz tudo está livre
+        busy = np.concatenate([busy, np.zeros(duration, dtype=bool)])
+        counts = np.concatenate([[0], np.cumsum(busy)])
+        free = counts[duration:] - counts[:-duration] == 0
+        return start + int(np.argmax(free))
+
+    def next_free(self, link: tuple, start: int, duration: int = 1) -> int:
+        """
+        Primeiro timeslot a partir de start em que o enlace fica livre por duration timeslots.
+        """
+        return self.earliest_common_slot((link,), start, duration)
+
+    def reserve_route(self, links, start: int, duration: int = 1):
+        """
+        Reserva os enlaces nos timeslots [start, start + duration).
+
+        Args:
+            links (iterable): Enlaces.
+            start (int): Primeiro timeslot.
+            duration (int): Número de timeslots.
+        """
+        mask = self.mask(links)
+        self._ensure(start, start + duration)
+        first = start - self._base
+        self._words[first:first + duration] |= mask
+
+    def reserve(self, link: tuple, start: int, duration: int = 1):
+        """
+        Reserva um enlace nos timeslots [start, start + duration).
+        """
+        self.reserve_route((link,), start, duration)
+
+    def reserve_many(self, masks: np.ndarray, starts, duration: int = 1):
+        """
+        Reserva várias rotas de uma só vez, cada uma a partir do seu timeslot.
+
+        Args:
+            masks (np.ndarray): Máscaras das rotas, como retornadas por masks().
+            starts (iterable): Primeiro timeslot de cada rota.
+            duration (int): Número de timeslots de cada reserva.
+        """
+        starts = np.asarray(list(starts), dtype=np.int64)
+        if not len(starts):
+            return
+        self._ensure(int(starts.min()), int(starts.max()) + duration)
+        masks = self._fit(masks)
+        rows = (starts - self._base)[:, None] + np.arange(duration)
+        np.bitwise_or.at(self._words, rows.ravel(), np.repeat(masks, duration, axis=0))
+
+    def release(self, link: tuple, start: int = None, duration: int = 1):
+        """
+        Libera um enlace nos timeslots [start, start + duration), ou em toda a janela se start for None.
+        """
+        self.release_route((link,), start, duration)
+
+    def release_route(self, links, start: int = None, duration: int = 1):
+        """
+        Libera os enlaces nos timeslots [start, start + duration), ou em toda a janela se start for None.
+
+        Args:
+            links (iterable): Enlaces.
+            start (int, optional): Primeiro timeslot.
+            duration (int): Número de timeslots.
+        """
+        keep = ~self.mask(links)
+        if start is None:
+            self._words &= keep
+        else:
+            self._rows(start, duration)[...] &= keep
+
+    def reservations(self, link: tuple) -> list:
+        """
+        Intervalos reservados de um enlace.
+
+        Args:
+            link (tuple): Enlace.
+
+        Returns:
+            list : Intervalos (início, fim), com o fim exclusivo.
+        """
+        if link not in self._index:
+            return []
+        bit = self._index[link]
+        column = (self._words[:, bit >> 6] >> np.uint64(bit & 63)) & np.uint64(1)
+        edges = np.diff(np.concatenate([[0], column.astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1) + self._base
+        ends = np.flatnonzero(edges == -1) + self._base
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    def prune(self, before: int):
+        """
+        Descarta os timeslots anteriores a before.
+
+        Args:
+            before (int): Primeiro timeslot que deve ser mantido.
+        """
+        drop = min(max(before - self._base, 0), self._words.shape[0])
+        if drop:
+            self._words = np.vstack([self._words[drop:], np.zeros((drop, self._words.shape[1]), dtype=np.uint64)])
+            self._base += drop
+
+    def copy(self) -> 'LinkOccupancy':
+        """
+        Cópia independente da ocupação.
+
+        Returns:
+            LinkOccupancy : Cópia.
+        """
+        other = LinkOccupancy.__new__(LinkOccupancy)
+        other._index = dict(self._index)
+        other._words = self._words.copy()
+        other._base = self._base
+        return other
+
+    def restore(self, other: 'LinkOccupancy'):
+        """
+        Copia para esta instância o estado de outra, mantendo as referências a ela válidas.
+
+        Args:
+            other (LinkOccupancy): Ocupação de origem.
+        """
+        self._index = dict(other._index)
+        self._words = other._words.copy()
+        self._base = other._base
+
+    def clear(self):
+        """
+        Remove todas as reservas e enlaces.
+        """
+        self._index = {}
+        self._words = np.zeros((self._words.shape[0], 1), dtype=np.uint64)
+        self._base = 0
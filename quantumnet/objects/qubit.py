@@ -1,19 +1,20 @@
-import random
 import math
+from .random_streams import RandomStreams
 
 class Qubit():
-    def __init__(self, qubit_id: int, initial_fidelity: float = None) -> None:
+    def __init__(self, qubit_id: int, initial_fidelity: float = None, rng=None) -> None:
         self.qubit_id = qubit_id
+        self._rng = rng if rng is not None else RandomStreams.get_default()['qubits']  # Fluxo aleatório do qubit
         self._qubit_state = 0  # Define o estado inicial do qubit como 0
         self._phase = 1  # 1 para estado normal, -1 para estado com fase invertida (representa o efeito de Z)
-        self._initial_fidelity = initial_fidelity if initial_fidelity is not None else random.uniform(0.9, 1)
+        self._initial_fidelity = initial_fidelity if initial_fidelity is not None else self._rng.uniform(0.9, 1)
         self._current_fidelity = self._initial_fidelity
 
     def __str__(self):
         return f"Qubit {self.qubit_id} with state {self._qubit_state} and phase {self._phase}"
 
     def update_fidelity(self):
-        self._current_fidelity = random.uniform(0, 1)
+        self._current_fidelity = self._rng.uniform(0, 1)
 
     def get_initial_fidelity(self):
         return self._initial_fidelity
@@ -48,11 +49,11 @@ class Qubit():
         # Hadamard transforma o estado |0> em (|0> + |1>) / sqrt(2)
         # e |1> em (|0> - |1>) / sqrt(2). Para simulação, usa-se probabilidade.
         if self._qubit_state == 0:
-            self._qubit_state = random.choice([0, 1])  # Simula a superposição
+            self._qubit_state = self._rng.choice([0, 1])  # Simula a superposição
         else:
-            self._qubit_state = random.choice([0, 1])  # Simula a superposição
+            self._qubit_state = self._rng.choice([0, 1])  # Simula a superposição
         # Alteração de fase com 50% de chance simula o comportamento quântico
-        self._phase = random.choice([1, -1])
+        self._phase = self._rng.choice([1, -1])
 
     def measure(self):
         """Realiza a medição do qubit no estado atual."""
@@ -84,5 +85,5 @@ class Qubit():
         prob_0 = (1 + math.cos(theta)) / 2  # Probabilidade de medir |0>
         
         # Realiza a medição com base na probabilidade calculada.
-        result = 0 if random.uniform(0, 1) < prob_0 else 1
+        result = 0 if self._rng.random() < prob_0 else 1
         return result
\ No newline at end of file
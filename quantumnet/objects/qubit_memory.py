@@ -0,0 +1,193 @@
+from .tracked_list import TrackedList
+
+
+def evict_fifo(memory) -> int:
+    """
+    Descarta o qubit que entrou primeiro na memória.
+    """
+    return 0
+
+
+def evict_lowest_fidelity(memory) -> int:
+    """
+    Descarta o qubit de menor fidelidade atual.
+    """
+    return min(range(len(memory)), key=lambda index: memory[index].get_current_fidelity())
+
+
+def evict_oldest(memory) -> int:
+    """
+    Descarta o qubit criado há mais tempo, segundo memory.creation_time. Sem essa função, equivale a evict_fifo.
+    """
+    if memory.creation_time is None:
+        return 0
+    return min(range(len(memory)), key=lambda index: memory.creation_time(memory[index]))
+
+
+EVICTION_POLICIES = {
+    'fifo': evict_fifo,
+    'lowest_fidelity': evict_lowest_fidelity,
+    'oldest': evict_oldest,
+}
+
+
+class QubitMemory(TrackedList):
+    """
+    Memória quântica de um host: uma TrackedList com capacidade máxima e um índice dos qubits por ID.
+    Quando uma inserção ultrapassa a capacidade, a política de descarte escolhe os qubits que saem.
+    As políticas são funções que recebem a memória e retornam a posição do qubit descartado; as
+    nomeadas estão em EVICTION_POLICIES. O índice é atualizado a cada inserção e remoção, então
+    find e o operador in não percorrem a memória.
+    """
+    __slots__ = ('_capacity', '_eviction', '_ids', 'creation_time', 'evicted')
+
+    def __init__(self, iterable=(), dirty: set = None, key=None, capacity: int = None, eviction='fifo', creation_time=None) -> None:
+        """
+        Args:
+            iterable (iterable): Qubits iniciais.
+            dirty (DirtySet, optional): Conjunto onde a chave é registrada quando a memória muda.
+            key (hashable, optional): Chave da memória, o ID do host.
+            capacity (int, optional): Número máximo de qubits. None não limita a memória.
+            eviction (str | callable): Política de descarte, nome em EVICTION_POLICIES ou função.
+            creation_time (callable, optional): Função que retorna o timeslot de criação de um qubit, usada pela política 'oldest'.
+        """
+        super().__init__(iterable, dirty, key)
+        self._capacity = capacity
+        self._eviction = None
+        self._ids = None
+        self.creation_time = creation_time
+        self.evicted = 0
+        self.set_eviction(eviction)
+
+    def __reduce_ex__(self, protocol):
+        # Copiar ou serializar a memória não deve marcá-la como modificada
+        return (QubitMemory, (list(self), self._dirty, self._key, self._capacity, self._eviction, self.creation_time))
+
+    @property
+    def capacity(self) -> int:
+        """
+        Número máximo de qubits, ou None se a memória não é limitada.
+        """
+        return self._capacity
+
+    @property
+    def eviction(self):
+        """
+        Política de descarte.
+        """
+        return self._eviction
+
+    def set_capacity(self, capacity: int):
+        """
+        Altera a capacidade, descartando os qubits excedentes.
+
+        Args:
+            capacity (int): Número máximo de qubits. None não limita a memória.
+        """
+        self._capacity = capacity
+        self._enforce()
+
+    def set_eviction(self, eviction):
+        """
+        Altera a política de descarte.
+
+        Args:
+            eviction (str | callable): Nome em EVICTION_POLICIES ou função (memória) -> posição do qubit descartado.
+        """
+        if isinstance(eviction, str):
+            if eviction not in EVICTION_POLICIES:
+                raise ValueError(f'Política de descarte desconhecida: {eviction}. Opções: {list(EVICTION_POLICIES)}.')
+            eviction = EVICTION_POLICIES[eviction]
+        self._eviction = eviction
+
+    def _index_ids(self) -> dict:
+        if self._ids is None:
+            ids = {}
+            for qubit in self:
+                ids.setdefault(qubit.qubit_id, []).append(qubit)
+            self._ids = ids
+        return self._ids
+
+    def _forget(self, qubit):
+        if self._ids is None:
+            return
+        same = self._ids.get(qubit.qubit_id)
+        if same:
+            for position, other in enumerate(same):
+                if other is qubit:
+                    del same[position]
+                    break
+            if not same:
+                del self._ids[qubit.qubit_id]
+
+    def _enforce(self):
+        # Descarta qubits até a memória caber na capacidade
+        if self._capacity is None:
+            return
+        while len(self) > self._capacity:
+            index = self._eviction(self)
+            self._modified()
+            qubit = list.pop(self, index)
+            self._forget(qubit)
+            self.evicted += 1
+
+    def _inserted(self, items):
+        if self._ids is not None:
+            for qubit in items:
+                self._ids.setdefault(qubit.qubit_id, []).append(qubit)
+        super()._inserted(items)
+        self._enforce()
+
+    def find(self, qubit_id: int):
+        """
+        Busca um qubit pelo ID.
+
+        Args:
+            qubit_id (int): ID do qubit.
+
+        Returns:
+            Qubit : O qubit inserido por último com esse ID, ou None.
+        """
+        same = self._index_ids().get(qubit_id)
+        return same[-1] if same else None
+
+    def __contains__(self, item):
+        qubit_id = getattr(item, 'qubit_id', None)
+        if qubit_id is None:
+            return super().__contains__(item)
+        return any(qubit is item for qubit in self._index_ids().get(qubit_id, ()))
+
+    def replace(self, items):
+        super().replace(items)
+        self._ids = None
+
+    def pop(self, index=-1):
+        qubit = super().pop(index)
+        self._forget(qubit)
+        return qubit
+
+    def remove(self, item):
+        del self[self.index(item)]
+
+    def clear(self):
+        super().clear()
+        self._ids = {}
+
+    def __setitem__(self, index, value):
+        self._ids = None
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            self._ids = None
+            super().__delitem__(index)
+        else:
+            qubit = self[index]
+            super().__delitem__(index)
+            self._forget(qubit)
+
+    def __imul__(self, n):
+        self._ids = None
+        result = super().__imul__(n)
+        self._enforce()
+        return result
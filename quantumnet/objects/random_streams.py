@@ -0,0 +1,164 @@
+import numpy as np
+
+class RandomStream():
+    """
+    Fluxo de números aleatórios de um componente da rede. Os sorteios individuais são servidos a
+    partir de lotes gerados pelo NumPy, evitando o custo de uma chamada ao gerador por número.
+    """
+    def __init__(self, generator: np.random.Generator, batch_size: int = 1024) -> None:
+        self._generator = generator
+        self._batch_size = batch_size
+        self._buffer = generator.random(batch_size)
+        self._position = 0
+
+    @property
+    def generator(self) -> np.random.Generator:
+        """
+        Gerador NumPy do fluxo, para sorteios vetorizados.
+
+        Returns:
+            np.random.Generator : Gerador do fluxo.
+        """
+        return self._generator
+
+    def reset(self, generator: np.random.Generator):
+        """
+        Substitui o gerador do fluxo e descarta o lote atual.
+
+        Args:
+            generator (np.random.Generator): Novo gerador.
+        """
+        self._generator = generator
+        self._buffer = generator.random(self._batch_size)
+        self._position = 0
+
+    def random(self) -> float:
+        """
+        Sorteia um número no intervalo [0, 1).
+
+        Returns:
+            float : Número sorteado.
+        """
+        if self._position == self._batch_size:
+            self._buffer = self._generator.random(self._batch_size)
+            self._position = 0
+        value = self._buffer[self._position]
+        self._position += 1
+        return float(value)
+
+    def uniform(self, low: float = 0.0, high: float = 1.0) -> float:
+        """
+        Sorteia um número no intervalo [low, high).
+        """
+        return low + (high - low) * self.random()
+
+    def randint(self, low: int, high: int) -> int:
+        """
+        Sorteia um inteiro no intervalo [low, high], como random.randint.
+        """
+        return low + int(self.random() * (high - low + 1))
+
+    def choice(self, options):
+        """
+        Sorteia um elemento de uma sequência.
+        """
+        return options[int(self.random() * len(options))]
+
+    def uniform_array(self, low: float, high: float, size) -> np.ndarray:
+        """
+        Sorteia um vetor de números no intervalo [low, high).
+        """
+        return self._generator.uniform(low, high, size)
+
+    def integers_array(self, low: int, high: int, size) -> np.ndarray:
+        """
+        Sorteia um vetor de inteiros no intervalo [low, high).
+        """
+        return self._generator.integers(low, high, size)
+
+
+class RandomStreams():
+    """
+    Conjunto de fluxos aleatórios independentes, um por componente da rede, derivados de uma
+    única semente com SeedSequence.spawn. A mesma semente reproduz exatamente a mesma execução.
+    """
+    COMPONENTS = ('topology', 'workload', 'physical', 'link', 'network', 'application', 'qubits')
+    # Ramos da SeedSequence: um para os fluxos dos componentes e outro para os filhos de spawn()
+    COMPONENT_BRANCH = len(COMPONENTS)
+    SPAWN_BRANCH = len(COMPONENTS) + 1
+    __default = None
+
+    def __init__(self, seed=None) -> None:
+        """
+        Args:
+            seed (int | np.random.SeedSequence, optional): Semente. Se None, usa entropia do sistema.
+        """
+        self._streams = {}
+        self.reseed(seed)
+
+    @staticmethod
+    def get_default():
+        """
+        Fluxos usados por objetos criados fora de uma rede.
+
+        Returns:
+            RandomStreams : Instância padrão do processo.
+        """
+        if RandomStreams.__default is None:
+            RandomStreams.__default = RandomStreams()
+        return RandomStreams.__default
+
+    @property
+    def seed_sequence(self) -> np.random.SeedSequence:
+        """
+        SeedSequence que originou os fluxos.
+
+        Returns:
+            np.random.SeedSequence : Semente dos fluxos.
+        """
+        return self._seed_sequence
+
+    def reseed(self, seed=None):
+        """
+        Reinicia todos os fluxos a partir de uma nova semente. Os objetos RandomStream são mantidos,
+        então as referências guardadas pelas camadas e qubits continuam válidas.
+
+        Args:
+            seed (int | np.random.SeedSequence, optional): Nova semente.
+        """
+        if isinstance(seed, np.random.SeedSequence):
+            self._seed_sequence = seed
+        else:
+            self._seed_sequence = np.random.SeedSequence(seed)
+        # Os fluxos dos componentes e os filhos criados por spawn() ficam em ramos distintos da
+        # SeedSequence, então nenhum filho de spawn() repete a semente de um componente
+        self._spawn_branch = self._branch(self.SPAWN_BRANCH)
+        children = self._branch(self.COMPONENT_BRANCH).spawn(len(self.COMPONENTS))
+        for name, child in zip(self.COMPONENTS, children):
+            generator = np.random.default_rng(child)
+            if name in self._streams:
+                self._streams[name].reset(generator)
+            else:
+                self._streams[name] = RandomStream(generator)
+
+    def _branch(self, tag: int) -> np.random.SeedSequence:
+        # Ramo da semente atual, sem alterar a SeedSequence recebida em reseed
+        return np.random.SeedSequence(self._seed_sequence.entropy,
+                                      spawn_key=self._seed_sequence.spawn_key + (tag,),
+                                      pool_size=self._seed_sequence.pool_size)
+
+    def spawn(self, n: int) -> list:
+        """
+        Cria n conjuntos de fluxos independentes, por exemplo um por execução de uma varredura.
+        Chamadas sucessivas continuam a sequência de filhos, sem repetir conjuntos.
+
+        Args:
+            n (int): Número de conjuntos.
+
+        Returns:
+            list : Lista de RandomStreams.
+        """
+        return [RandomStreams(child) for child in self._spawn_branch.spawn(n)]
+
+    def __getitem__(self, name: str) -> RandomStream:
+        return self._streams[name]
@@ -0,0 +1,75 @@
+import heapq
+import itertools
+
+class RequestQueue():
+    """
+    Fila de prioridade de requisições. A prioridade de cada requisição é calculada uma única vez,
+    na inserção, e requisições de mesma prioridade saem na ordem de chegada. Inserção e remoção
+    custam O(log n).
+    """
+    def __init__(self, key, requests=()) -> None:
+        """
+        Args:
+            key (callable): Função que recebe uma requisição e retorna sua prioridade. Menor sai primeiro.
+            requests (iterable, optional): Requisições iniciais.
+        """
+        self._key = key
+        self._counter = itertools.count()
+        self._heap = [(key(request), next(self._counter), request) for request in requests]
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def __iter__(self):
+        """
+        Percorre as requisições em ordem de prioridade, sem removê-las.
+        """
+        return (request for _, _, request in sorted(self._heap))
+
+    def push(self, request: dict):
+        """
+        Insere uma requisição na fila.
+
+        Args:
+            request (dict): Requisição.
+        """
+        heapq.heappush(self._heap, (self._key(request), next(self._counter), request))
+
+    def peek(self) -> dict:
+        """
+        Retorna a requisição de maior prioridade sem removê-la.
+
+        Returns:
+            dict : Requisição de maior prioridade.
+        """
+        if not self._heap:
+            raise IndexError('A fila de requisições está vazia.')
+        return self._heap[0][2]
+
+    def pop(self) -> dict:
+        """
+        Remove e retorna a requisição de maior prioridade.
+
+        Returns:
+            dict : Requisição de maior prioridade.
+        """
+        if not self._heap:
+            raise IndexError('A fila de requisições está vazia.')
+        return heapq.heappop(self._heap)[2]
+
+    def reprioritize(self):
+        """
+        Recalcula a prioridade de todas as requisições, para quando elas foram alteradas depois da inserção.
+        """
+        self._heap = [(self._key(request), order, request) for _, order, request in self._heap]
+        heapq.heapify(self._heap)
+
+    def clear(self):
+        """
+        Esvazia a fila.
+        """
+        self._heap.clear()
@@ -0,0 +1,100 @@
+class TimerWheel():
+    """
+    Roda de temporizadores hierárquica, indexada por timeslot. Cada nível tem slots baldes e cada
+    balde do nível l cobre slots ** l timeslots. Um item é agendado no nível mais baixo cujo bloco
+    contém o prazo e o timeslot atual; quando o relógio chega ao início de um bloco, o balde
+    correspondente desce para o nível de baixo. Agendar custa O(1) e avançar um timeslot custa
+    O(1) mais os itens que vencem ou descem de nível. Prazos além do último nível ficam em uma
+    lista de espera revista a cada volta completa.
+    """
+    def __init__(self, slots: int = 64, levels: int = 4, start: int = 0) -> None:
+        """
+        Args:
+            slots (int): Número de baldes por nível.
+            levels (int): Número de níveis.
+            start (int): Timeslot inicial.
+        """
+        self._slots = slots
+        self._levels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._overflow = []
+        self._now = start
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def now(self) -> int:
+        """
+        Timeslot atual da roda.
+        """
+        return self._now
+
+    def _insert(self, deadline: int, item):
+        for level, span in enumerate(self._spans[:-1]):
+            if deadline // self._spans[level + 1] == self._now // self._spans[level + 1]:
+                self._levels[level][(deadline // span) % self._slots].append((deadline, item))
+                return
+        self._overflow.append((deadline, item))
+
+    def schedule(self, deadline: int, item):
+        """
+        Agenda um item. Prazos que já passaram vencem no próximo timeslot.
+
+        Args:
+            deadline (int): Timeslot em que o item vence.
+            item (object): Item agendado.
+        """
+        self._insert(max(deadline, self._now + 1), item)
+        self._count += 1
+
+    def advance(self, now: int) -> list:
+        """
+        Avança o relógio da roda até now.
+
+        Args:
+            now (int): Novo timeslot. Não pode ser anterior ao atual.
+
+        Returns:
+            list : Itens vencidos, na ordem dos prazos.
+        """
+        if now < self._now:
+            raise ValueError(f'A roda está no timeslot {self._now} e não pode voltar para {now}.')
+        expired = []
+        while self._now < now:
+            self._now += 1
+            t = self._now
+            if t % self._spans[-1] == 0:
+                pending, self._overflow = self._overflow, []
+                for deadline, item in pending:
+                    self._insert(deadline, item)
+            # Os baldes que começam agora descem de nível, do mais alto para o mais baixo
+            for level in range(len(self._levels) - 1, 0, -1):
+                span = self._spans[level]
+                if t % span == 0:
+                    bucket = self._levels[level][(t // span) % self._slots]
+                    self._levels[level][(t // span) % self._slots] = []
+                    for deadline, item in bucket:
+                        self._insert(deadline, item)
+            bucket = self._levels[0][t % self._slots]
+            if bucket:
+                self._levels[0][t % self._slots] = []
+                expired.extend(item for _, item in bucket)
+                self._count -= len(bucket)
+        return expired
+
+    def clear(self, start: int = None):
+        """
+        Remove todos os itens.
+
+        Args:
+            start (int, optional): Novo timeslot atual. Por padrão, mantém o atual.
+        """
+        for level in self._levels:
+            for index in range(self._slots):
+                level[index] = []
+        self._overflow = []
+        self._count = 0
+        if start is not None:
+            self._now = start
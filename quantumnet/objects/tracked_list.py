@@ -0,0 +1,198 @@
+import copy
+
+class DirtySet(set):
+    """
+    Conjunto de entradas sujas com um contador de versão, incrementado a cada mudança estrutural
+    (inserção ou remoção de elementos) das listas rastreadas. Esvaziar o conjunto não altera a versão.
+    Um ouvinte opcional é avisado dos elementos inseridos nas listas.
+    """
+    def __init__(self, iterable=(), version: int = 0) -> None:
+        super().__init__(iterable)
+        self.version = version
+        self.listener = None  # Função (chave, elementos) chamada a cada inserção
+
+    def changed(self):
+        """
+        Registra uma mudança estrutural.
+        """
+        self.version += 1
+
+    def inserted(self, key, items):
+        """
+        Avisa o ouvinte dos elementos inseridos em uma lista.
+
+        Args:
+            key (hashable): Chave da lista.
+            items (list): Elementos inseridos.
+        """
+        if self.listener is not None and items:
+            self.listener(key, items)
+
+
+class TrackedList(list):
+    """
+    Lista que registra sua chave em um conjunto de entradas sujas a cada modificação. Usada nos
+    canais (pares EPR) e nas memórias dos hosts para que um snapshot da rede seja restaurado
+    copiando apenas o que mudou.
+
+    Uma lista compartilhada (ver share) divide seus elementos com outra rede e os copia na primeira
+    modificação, implementando a cópia sob escrita de Network.fork. Referências aos elementos
+    obtidas antes da cópia continuam valendo em remove e index.
+    """
+    __slots__ = ('_dirty', '_key', '_shared', '_origin')
+
+    def __init__(self, iterable=(), dirty: set = None, key=None) -> None:
+        """
+        Args:
+            iterable (iterable): Elementos iniciais.
+            dirty (DirtySet, optional): Conjunto onde a chave é registrada quando a lista muda.
+            key (hashable, optional): Chave da lista, por exemplo a aresta do canal ou o ID do host.
+        """
+        super().__init__(iterable)
+        self._dirty = dirty
+        self._key = key
+        self._shared = False
+        self._origin = None  # Elemento original -> cópia, para referências anteriores à cópia sob escrita
+
+    def __reduce_ex__(self, protocol):
+        # Copiar ou serializar a lista não deve marcá-la como modificada
+        return (TrackedList, (list(self), self._dirty, self._key))
+
+    @property
+    def key(self):
+        """
+        Chave da lista.
+        """
+        return self._key
+
+    def track(self, dirty: set, key):
+        """
+        Passa a registrar as modificações da lista no conjunto informado.
+
+        Args:
+            dirty (set): Conjunto de entradas sujas.
+            key (hashable): Chave da lista.
+        """
+        self._dirty = dirty
+        self._key = key
+
+    def share(self, dirty: set = None) -> 'TrackedList':
+        """
+        Cria uma lista com os mesmos elementos, sem copiá-los. As duas listas passam a ser
+        compartilhadas e cada uma copia seus elementos antes da primeira modificação.
+
+        Args:
+            dirty (set, optional): Conjunto de entradas sujas da nova lista.
+
+        Returns:
+            TrackedList : Nova lista, com a mesma chave.
+        """
+        other = TrackedList(self, dirty, self._key)
+        other._shared = True
+        self._shared = True
+        self._origin = None
+        return other
+
+    def touch(self):
+        """
+        Marca a lista como modificada. Usado quando os elementos são alterados sem mudar a lista,
+        como na decoerência. Uma lista compartilhada copia seus elementos antes.
+        """
+        if self._shared:
+            self._shared = False
+            copies = [copy.copy(item) for item in self]
+            self._origin = {id(item): (item, twin) for item, twin in zip(self, copies)}
+            list.__setitem__(self, slice(None), copies)
+        if self._dirty is not None:
+            self._dirty.add(self._key)
+
+    def _modified(self):
+        # Mudança estrutural: além de marcar a lista, incrementa a versão do conjunto
+        self.touch()
+        if self._dirty is not None:
+            self._dirty.changed()
+
+    def _inserted(self, items):
+        if isinstance(self._dirty, DirtySet):
+            self._dirty.inserted(self._key, items)
+
+    def _resolve(self, item):
+        # Traduz um elemento original, anterior à cópia sob escrita, para a cópia da lista
+        if self._origin:
+            entry = self._origin.get(id(item))
+            if entry is not None and entry[0] is item:
+                return entry[1]
+        return item
+
+    def replace(self, items):
+        """
+        Substitui o conteúdo da lista sem marcá-la como modificada. Os novos elementos pertencem à lista.
+
+        Args:
+            items (iterable): Novo conteúdo.
+        """
+        self._shared = False
+        self._origin = None
+        list.__setitem__(self, slice(None), items)
+
+    def index(self, item, *args):
+        return super().index(self._resolve(item), *args)
+
+    def append(self, item):
+        self._modified()
+        super().append(item)
+        self._inserted((item,))
+
+    def extend(self, items):
+        items = list(items)
+        self._modified()
+        super().extend(items)
+        self._inserted(items)
+
+    def insert(self, index, item):
+        self._modified()
+        super().insert(index, item)
+        self._inserted((item,))
+
+    def pop(self, index=-1):
+        self._modified()
+        return super().pop(index)
+
+    def remove(self, item):
+        # A posição é buscada antes da cópia dos elementos de uma lista compartilhada
+        index = self.index(item)
+        self._modified()
+        super().__delitem__(index)
+
+    def clear(self):
+        self._modified()
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._modified()
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._modified()
+        super().reverse()
+
+    def __setitem__(self, index, value):
+        value = list(value) if isinstance(index, slice) else value
+        self._modified()
+        super().__setitem__(index, value)
+        self._inserted(value if isinstance(index, slice) else (value,))
+
+    def __delitem__(self, index):
+        self._modified()
+        super().__delitem__(index)
+
+    def __iadd__(self, items):
+        items = list(items)
+        self._modified()
+        result = super().__iadd__(items)
+        self._inserted(items)
+        return result
+
+    def __imul__(self, n):
+        self._modified()
+        return super().__imul__(n)
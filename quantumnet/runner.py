@@ -0,0 +1,360 @@
+import csv
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .components import Network, Controller, EprProvisioner, CutoffPolicy, RequestStream
+
+# Colunas dos arquivos simulation*_results.csv
+FIELDNAMES = ["simulation_id", "protocol", "success_count", "failure_count", "total_eprs_used", "average_fidelity"]
+# Métricas coletadas além das colunas de FIELDNAMES, incluídas nas saídas só quando pedidas (extra_fields)
+EXTRA_FIELDS = ["goodput"]
+PROTOCOLS = ["AC_BQC", "BFK_BQC"]
+
+# Redes já construídas em cada processo de trabalho, uma por topologia, com o snapshot do estado inicial
+_templates = {}
+
+
+def _init_worker(quiet: bool = True):
+    """
+    Inicializa um processo de trabalho: importa o simulador uma única vez e silencia a saída.
+
+    Args:
+        quiet (bool): Se True, descarta os prints da simulação no processo de trabalho.
+    """
+    import matplotlib
+    matplotlib.use("Agg")  # Sem janelas interativas nos processos de trabalho
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+
+
+def _topology_key(config: dict) -> tuple:
+    return (tuple(config["topology"]), config.get("topology_file"), tuple(config["clients"]), config["server"],
+            config.get("topology_seed"))
+
+
+def topology_seed(config: dict) -> int:
+    """
+    Semente da construção da topologia: 'topology_seed' da configuração ou, sem ela, um hash da
+    descrição da topologia. Topologias aleatórias (waxman, geometrica, barabasi_albert) saem iguais
+    em todos os processos de trabalho e em cada replay.
+
+    Args:
+        config (dict): Configuração da simulação.
+
+    Returns:
+        int : Semente da rede modelo.
+    """
+    if config.get("topology_seed") is not None:
+        return config["topology_seed"]
+    digest = hashlib.sha256(repr(_topology_key(config)[:-1]).encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def build_network(config: dict) -> Network:
+    """
+    Constrói a rede descrita na configuração da simulação.
+
+    Args:
+        config (dict): Configuração com 'topology', 'clients' e 'server'. Se 'topology_file' for
+            informado, a topologia é lida desse arquivo (Network.load_topology) no lugar de 'topology'.
+            A rede é criada com a semente de topology_seed.
+
+    Returns:
+        Network : Rede com a topologia, hosts, canais e pares EPR inicializados.
+    """
+    network = Network(seed=topology_seed(config))
+    if config.get("topology_file"):
+        network.load_topology(config["topology_file"], clients=list(config["clients"]), server=config["server"])
+    else:
+        network.set_ready_topology(*config["topology"], clients=list(config["clients"]), server=config["server"])
+    return network
+
+
+def get_network(config: dict, seed: int = None) -> Network:
+    """
+    Retorna uma rede pronta para uma nova simulação. A topologia é construída apenas uma vez
+    por processo e, a cada simulação, a rede é restaurada para o snapshot do estado inicial.
+
+    Args:
+        config (dict): Configuração da simulação.
+        seed (int | np.random.SeedSequence, optional): Semente da simulação, aplicada depois da construção da topologia.
+
+    Returns:
+        Network : Rede no estado inicial da topologia.
+    """
+    key = _topology_key(config)
+    if key not in _templates:
+        network = build_network(config)
+        _templates[key] = (network, network.snapshot())
+    network, snapshot = _templates[key]
+    network.restore(snapshot)
+    if seed is not None:
+        network.reseed(seed)
+    if config.get("decoherence_factor") is not None:
+        network.decoherence_factor = config["decoherence_factor"]
+    # Cada simulação sorteia os próprios canais, como se a rede tivesse sido criada do zero
+    network.draw_channel_probabilities()
+    return network
+
+
+def run_simulation(network: Network, config: dict, simulation_id: int) -> dict:
+    """
+    Roda uma simulação e coleta as métricas.
+
+    Args:
+        network (Network): Rede no estado inicial.
+        config (dict): Configuração da simulação, como em SimulationRunner.make_config. As chaves
+            ausentes valem as de sweep.DEFAULT_CONFIG. Com 'requests_file', as requisições são lidas
+            do arquivo sob demanda (RequestStream) e consumidas em blocos de 'request_buffer', no
+            lugar de 'num_requests' requisições geradas.
+        simulation_id (int): ID da simulação.
+
+    Returns:
+        dict: Métricas com as colunas de FIELDNAMES e de EXTRA_FIELDS.
+    """
+    from .sweep import DEFAULT_CONFIG  # sweep importa este módulo
+    config = {**DEFAULT_CONFIG, **config}
+    controller = Controller(network)
+    controller.deadline_scheduling = config["deadline_scheduling"]
+    controller.concurrent_execution = config["concurrent_execution"]
+    controller.request_batching = config["request_batching"]
+    network.provisioner = EprProvisioner() if config["epr_provisioning"] else None
+    network.set_eviction_policy(config["memory_eviction"])
+    network.set_graph_backend(config["graph_backend"])
+    if config["fidelity_cutoff"]:
+        CutoffPolicy().attach(network)
+    elif network.cutoff is not None:
+        network.cutoff.detach()
+    protocol_name = config["protocol"]
+    clients = list(config["clients"])
+
+    if config["requests_file"]:
+        # Requisições sem protocolo no arquivo usam o da configuração; "Random" mantém o sorteio
+        stream = RequestStream(config["requests_file"], network, protocol=None if protocol_name == "Random" else protocol_name,
+                               scenario=config["scenario"])
+        controller.consume(stream, buffer_size=config["request_buffer"])
+        return collect_metrics(network, controller, protocol_name, simulation_id)
+
+    for _ in range(config["num_requests"]):
+        alice_id = network.rng['workload'].choice(clients)
+        request = network.generate_request(
+            alice_id=alice_id,
+            bob_id=config["server"],
+            num_qubits=config["num_qubits"],
+            num_gates=config["num_gates"],
+            scenario=config["scenario"]
+        )
+        # "Random" mantém o protocolo sorteado na geração da requisição
+        if protocol_name != "Random":
+            request['protocol'] = protocol_name
+        controller.receive_request(request)
+
+    controller.process_requests()
+    controller.send_scheduled_requests()
+    return collect_metrics(network, controller, protocol_name, simulation_id)
+
+
+def collect_metrics(network: Network, controller: Controller, protocol_name: str, simulation_id: int) -> dict:
+    """
+    Coleta as métricas de uma simulação já executada.
+
+    Returns:
+        dict: Métricas com as colunas de FIELDNAMES e de EXTRA_FIELDS.
+    """
+    schedule_report = controller.generate_schedule_report()
+    return {
+        "simulation_id": simulation_id,
+        "protocol": protocol_name,
+        "success_count": schedule_report.get("success", 0),
+        "failure_count": schedule_report.get("failed", 0),
+        "total_eprs_used": network.get_total_useds_eprs(),
+        "average_fidelity": network.application_layer.avg_fidelity_on_applicationlayer(),
+        "goodput": schedule_report.get("goodput", 0.0),
+    }
+
+
+def _run_task(task):
+    config, simulation_id, seed = task
+    network = get_network(config, seed)
+    return run_simulation(network, config, simulation_id)
+
+
+def execute_tasks(tasks: list, num_workers: int = None, quiet: bool = True):
+    """
+    Executa tarefas (config, simulation_id, seed) em um conjunto de processos de trabalho.
+
+    Args:
+        tasks (list): Tarefas a executar.
+        num_workers (int, optional): Número de processos. Por padrão, um por núcleo. Com 1, executa no processo atual.
+        quiet (bool): Se True, descarta os prints das simulações.
+
+    Yields:
+        tuple : (índice da tarefa, métricas), na ordem em que as tarefas terminam.
+    """
+    num_workers = num_workers or os.cpu_count() or 1
+    if num_workers == 1:
+        for index, task in enumerate(tasks):
+            yield index, _run_task(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker, initargs=(quiet,)) as executor:
+        futures = {executor.submit(_run_task, task): index for index, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+class SimulationRunner():
+    """
+    Executa várias simulações independentes em um conjunto de processos de trabalho.
+    """
+    def __init__(self, topology=('grade', 8, 4, 4), clients=(8, 2), server: int = 0, num_workers: int = None, seed: int = None, quiet: bool = True) -> None:
+        """
+        Args:
+            topology (tuple): Argumentos de set_ready_topology, por exemplo ('grade', 8, 4, 4).
+            clients (list): IDs dos nós clientes.
+            server (int): ID do nó servidor.
+            num_workers (int, optional): Número de processos. Por padrão, um por núcleo.
+            seed (int, optional): Semente base da varredura. Cada simulação recebe um fluxo derivado dela.
+            quiet (bool): Se True, descarta os prints das simulações.
+        """
+        self.topology = tuple(topology)
+        self.clients = tuple(clients)
+        self.server = server
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        self.quiet = quiet
+
+    def make_config(self, protocol_name: str, num_requests: int, **options) -> dict:
+        """
+        Monta a configuração de uma simulação: DEFAULT_CONFIG com a topologia do executor, o
+        protocolo, o número de requisições e as opções informadas.
+
+        Args:
+            protocol_name (str): "AC_BQC", "BFK_BQC" ou "Random".
+            num_requests (int): Número de requisições geradas.
+            **options: Outras chaves de sweep.DEFAULT_CONFIG, onde estão descritas: num_qubits, num_gates,
+                scenario, decoherence_factor, deadline_scheduling, concurrent_execution, request_batching,
+                epr_provisioning, fidelity_cutoff, memory_eviction, graph_backend, topology_file,
+                requests_file, request_buffer e topology_seed. Sem topology_seed, a semente da
+                topologia é derivada da semente base.
+
+        Returns:
+            dict: Configuração da simulação.
+        """
+        from .sweep import DEFAULT_CONFIG  # sweep importa este módulo
+        fixed = ("topology", "clients", "server", "protocol", "num_requests")
+        unknown = [name for name in options if name not in DEFAULT_CONFIG or name in fixed]
+        if unknown:
+            raise ValueError(f"Opções desconhecidas: {unknown}. Opções: {[name for name in DEFAULT_CONFIG if name not in fixed]}.")
+        config = dict(DEFAULT_CONFIG)
+        config.update(topology=self.topology, clients=self.clients, server=self.server,
+                      protocol=protocol_name, num_requests=num_requests)
+        config.update(options)
+        if config["topology_seed"] is None:
+            config["topology_seed"] = self.topology_seed()
+        return config
+
+    def topology_seed(self) -> int:
+        """
+        Semente da topologia derivada da semente base, comum a todas as simulações do executor.
+
+        Returns:
+            int : Semente da rede modelo.
+        """
+        return int(np.random.SeedSequence(self.seed).generate_state(1)[0])
+
+    def seed_for(self, simulation_id: int) -> np.random.SeedSequence:
+        """
+        Semente da simulação simulation_id, derivada da semente base. Não depende da ordem
+        nem do processo em que as simulações são executadas.
+
+        Args:
+            simulation_id (int): ID da simulação (a partir de 1).
+
+        Returns:
+            np.random.SeedSequence : Semente da simulação.
+        """
+        return np.random.SeedSequence(self.seed, spawn_key=(simulation_id - 1,))
+
+    def replay(self, simulation_id: int, num_requests: int, protocol_name: str, **options) -> dict:
+        """
+        Reexecuta, no processo atual, uma simulação de uma varredura com a mesma semente.
+
+        Args:
+            simulation_id (int): ID da simulação a reproduzir.
+            num_requests (int): Número de requisições por simulação.
+            protocol_name (str): "AC_BQC", "BFK_BQC" ou "Random".
+            **options: Opções repassadas a make_config, chaves de sweep.DEFAULT_CONFIG.
+
+        Returns:
+            dict: Métricas da simulação, idênticas às da varredura original.
+        """
+        config = self.make_config(protocol_name, num_requests, **options)
+        return _run_task((config, simulation_id, self.seed_for(simulation_id)))
+
+    def run(self, num_simulations: int, num_requests: int, protocol_name: str, output_file: str = None, extra_fields=(), **options) -> list:
+        """
+        Executa as simulações em paralelo e reúne os resultados.
+
+        Args:
+            num_simulations (int): Número de simulações.
+            num_requests (int): Número de requisições por simulação.
+            protocol_name (str): "AC_BQC", "BFK_BQC" ou "Random".
+            output_file (str, optional): Arquivo CSV para salvar os resultados.
+            extra_fields (list): Colunas de EXTRA_FIELDS incluídas no CSV, depois das de FIELDNAMES.
+            **options: Opções repassadas a make_config, chaves de sweep.DEFAULT_CONFIG.
+
+        Returns:
+            list: Métricas de cada simulação, ordenadas por simulation_id.
+        """
+        config = self.make_config(protocol_name, num_requests, **options)
+        tasks = [(config, simulation_id, self.seed_for(simulation_id)) for simulation_id in range(1, num_simulations + 1)]
+
+        results = [result for _, result in execute_tasks(tasks, self.num_workers, self.quiet)]
+
+        results.sort(key=lambda row: row["simulation_id"])
+        if output_file is not None:
+            write_csv(results, output_file, extra_fields)
+        return results
+
+
+def _fieldnames(extra_fields) -> list:
+    unknown = [name for name in extra_fields if name not in EXTRA_FIELDS]
+    if unknown:
+        raise ValueError(f"Colunas desconhecidas: {unknown}. Opções: {EXTRA_FIELDS}.")
+    return FIELDNAMES + list(extra_fields)
+
+
+def write_csv(results: list, output_file: str, extra_fields=()):
+    """
+    Salva as métricas das simulações em um arquivo CSV, com as colunas dos arquivos
+    simulation*_results.csv.
+
+    Args:
+        results (list): Métricas de cada simulação.
+        output_file (str): Nome do arquivo CSV.
+        extra_fields (list): Colunas de EXTRA_FIELDS incluídas depois das de FIELDNAMES, como ["goodput"].
+    """
+    with open(output_file, mode='w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=_fieldnames(extra_fields), extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def to_dataframe(results: list, extra_fields=()):
+    """
+    Converte as métricas das simulações em um DataFrame do pandas.
+
+    Args:
+        results (list): Métricas de cada simulação.
+        extra_fields (list): Colunas de EXTRA_FIELDS incluídas depois das de FIELDNAMES.
+
+    Returns:
+        pandas.DataFrame : Uma linha por simulação, com as colunas de FIELDNAMES e extra_fields.
+    """
+    import pandas as pd
+    return pd.DataFrame(results, columns=_fieldnames(extra_fields))
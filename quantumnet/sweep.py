@@ -0,0 +1,223 @@
+import csv
+import hashlib
+import itertools
+import json
+import os
+
+import numpy as np
+
+from .runner import FIELDNAMES, execute_tasks
+
+# Configuração padrão dos pontos da varredura, a mesma dos notebooks de simulação. Também define
+# as opções aceitas por SimulationRunner.make_config e os valores usados por run_simulation
+DEFAULT_CONFIG = {
+    "topology": ('grade', 8, 4, 4),  # Argumentos de set_ready_topology
+    "clients": (8, 2),  # IDs dos nós clientes
+    "server": 0,  # ID do nó servidor
+    "protocol": "AC_BQC",  # "AC_BQC", "BFK_BQC" ou "Random"
+    "num_requests": 10,  # Número de requisições geradas
+    "num_qubits": 10,  # Número de qubits de cada requisição
+    "num_gates": 20,  # Número de portas do circuito de cada requisição
+    "scenario": 1,  # Cenário das requisições
+    "decoherence_factor": None,  # Fator de decoerência (None = o da rede)
+    "deadline_scheduling": False,  # Atende as requisições por prazo de fidelidade (Controller.deadline_scheduling)
+    "concurrent_execution": False,  # Executa juntas as requisições independentes de um timeslot (Controller.concurrent_execution)
+    "request_batching": False,  # Une requisições compatíveis em uma transferência (Controller.request_batching)
+    "epr_provisioning": False,  # Pré-provisiona pares EPR nas rotas mais usadas (EprProvisioner)
+    "fidelity_cutoff": False,  # Descarta pares EPR e qubits abaixo da fidelidade mínima (CutoffPolicy)
+    "memory_eviction": None,  # Limita as memórias com a política 'fifo', 'lowest_fidelity' ou 'oldest' (None = sem limite)
+    "graph_backend": "auto",  # Backend de grafos: 'auto', 'networkx' ou 'rustworkx'
+    "topology_file": None,  # Arquivo de topologia lido no lugar de topology (Network.load_topology)
+    "requests_file": None,  # Arquivo de requisições lido no lugar das num_requests geradas (RequestStream)
+    "request_buffer": 1024,  # Número de requisições de requests_file consumidas por bloco
+    "topology_seed": None,  # Semente da construção da topologia (None = hash da topologia)
+}
+
+_code_version = None
+
+
+def code_version() -> str:
+    """
+    Hash do código-fonte do pacote quantumnet. Qualquer alteração no simulador invalida o cache.
+
+    Returns:
+        str : Hash SHA-256 dos arquivos .py do pacote.
+    """
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        for root, dirs, files in os.walk(package_dir):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    path = os.path.join(root, name)
+                    digest.update(os.path.relpath(path, package_dir).encode())
+                    with open(path, 'rb') as file:
+                        digest.update(file.read())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+
+def expand_grid(grid: dict, base: dict = None) -> list:
+    """
+    Expande uma grade de parâmetros no produto cartesiano de seus valores.
+
+    Args:
+        grid (dict): Parâmetro -> lista de valores, por exemplo {'protocol': ['AC_BQC', 'BFK_BQC'], 'num_qubits': [10, 20]}.
+        base (dict, optional): Valores dos parâmetros que não variam. Por padrão, DEFAULT_CONFIG.
+
+    Returns:
+        list : Uma configuração completa por ponto da grade.
+    """
+    base = dict(DEFAULT_CONFIG if base is None else base)
+    keys = list(grid)
+    configs = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        config = dict(base)
+        config.update(zip(keys, values))
+        configs.append(config)
+    return configs
+
+
+def config_hash(config: dict, seed: np.random.SeedSequence) -> str:
+    """
+    Chave de cache de um ponto: hash da configuração, da semente e da versão do código.
+
+    Args:
+        config (dict): Configuração da simulação.
+        seed (np.random.SeedSequence): Semente da simulação.
+
+    Returns:
+        str : Hash SHA-256 em hexadecimal.
+    """
+    payload = {
+        "config": config,
+        "seed": [str(seed.entropy), list(seed.spawn_key)],
+        "code": code_version(),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=list)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ResultCache():
+    """
+    Cache em disco dos resultados das simulações, endereçado pelo hash de cada ponto.
+    """
+    def __init__(self, cache_dir: str = '.quantumnet_cache') -> None:
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f'{key}.json')
+
+    def get(self, key: str):
+        """
+        Retorna o resultado armazenado para a chave, ou None se não existir.
+        """
+        try:
+            with open(self._path(key)) as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, result: dict):
+        """
+        Armazena o resultado de um ponto. A escrita é atômica, então varreduras interrompidas não deixam entradas corrompidas.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(result, file)
+        os.replace(tmp_path, path)
+
+
+class ParameterSweep():
+    """
+    Varredura de parâmetros: expande a grade, executa os pontos em paralelo e reaproveita os
+    resultados já calculados em execuções anteriores.
+    """
+    def __init__(self, grid: dict, base: dict = None, num_seeds: int = 1, seed: int = 0, cache_dir: str = '.quantumnet_cache', num_workers: int = None, quiet: bool = True) -> None:
+        """
+        Args:
+            grid (dict): Parâmetro -> lista de valores (protocol, scenario, num_qubits, decoherence_factor, topology, ...).
+            base (dict, optional): Valores dos parâmetros fixos. Por padrão, DEFAULT_CONFIG.
+            num_seeds (int): Número de repetições (sementes) por ponto da grade.
+            seed (int): Semente base. A repetição i usa a mesma semente em todos os pontos.
+            cache_dir (str, optional): Diretório do cache. Se None, o cache é desativado.
+            num_workers (int, optional): Número de processos. Por padrão, um por núcleo.
+            quiet (bool): Se True, descarta os prints das simulações.
+        """
+        self.grid = grid
+        self.configs = expand_grid(grid, base)
+        self.num_seeds = num_seeds
+        self.seed = seed
+        self.cache = ResultCache(cache_dir) if cache_dir is not None else None
+        self.num_workers = num_workers
+        self.quiet = quiet
+
+    def points(self) -> list:
+        """
+        Lista os pontos da varredura.
+
+        Returns:
+            list : Tuplas (config, simulation_id, seed), uma por configuração e repetição.
+        """
+        return [(config, index + 1, np.random.SeedSequence(self.seed, spawn_key=(index,)))
+                for config in self.configs for index in range(self.num_seeds)]
+
+    def _row(self, config: dict, metrics: dict) -> dict:
+        row = {key: config[key] for key in self.grid}
+        row.update(metrics)
+        return row
+
+    def run(self, output_file: str = None) -> list:
+        """
+        Executa os pontos que ainda não estão no cache e reúne todos os resultados.
+
+        Args:
+            output_file (str, optional): Arquivo CSV para salvar os resultados.
+
+        Returns:
+            list : Uma linha por ponto, com os parâmetros da grade e as métricas de FIELDNAMES.
+        """
+        points = self.points()
+        results = [None] * len(points)
+        keys = [config_hash(config, seed) for config, _, seed in points]
+
+        pending = []
+        for index, key in enumerate(keys):
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append(index)
+
+        tasks = [points[index] for index in pending]
+        for task_index, metrics in execute_tasks(tasks, self.num_workers, self.quiet):
+            index = pending[task_index]
+            results[index] = metrics
+            if self.cache is not None:
+                self.cache.put(keys[index], metrics)
+
+        rows = [self._row(config, metrics) for (config, _, _), metrics in zip(points, results)]
+        if output_file is not None:
+            fieldnames = list(self.grid) + [name for name in FIELDNAMES if name not in self.grid]
+            with open(output_file, mode='w', newline='') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(rows)
+        return rows
+
+    def to_dataframe(self, rows: list):
+        """
+        Converte as linhas da varredura em um DataFrame do pandas.
+
+        Args:
+            rows (list): Linhas retornadas por run().
+
+        Returns:
+            pandas.DataFrame : Uma linha por ponto da varredura.
+        """
+        import pandas as pd
+        return pd.DataFrame(rows)
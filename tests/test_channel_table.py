@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from quantumnet.objects import ChannelTable
+
+
+def test_ids_are_dense_and_orientation_free():
+    table = ChannelTable(capacity=2)
+    ids = table.add_many([(1, 0), (1, 2), (3, 2)], [[], [], []])
+    assert ids.tolist() == [0, 1, 2]
+    assert table.id(0, 1) == table.id(1, 0) == 0
+    assert (2, 1) in table
+    assert list(table) == [(0, 1), (1, 2), (2, 3)]
+    assert len(table) == 3
+
+
+def test_columns_and_removal():
+    table = ChannelTable()
+    table.add(0, 1, [])
+    table.add(1, 2, [])
+    table.set(1, 0, 'prob_on_demand_epr_create', 0.5)
+    assert table.get(0, 1, 'prob_on_demand_epr_create') == 0.5
+    table.column('prob_replay_epr_create')[table.ids()] = 0.25
+    assert table.get(2, 1, 'prob_replay_epr_create') == 0.25
+
+    table.remove(0, 1)
+    assert (0, 1) not in table
+    assert table.ids().tolist() == [1]
+    assert np.isnan(table.column('prob_on_demand_epr_create')[0])
+    assert table.get_id(0, 1) == -1
+    with pytest.raises(KeyError):
+        table.eprs(0, 1)
+
+    # A aresta removida volta com o ID antigo
+    assert table.add(1, 0, []) == 0
+
+
+def test_eprs_and_route_ids():
+    table = ChannelTable()
+    store = ['epr']
+    table.add(0, 1, store)
+    table.add(1, 2, [])
+    assert table.eprs(1, 0) is store
+    assert table.get_eprs(5, 6, 'none') == 'none'
+    assert table.route_ids([0, 1, 2]).tolist() == [0, 1]
+    assert table.keys_of([1, -1, 0]) == [(1, 2), (0, 1)]
+
+
+def test_copy_shares_stores_but_not_columns():
+    table = ChannelTable()
+    store = []
+    table.add(0, 1, store)
+    table.set(0, 1, 'prob_on_demand_epr_create', 0.1)
+    other = table.copy()
+    other.set(0, 1, 'prob_on_demand_epr_create', 0.9)
+    other.add(1, 2, [])
+    assert table.get(0, 1, 'prob_on_demand_epr_create') == pytest.approx(0.1)
+    assert other.eprs(0, 1) is store
+    assert (1, 2) not in table
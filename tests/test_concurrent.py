@@ -0,0 +1,53 @@
+from quantumnet.runner import SimulationRunner, get_network
+from quantumnet.components.snapshot import MERGE_STATE
+
+SERVER = 27
+# Rotas disjuntas até o servidor da grade 8x8, uma por grupo de execute_concurrent
+PATHS = [[3, 11, 19, 27], [24, 25, 26, 27], [31, 30, 29, 28, 27], [59, 51, 43, 35, 27]]
+
+
+def build():
+    runner = SimulationRunner(topology=('grade', 8, 8, 8), seed=7, num_workers=1)
+    config = runner.make_config("BFK_BQC", 1, num_qubits=3, num_gates=4)
+    network = get_network(config, runner.seed_for(1))
+    requests = []
+    for path in PATHS:
+        request = network.generate_request(alice_id=path[0], bob_id=SERVER, num_qubits=3, num_gates=4, scenario=1)
+        request['protocol'] = 'BFK_BQC'
+        request['slice_path'] = path
+        requests.append(request)
+    return network, requests
+
+
+def state(network):
+    counters = {}
+    for owner_name, attrs in MERGE_STATE.items():
+        owner = network if owner_name == 'network' else getattr(network, owner_name)
+        for attr in attrs:
+            value = getattr(owner, attr)
+            counters[(owner_name, attr)] = len(value) if isinstance(value, (list, dict)) else value
+    channels = {key: sorted(epr.epr_id for epr in eprs) for key, eprs in network.channels.items()}
+    memories = {host_id: [qubit.qubit_id for qubit in host.memory] for host_id, host in network.hosts.items()}
+    return counters, channels, memories
+
+
+def test_groups_are_disjoint():
+    network, requests = build()
+    groups, unrouted = network.independent_groups(requests)
+    assert sorted(sorted(indices) for _, indices in groups) == [[0], [1], [2], [3]]
+    assert unrouted == []
+
+
+def test_merged_forks_match_sequential_execution():
+    sequential, requests = build()
+    for request in requests:
+        sequential.execute_request(request)
+
+    concurrent, requests = build()
+    concurrent.execute_concurrent(requests)
+
+    counters, channels, memories = state(concurrent)
+    expected_counters, expected_channels, expected_memories = state(sequential)
+    assert counters == expected_counters
+    assert channels == expected_channels
+    assert memories == expected_memories
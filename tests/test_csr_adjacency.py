@@ -0,0 +1,58 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from quantumnet.objects import ChannelTable, CsrAdjacency
+
+
+@pytest.fixture
+def graph():
+    return nx.grid_2d_graph(4, 5)
+
+
+def adjacency_of(graph):
+    graph = nx.convert_node_labels_to_integers(graph)
+    table = ChannelTable()
+    table.add_many(list(graph.edges), [[] for _ in graph.edges])
+    return graph, table, CsrAdjacency(graph, lambda u, v: table.get_id(u, v))
+
+
+def test_neighbors_and_edges_match_graph(graph):
+    graph, table, adjacency = adjacency_of(graph)
+    assert len(adjacency) == graph.number_of_nodes()
+    for node in graph.nodes:
+        assert adjacency.neighbors(node).tolist() == sorted(graph.neighbors(node))
+        assert adjacency.degree(node) == graph.degree(node)
+        assert adjacency.incident_edges(node).tolist() == [table.id(node, neighbor) for neighbor in sorted(graph.neighbors(node))]
+    for u, v in graph.edges:
+        assert adjacency.has_edge(u, v) and adjacency.has_edge(v, u)
+        assert adjacency.edge_id(v, u) == table.id(u, v)
+    assert not adjacency.has_edge(0, 19)
+    assert adjacency.edge_id(0, 19) == -1
+    assert adjacency.edge_id(100, 0) == -1
+
+
+def test_missing_nodes(graph):
+    _, _, adjacency = adjacency_of(graph)
+    with pytest.raises(KeyError):
+        adjacency.neighbors(100)
+    assert adjacency.positions([0, 100, -1]).tolist() == [0, -1, -1]
+
+
+def test_incidences_and_induced_edges(graph):
+    graph, table, adjacency = adjacency_of(graph)
+    nodes = [0, 1, 5, 6, 100]
+    sources, targets, edge_ids = adjacency.incidences(nodes)
+    expected = [(node, neighbor) for node in nodes if node in graph for neighbor in sorted(graph.neighbors(node))]
+    assert list(zip(sources.tolist(), targets.tolist())) == expected
+    assert edge_ids.tolist() == [table.id(u, v) for u, v in expected]
+
+    induced = adjacency.induced_edges(nodes)
+    assert sorted(induced.tolist()) == sorted(table.id(u, v) for u, v in graph.subgraph(nodes).edges)
+
+
+def test_arrays_are_read_only(graph):
+    _, _, adjacency = adjacency_of(graph)
+    with pytest.raises(ValueError):
+        adjacency.indices[0] = 1
+    assert np.all(adjacency.edge_ids >= 0)
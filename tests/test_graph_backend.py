@@ -0,0 +1,67 @@
+import networkx as nx
+import pytest
+
+from quantumnet.components import NetworkxBackend, AutoBackend, make_graph_backend
+
+rx = pytest.importorskip('rustworkx')
+
+
+@pytest.fixture(params=['grade', 'waxman'])
+def graph(request):
+    if request.param == 'grade':
+        return nx.convert_node_labels_to_integers(nx.grid_2d_graph(6, 6))
+    graph = nx.waxman_graph(60, beta=0.6, alpha=0.3, seed=3)
+    return graph.subgraph(max(nx.connected_components(graph), key=len)).copy()
+
+
+def test_shortest_paths_have_same_length(graph):
+    native, python = make_graph_backend('rustworkx'), NetworkxBackend()
+    nodes = sorted(graph.nodes)
+    for source, target in [(nodes[0], nodes[-1]), (nodes[3], nodes[len(nodes) // 2]), (nodes[1], nodes[1])]:
+        path = native.shortest_path(graph, source, target)
+        assert path[0] == source and path[-1] == target
+        assert all(graph.has_edge(u, v) for u, v in zip(path, path[1:]))
+        assert len(path) == len(python.shortest_path(graph, source, target))
+
+
+def test_weighted_shortest_path_has_same_cost(graph):
+    for index, (u, v) in enumerate(sorted(graph.edges)):
+        graph.edges[u, v]['weight'] = 1 + index % 3
+    native, python = make_graph_backend('rustworkx'), NetworkxBackend()
+    nodes = sorted(graph.nodes)
+    cost = lambda path: sum(graph.edges[u, v]['weight'] for u, v in zip(path, path[1:]))
+    assert cost(native.shortest_path(graph, nodes[0], nodes[-1], 'weight')) == cost(python.shortest_path(graph, nodes[0], nodes[-1], 'weight'))
+
+
+def test_all_shortest_paths_match(graph):
+    native, python = make_graph_backend('rustworkx'), NetworkxBackend()
+    nodes = sorted(graph.nodes)
+    source, target = nodes[0], nodes[-1]
+    assert sorted(native.all_shortest_paths(graph, source, target)) == sorted(python.all_shortest_paths(graph, source, target))
+
+
+def test_all_pairs_distances_match(graph):
+    native, python = make_graph_backend('rustworkx'), NetworkxBackend()
+    native_paths, python_paths = native.all_pairs_paths(graph), python.all_pairs_paths(graph)
+    assert native_paths.keys() == python_paths.keys()
+    for source, paths in python_paths.items():
+        assert {target: len(path) for target, path in native_paths[source].items()} == {target: len(path) for target, path in paths.items()}
+
+
+def test_errors_match_networkx():
+    graph = nx.Graph([(0, 1), (2, 3)])
+    native = make_graph_backend('rustworkx')
+    with pytest.raises(nx.NetworkXNoPath):
+        native.shortest_path(graph, 0, 3)
+    with pytest.raises(nx.NetworkXNoPath):
+        native.all_shortest_paths(graph, 0, 3)
+    with pytest.raises(nx.NodeNotFound):
+        native.shortest_path(graph, 0, 9)
+
+
+def test_auto_backend_switches_by_size():
+    backend = AutoBackend(threshold=10)
+    assert backend.select(nx.path_graph(5)).name == 'networkx'
+    assert backend.select(nx.path_graph(10)).name == 'rustworkx'
+    with pytest.raises(ValueError):
+        make_graph_backend('igraph')
@@ -0,0 +1,65 @@
+import pytest
+
+from quantumnet.objects import DirtySet, QubitMemory, Qubit
+
+
+def qubits(fidelities, start=0):
+    return [Qubit(start + index, initial_fidelity=fidelity) for index, fidelity in enumerate(fidelities)]
+
+
+def test_unlimited_memory_keeps_everything():
+    memory = QubitMemory(qubits([0.9] * 5))
+    memory.extend(qubits([0.9] * 5, start=5))
+    assert memory.capacity is None
+    assert len(memory) == 10
+    assert memory.evicted == 0
+
+
+def test_fifo_evicts_first_inserted():
+    memory = QubitMemory(capacity=3, eviction='fifo')
+    memory.extend(qubits([0.9] * 5))
+    assert [qubit.qubit_id for qubit in memory] == [2, 3, 4]
+    assert memory.evicted == 2
+    assert memory.find(0) is None
+    assert memory.find(4) is memory[-1]
+
+
+def test_lowest_fidelity_evicts_worst_qubit():
+    memory = QubitMemory(qubits([0.95, 0.91, 0.99]), capacity=3, eviction='lowest_fidelity')
+    memory.append(Qubit(3, initial_fidelity=0.97))
+    assert sorted(qubit.qubit_id for qubit in memory) == [0, 2, 3]
+
+
+def test_oldest_uses_creation_time():
+    created = {0: 5, 1: 1, 2: 3, 3: 9}
+    memory = QubitMemory(qubits([0.9] * 3), capacity=3, eviction='oldest', creation_time=lambda qubit: created[qubit.qubit_id])
+    memory.append(Qubit(3, initial_fidelity=0.9))
+    assert [qubit.qubit_id for qubit in memory] == [0, 2, 3]
+
+
+def test_shrinking_capacity_evicts_and_marks_dirty():
+    dirty = DirtySet()
+    memory = QubitMemory(qubits([0.9] * 4), dirty, 7)
+    memory.set_capacity(2)
+    assert len(memory) == 2
+    assert memory.evicted == 2
+    assert dirty == {7}
+
+
+def test_custom_and_unknown_policies():
+    memory = QubitMemory(qubits([0.9] * 2), capacity=2, eviction=lambda memory: len(memory) - 1)
+    memory.append(Qubit(2, initial_fidelity=0.9))
+    assert [qubit.qubit_id for qubit in memory] == [0, 1]
+    with pytest.raises(ValueError):
+        memory.set_eviction('random')
+
+
+def test_index_follows_removals():
+    memory = QubitMemory(qubits([0.9] * 3))
+    qubit = memory.find(1)
+    assert qubit in memory
+    memory.remove(qubit)
+    assert qubit not in memory
+    assert memory.find(1) is None
+    assert memory.pop(0).qubit_id == 0
+    assert memory.find(0) is None
@@ -0,0 +1,38 @@
+import pytest
+
+from quantumnet.objects import RequestQueue
+
+
+def test_pops_by_priority_then_arrival():
+    queue = RequestQueue(lambda request: request['priority'])
+    for name, priority in [('a', 2), ('b', 1), ('c', 2), ('d', 1)]:
+        queue.push({'name': name, 'priority': priority})
+    assert len(queue) == 4
+    assert queue.peek()['name'] == 'b'
+    assert [queue.pop()['name'] for _ in range(4)] == ['b', 'd', 'a', 'c']
+    assert not queue
+
+
+def test_initial_requests_and_iteration_keep_order():
+    requests = [{'name': name, 'priority': priority} for name, priority in [('a', 3), ('b', 1), ('c', 2)]]
+    queue = RequestQueue(lambda request: request['priority'], requests)
+    assert [request['name'] for request in queue] == ['b', 'c', 'a']
+    assert len(queue) == 3
+
+
+def test_reprioritize_uses_updated_requests():
+    first, second = {'priority': 1}, {'priority': 2}
+    queue = RequestQueue(lambda request: request['priority'], [first, second])
+    first['priority'] = 3
+    assert queue.peek() is first
+    queue.reprioritize()
+    assert queue.pop() is second
+
+
+def test_empty_queue_raises():
+    queue = RequestQueue(lambda request: 0, [{}])
+    queue.clear()
+    with pytest.raises(IndexError):
+        queue.peek()
+    with pytest.raises(IndexError):
+        queue.pop()
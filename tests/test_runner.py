@@ -0,0 +1,38 @@
+import pytest
+
+from quantumnet.runner import SimulationRunner, build_network
+
+
+def runner():
+    return SimulationRunner(topology=('grade', 8, 4, 4), clients=(8, 2), server=0, num_workers=2, seed=11)
+
+
+def test_replay_matches_run():
+    results = runner().run(3, 4, "AC_BQC", num_qubits=4, num_gates=6)
+    assert [row["simulation_id"] for row in results] == [1, 2, 3]
+    for row in results:
+        assert runner().replay(row["simulation_id"], 4, "AC_BQC", num_qubits=4, num_gates=6) == row
+
+
+def test_run_is_repeatable():
+    first = runner().run(2, 4, "BFK_BQC", num_qubits=4, num_gates=6)
+    second = runner().run(2, 4, "BFK_BQC", num_qubits=4, num_gates=6)
+    assert first == second
+
+
+def test_random_topology_is_seeded():
+    config = SimulationRunner(topology=('waxman', 2, 30, 0.8, 0.4), clients=(1, 2), server=0, seed=7).make_config("AC_BQC", 1)
+    edges = [sorted(build_network(config).graph.edges) for _ in range(2)]
+    assert edges[0] == edges[1]
+
+
+def test_make_config_validates_options():
+    from quantumnet.sweep import DEFAULT_CONFIG
+    config = runner().make_config("AC_BQC", 4, num_qubits=3, memory_eviction='fifo')
+    assert config.keys() == DEFAULT_CONFIG.keys()
+    assert config["num_qubits"] == 3 and config["memory_eviction"] == 'fifo'
+    assert config["topology_seed"] == runner().topology_seed()
+    with pytest.raises(ValueError):
+        runner().make_config("AC_BQC", 4, num_qubit=3)
+    with pytest.raises(ValueError):
+        runner().make_config("AC_BQC", 4, server=1)
@@ -0,0 +1,50 @@
+import networkx as nx
+import pytest
+
+from quantumnet.components import plan_slice_paths
+from quantumnet.objects import LinkOccupancy
+
+
+def grid():
+    return nx.convert_node_labels_to_integers(nx.grid_2d_graph(4, 4))
+
+
+@pytest.mark.parametrize("disjoint", ['edge', 'node'])
+def test_paths_are_disjoint(disjoint):
+    graph = grid()
+    clients, server = [0, 3, 12], 5
+    paths = plan_slice_paths(graph, clients, server, disjoint)
+    assert [path[0] for path in paths] == clients
+    for path in paths:
+        assert path[-1] == server
+        assert all(graph.has_edge(u, v) for u, v in zip(path, path[1:]))
+    links = [link for path in paths for link in LinkOccupancy.route_links(path)]
+    assert len(links) == len(set(links))
+    if disjoint == 'node':
+        inner = [node for path in paths for node in path[1:-1]]
+        assert len(inner) == len(set(inner))
+
+
+def test_minimum_total_weight():
+    graph = nx.path_graph(3)
+    graph.add_edge(0, 3, weight=5)
+    graph.add_edge(3, 2, weight=5)
+    paths = plan_slice_paths(graph, [0], 2)
+    assert paths == [[0, 1, 2]]
+
+
+def test_clients_without_disjoint_path_get_none():
+    graph = nx.path_graph(3)
+    paths = plan_slice_paths(graph, [0, 0, 2], 2)
+    assert paths.count(None) == 1
+    assert [0, 1, 2] in paths
+    assert paths[2] == [2]
+
+
+def test_invalid_arguments():
+    graph = nx.path_graph(3)
+    with pytest.raises(ValueError):
+        plan_slice_paths(graph, [0], 2, disjoint='link')
+    with pytest.raises(nx.NodeNotFound):
+        plan_slice_paths(graph, [7], 2)
+    assert graph.number_of_edges() == 2
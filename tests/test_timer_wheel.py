@@ -0,0 +1,51 @@
+import pytest
+
+from quantumnet.objects import TimerWheel
+
+
+def test_items_expire_at_their_deadline():
+    wheel = TimerWheel(slots=4, levels=2)
+    for deadline in (3, 1, 2, 2):
+        wheel.schedule(deadline, deadline)
+    assert len(wheel) == 4
+    assert wheel.advance(1) == [1]
+    assert wheel.advance(2) == [2, 2]
+    assert wheel.advance(3) == [3]
+    assert len(wheel) == 0
+
+
+def test_far_deadlines_cascade_and_overflow():
+    wheel = TimerWheel(slots=4, levels=2)
+    deadlines = [5, 15, 16, 17, 40, 100]
+    for deadline in deadlines:
+        wheel.schedule(deadline, deadline)
+    expired = []
+    for now in range(1, 101):
+        for item in wheel.advance(now):
+            expired.append((now, item))
+    assert expired == [(deadline, deadline) for deadline in deadlines]
+
+
+def test_advance_in_one_step_matches_step_by_step():
+    deadlines = [7, 3, 64, 65, 200, 1]
+    wheel = TimerWheel(slots=8, levels=2)
+    for deadline in deadlines:
+        wheel.schedule(deadline, deadline)
+    assert wheel.advance(200) == sorted(deadlines)
+
+
+def test_past_deadline_expires_next_timeslot():
+    wheel = TimerWheel(start=10)
+    wheel.schedule(4, 'late')
+    assert wheel.advance(11) == ['late']
+
+
+def test_cannot_go_back_and_clear():
+    wheel = TimerWheel(start=5)
+    wheel.schedule(8, 'item')
+    with pytest.raises(ValueError):
+        wheel.advance(4)
+    wheel.clear(start=0)
+    assert len(wheel) == 0
+    assert wheel.now == 0
+    assert wheel.advance(20) == []
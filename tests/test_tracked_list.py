@@ -0,0 +1,80 @@
+from quantumnet.objects import DirtySet, TrackedList
+
+
+def test_structural_changes_mark_key_and_bump_version():
+    dirty = DirtySet()
+    items = TrackedList([1, 2], dirty, 'a')
+    items.append(3)
+    assert dirty == {'a'}
+    assert dirty.version == 1
+    items.remove(1)
+    items[0] = 5
+    assert list(items) == [5, 3]
+    assert dirty.version == 3
+
+
+def test_touch_marks_without_new_version():
+    dirty = DirtySet()
+    items = TrackedList([1], dirty, 'a')
+    items.touch()
+    assert dirty == {'a'}
+    assert dirty.version == 0
+
+
+def test_replace_and_clearing_dirty_set():
+    dirty = DirtySet(version=4)
+    items = TrackedList([1], dirty, 'a')
+    items.replace([2, 3])
+    assert list(items) == [2, 3]
+    assert not dirty
+    items.pop()
+    dirty.clear()
+    assert not dirty
+    assert dirty.version == 5
+
+
+def test_listener_receives_inserted_items():
+    dirty = DirtySet()
+    seen = []
+    dirty.listener = lambda key, items: seen.append((key, list(items)))
+    items = TrackedList([], dirty, 'a')
+    items.append(1)
+    items.extend([2, 3])
+    items += [4]
+    assert seen == [('a', [1]), ('a', [2, 3]), ('a', [4])]
+
+
+class Item():
+    def __init__(self, value):
+        self.value = value
+
+
+def test_share_copies_items_on_first_write():
+    first, second = Item(1), Item(2)
+    dirty, other_dirty = DirtySet(), DirtySet()
+    original = TrackedList([first, second], dirty, 'a')
+    shared = original.share(other_dirty)
+    assert shared.key == 'a'
+    assert shared[0] is first
+
+    shared.touch()
+    shared[0].value = 10
+    assert first.value == 1
+    assert shared[0] is not first
+    assert other_dirty == {'a'}
+    assert not dirty
+
+    # Referências anteriores à cópia ainda encontram os elementos copiados
+    shared.remove(second)
+    assert [item.value for item in shared] == [10]
+    assert [item.value for item in original] == [1, 2]
+
+
+def test_copy_does_not_mark_list():
+    import copy
+    dirty = DirtySet()
+    items = TrackedList([1, 2], dirty, 'a')
+    clone = copy.copy(items)
+    assert isinstance(clone, TrackedList)
+    assert list(clone) == [1, 2]
+    assert not dirty